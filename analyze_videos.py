@@ -0,0 +1,209 @@
+"""
+녹화된 학습 영상 오프라인 일괄 분석.
+
+    python analyze_videos.py videos/*.mp4 --out results --workers 4 --stride 3 --width 640
+
+영상을 구간(segment) 단위로 나눠 프로세스 풀에서 분석합니다. 작업 프로세스마다
+ConcentrationDetector(MediaPipe 그래프) 하나를 만들어 재사용합니다.
+
+출력 (--out 디렉터리):
+- frames.csv|parquet   프레임별 상태/집중도
+- seconds.csv|parquet  초 단위 평균 집중도, 가장 많은 상태, 얼굴 감지 비율
+- summary.json         영상별 요약과 처리율 (frames/s, 코어당 frames/s)
+"""
+import os
+import csv
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+FRAME_FIELDS = ["video", "frame", "time_sec", "status", "concentration_score", "gaze_status", "face_detected"]
+SECOND_FIELDS = ["video", "second", "frames", "avg_concentration", "status", "face_detected_ratio"]
+
+_detector = None
+
+
+def _init_worker(detection_mode):
+    """작업 프로세스마다 한 번: 분석기(MediaPipe 그래프) 생성"""
+    global _detector
+    from src.models.detector import ConcentrationDetector
+    # 움직임 게이트 끔: 분석기를 구간/영상 사이에 재사용하므로 다른 영상의 직전 결과를 돌려줄 수 있음
+    _detector = ConcentrationDetector(detection_mode=detection_mode, motion_gate=False)
+
+
+def _analyze_segment(path, start, end, stride, width, mirror):
+    """영상의 [start, end) 프레임 구간을 stride 간격으로 분석해 (행 목록, 분석 프레임 수, CPU 초, 경과 초) 반환"""
+    started, cpu_started = time.perf_counter(), time.process_time()
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    rows, analyzed, index = [], 0, start
+    while index < end:
+        # 건너뛸 프레임은 디코딩하지 않고 grab 만 함
+        if (index - start) % stride:
+            if not cap.grab():
+                break
+            index += 1
+            continue
+        ok, frame = cap.read()
+        if not ok:
+            break
+
+        if width and frame.shape[1] > width:
+            frame = cv2.resize(frame, (width, int(frame.shape[0] * width / frame.shape[1])), interpolation=cv2.INTER_AREA)
+        if mirror:
+            frame = cv2.flip(frame, 1)
+
+        result = _detector.process_image(frame, draw=False)
+        rows.append({
+            "video": path,
+            "frame": index,
+            "time_sec": round(index / fps, 3),
+            "status": result.get("status", "Unknown"),
+            "concentration_score": result.get("concentration_score", 0),
+            "gaze_status": result.get("gaze_status", "Unknown"),
+            "face_detected": bool(result.get("face_detected", False))
+        })
+        analyzed += 1
+        index += 1
+
+    cap.release()
+    return rows, analyzed, time.process_time() - cpu_started, time.perf_counter() - started
+
+
+def plan_segments(paths, segment_seconds):
+    """영상을 segment_seconds 길이 구간으로 나눕니다 (0 이면 영상 하나가 한 구간)."""
+    segments = []
+    for path in paths:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"⚠️ 영상을 열 수 없습니다: {path}")
+            continue
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        cap.release()
+
+        size = int(segment_seconds * fps) if segment_seconds > 0 else total
+        size = max(1, size)
+        for start in range(0, max(total, 1), size):
+            segments.append((path, start, min(start + size, total) if total else 1 << 62))
+    return segments
+
+
+def per_second(rows):
+    buckets = defaultdict(list)
+    for row in rows:
+        buckets[row["video"], int(row["time_sec"])].append(row)
+
+    seconds = []
+    for (video, second), items in sorted(buckets.items()):
+        seconds.append({
+            "video": video,
+            "second": second,
+            "frames": len(items),
+            "avg_concentration": round(sum(r["concentration_score"] for r in items) / len(items), 2),
+            "status": Counter(r["status"] for r in items).most_common(1)[0][0],
+            "face_detected_ratio": round(sum(r["face_detected"] for r in items) / len(items), 3)
+        })
+    return seconds
+
+
+def write_table(rows, fields, path_without_ext, fmt):
+    if fmt == "parquet":
+        try:
+            import pandas as pd
+        except ImportError:
+            raise SystemExit("parquet 출력에는 pandas 와 pyarrow 가 필요합니다: pip install pandas pyarrow")
+        path = f"{path_without_ext}.parquet"
+        pd.DataFrame(rows, columns=fields).to_parquet(path, index=False)
+    else:
+        path = f"{path_without_ext}.csv"
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화된 학습 영상 집중도 일괄 분석")
+    parser.add_argument("videos", nargs="+", help="분석할 영상 파일")
+    parser.add_argument("--out", default="analysis_output", help="결과 디렉터리")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stride", type=int, default=1, help="N 프레임마다 한 장 분석")
+    parser.add_argument("--width", type=int, default=0, help="분석 전 이 너비로 축소 (0 이면 원본)")
+    parser.add_argument("--segment-seconds", type=float, default=60.0, help="긴 영상을 나눠 병렬 처리할 구간 길이 (0 이면 영상 단위)")
+    parser.add_argument("--detection-mode", choices=["facemesh", "detector"], default=None)
+    parser.add_argument("--no-mirror", action="store_true", help="실시간 카메라처럼 좌우 반전하지 않음")
+    args = parser.parse_args()
+
+    segments = plan_segments(args.videos, args.segment_seconds)
+    if not segments:
+        raise SystemExit("분석할 영상이 없습니다.")
+    os.makedirs(args.out, exist_ok=True)
+    print(f"🚀 영상 {len(args.videos)}개, 구간 {len(segments)}개, 작업 프로세스 {args.workers}개")
+
+    started = time.perf_counter()
+    rows, analyzed, cpu_seconds = [], 0, 0.0
+    per_video = defaultdict(lambda: {"frames": 0, "cpu_seconds": 0.0, "wall_seconds": 0.0})
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.detection_mode,)) as executor:
+        futures = {
+            executor.submit(_analyze_segment, path, start, end, max(1, args.stride), args.width, not args.no_mirror): path
+            for path, start, end in segments
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            segment_rows, count, cpu, wall = future.result()
+            rows.extend(segment_rows)
+            analyzed += count
+            cpu_seconds += cpu
+            stats = per_video[path]
+            stats["frames"] += count
+            stats["cpu_seconds"] += cpu
+            stats["wall_seconds"] += wall
+    elapsed = time.perf_counter() - started
+
+    rows.sort(key=lambda r: (r["video"], r["frame"]))
+    seconds = per_second(rows)
+    frames_path = write_table(rows, FRAME_FIELDS, os.path.join(args.out, "frames"), args.format)
+    seconds_path = write_table(seconds, SECOND_FIELDS, os.path.join(args.out, "seconds"), args.format)
+
+    videos = {}
+    for path, stats in per_video.items():
+        video_rows = [r for r in rows if r["video"] == path]
+        videos[path] = {
+            "frames_analyzed": stats["frames"],
+            "avg_concentration": round(sum(r["concentration_score"] for r in video_rows) / len(video_rows), 2) if video_rows else 0,
+            "focusing_ratio": round(sum(r["status"] == "Focusing" for r in video_rows) / len(video_rows), 3) if video_rows else 0,
+            "face_detected_ratio": round(sum(r["face_detected"] for r in video_rows) / len(video_rows), 3) if video_rows else 0,
+            "frames_per_cpu_second": round(stats["frames"] / stats["cpu_seconds"], 2) if stats["cpu_seconds"] else 0
+        }
+
+    summary = {
+        "workers": args.workers,
+        "stride": args.stride,
+        "width": args.width,
+        "frames_analyzed": analyzed,
+        "wall_seconds": round(elapsed, 2),
+        "frames_per_second": round(analyzed / elapsed, 2) if elapsed else 0,
+        "frames_per_second_per_core": round(analyzed / cpu_seconds, 2) if cpu_seconds else 0,
+        "videos": videos
+    }
+    with open(os.path.join(args.out, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 프레임 {analyzed}장 분석: {summary['frames_per_second']} frames/s "
+          f"(코어당 {summary['frames_per_second_per_core']} frames/s)")
+    print(f"   {frames_path}\n   {seconds_path}\n   {os.path.join(args.out, 'summary.json')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+요청당 인증 비용 측정: 매번 jwt.decode vs 공유 인증 의존성(decode_access_token, 토큰 캐시).
+
+    python -m benchmarks.bench_auth --dashboards 300 --seconds 60 --poll 3
+
+대시보드 N 개가 각자 자기 토큰으로 poll 초마다 상태를 조회하는 부하를 그대로 재생합니다
+(시간을 실제로 기다리지 않고 요청 순서만 재현). 요청당 지연 분포와 캐시 적중률을 출력합니다.
+"""
+import argparse
+
+import jwt
+
+from benchmarks.common import timed, summarize, print_table
+from src.core.config import SECRET_KEY, JWT_ALGORITHM
+from src.core.security import create_access_token, decode_access_token, TokenCache
+from src.core import security
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dashboards", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=60.0, help="재현할 시간")
+    parser.add_argument("--poll", type=float, default=3.0, help="대시보드 한 개의 조회 간격 (초)")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": f"parent{i}", "type": "parent", "parent_id": i})
+              for i in range(args.dashboards)]
+    rounds = max(1, int(args.seconds / args.poll))
+    requests = [token for _ in range(rounds) for token in tokens]
+    print(f"대시보드 {args.dashboards}개 x {rounds}회 = 요청 {len(requests)}개 "
+          f"(초당 {args.dashboards / args.poll:.0f}건)")
+
+    uncached = [timed(jwt.decode, token, SECRET_KEY, algorithms=[JWT_ALGORITHM])[1] for token in requests]
+
+    security.token_cache = TokenCache(maxsize=args.cache_size)
+    cached = [timed(decode_access_token, token)[1] for token in requests]
+    stats = security.token_cache.stats()
+
+    print_table({
+        "jwt.decode (매 요청)": summarize(uncached),
+        f"decode_access_token (캐시 {args.cache_size})": summarize(cached),
+    })
+    total = stats["hits"] + stats["misses"]
+    print(f"캐시 적중률: {stats['hits'] / total:.1%} ({stats['hits']}/{total})")
+    for name, samples in (("jwt.decode", uncached), ("cached", cached)):
+        print(f"{name:<12} 초당 처리 가능 인증 {1000.0 * len(samples) / sum(samples):,.0f}건 (단일 스레드)")
+
+
+if __name__ == "__main__":
+    main()
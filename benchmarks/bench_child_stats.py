@@ -0,0 +1,84 @@
+"""
+자녀 통계 조회 벤치마크: rollup 표 vs 원본 concentration_logs 집계.
+
+    python -m benchmarks.gen_concentration_logs --students 1000 --days 365 --raw-students 20
+    python -m benchmarks.bench_child_stats --repeat 20 --points 100
+
+구간(1일/7일/30일/365일)마다 /parent/child_stats 와 같은 rollup 조회(query_history)의 지연을 재고,
+원본 로그가 있는 학생(gen_concentration_logs --raw-students)은 (user_id, created_at) 인덱스로
+원본을 직접 집계하는 쿼리와 비교합니다.
+"""
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from benchmarks.common import timed, summarize, print_table
+from benchmarks.gen_concentration_logs import PREFIX
+from src.db.database import get_db
+from src.db.rollups import choose_grain, query_history
+
+RANGES = {"1d": 1, "7d": 7, "30d": 30, "365d": 365}
+
+
+def raw_history(cursor, user_id, start, end, points):
+    """rollup 없이 원본 로그에서 같은 점 목록을 계산하는 쿼리 (비교 기준)."""
+    _, step = choose_grain(start, end, points)
+    cursor.execute("""
+        SELECT FLOOR(TIMESTAMPDIFF(SECOND, %s, created_at) / %s) AS slot,
+               COUNT(*) AS samples, AVG(concentration_score) AS avg_concentration
+        FROM concentration_logs
+        WHERE user_id = %s AND created_at >= %s AND created_at < %s
+        GROUP BY slot
+        ORDER BY slot
+    """, (start, step, user_id, start, end))
+    return cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="구간마다 조회할 횟수 (학생은 무작위)")
+    parser.add_argument("--points", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT u.user_id, EXISTS(SELECT 1 FROM concentration_logs c WHERE c.user_id = u.user_id) AS has_raw
+            FROM users u WHERE u.username LIKE %s
+        """, (PREFIX + "%",))
+        students = cursor.fetchall()
+        if not students:
+            raise SystemExit("벤치마크 데이터가 없습니다. 먼저 benchmarks.gen_concentration_logs 를 실행하세요.")
+        everyone = [s["user_id"] for s in students]
+        with_raw = [s["user_id"] for s in students if s["has_raw"]]
+        print(f"학생 {len(everyone)}명 (원본 로그 {len(with_raw)}명)")
+
+        rng = random.Random(args.seed)
+        end = datetime.now()
+        rows = {}
+        for name, days in RANGES.items():
+            start = end - timedelta(days=days)
+            table, step = choose_grain(start, end, args.points)
+
+            samples = []
+            for _ in range(args.repeat):
+                _, ms = timed(query_history, cursor, rng.choice(everyone), start, end, args.points)
+                samples.append(ms)
+            rows[f"rollup {name} ({table.rsplit('_', 1)[1]}, {step}s)"] = summarize(samples)
+
+            if with_raw:
+                samples = []
+                for _ in range(args.repeat):
+                    _, ms = timed(raw_history, cursor, rng.choice(with_raw), start, end, args.points)
+                    samples.append(ms)
+                rows[f"raw    {name}"] = summarize(samples)
+        print_table(rows)
+    finally:
+        cursor.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
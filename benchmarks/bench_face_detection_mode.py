@@ -0,0 +1,55 @@
+"""
+얼굴 검출 방식 비교: detector(매 프레임 FaceDetection) vs facemesh(랜드마크 기반 + 재탐색 fallback).
+
+    python -m benchmarks.bench_face_detection_mode --video sample.mp4 --frames 600
+
+각 방식의 FPS 와 프레임별 face_detected / status 일치율을 출력합니다.
+같은 프레임 순서를 각자 새 detector 로 처리하므로 트래킹 상태는 방식별로 독립입니다.
+"""
+import argparse
+
+from benchmarks.common import load_frames, timed, summarize, print_table
+from src.models.detector import ConcentrationDetector
+
+
+def run(mode, frames, reacquire_after):
+    detector = ConcentrationDetector(detection_mode=mode, reacquire_after=reacquire_after, motion_gate=False)
+    if not detector.is_initialized:
+        raise RuntimeError(f"ConcentrationDetector({mode}) 초기화 실패")
+
+    samples, outcomes = [], []
+    for frame in frames:
+        result, ms = timed(detector.process_image, frame, draw=False)
+        samples.append(ms)
+        outcomes.append((result.get("face_detected", False), result.get("status")))
+    detector.close()
+    return samples, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", help="녹화 영상 경로 (없으면 합성 프레임)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--reacquire-after", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    legacy_ms, legacy = run("detector", frames, args.reacquire_after)
+    mesh_ms, mesh = run("facemesh", frames, args.reacquire_after)
+
+    print_table({
+        "detector (FD + mesh)": summarize(legacy_ms),
+        "facemesh (+fallback)": summarize(mesh_ms),
+    })
+    for name, samples in (("detector", legacy_ms), ("facemesh", mesh_ms)):
+        print(f"{name:<10} FPS: {1000.0 * len(samples) / sum(samples):.1f}")
+
+    n = len(frames)
+    face_agree = sum(a[0] == b[0] for a, b in zip(legacy, mesh)) / n
+    status_agree = sum(a[1] == b[1] for a, b in zip(legacy, mesh)) / n
+    print(f"face_detected 일치율: {face_agree:.1%}")
+    print(f"status 일치율:        {status_agree:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+1:N 얼굴 식별(FaceIndex.search) 벤치마크.
+
+    python -m benchmarks.bench_face_identify --users 50000 --queries 500
+
+합성 얼굴은 평균 모양 + 저차원 개인차(실제 얼굴처럼 몇십 개 성분에 분산이 몰림)로 만들고,
+질의는 등록 얼굴에 잡음과 임의의 회전/크기/이동을 더해 Procrustes 정렬이 필요하도록 합니다.
+전체 행렬 비교(brute)와 PCA coarse-to-fine 검색의 지연 시간과 top-1 정확도를 비교합니다.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import timed, summarize, print_table
+from src.models.face_index import FaceIndex
+from src.models.face_template import FaceTemplate, normalize_landmarks
+
+
+def random_rotation(rng, max_degrees):
+    angles = np.radians(rng.uniform(-max_degrees, max_degrees, 3))
+    cx, cy, cz = np.cos(angles)
+    sx, sy, sz = np.sin(angles)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--rank", type=int, default=40, help="합성 개인차 성분 수")
+    parser.add_argument("--pca-dim", type=int, default=64)
+    parser.add_argument("--rerank", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = rng.random((468, 3)).astype(np.float32)
+    basis = rng.normal(0, 1, (args.rank, 468 * 3)).astype(np.float32)
+    basis /= np.linalg.norm(basis, axis=1, keepdims=True)
+    coeffs = rng.normal(0, 0.15, (args.users, args.rank)).astype(np.float32) * np.linspace(1.0, 0.2, args.rank, dtype=np.float32)
+    faces = base + (coeffs @ basis).reshape(args.users, 468, 3)
+    entries = [FaceTemplate(i, f"student{i:05d}", f"STU-{i:04x}", normalize_landmarks(face)) for i, face in enumerate(faces)]
+
+    indexes = {
+        "brute": FaceIndex(pca_dim=0),
+        f"pca{args.pca_dim}+rerank{args.rerank}": FaceIndex(pca_dim=args.pca_dim, rerank=args.rerank),
+    }
+    for name, index in indexes.items():
+        started = time.perf_counter()
+        index.build(entries)
+        print(f"{name}: 구성 {time.perf_counter() - started:.2f}s")
+
+    targets = rng.integers(0, args.users, args.queries)
+    probes = []
+    for i in targets:
+        probe = faces[i] + rng.normal(0, 0.002, faces[i].shape)
+        probe = probe @ random_rotation(rng, 15).T * rng.uniform(0.8, 1.2) + rng.uniform(-0.1, 0.1, 3)
+        probes.append(probe.astype(np.float32))
+
+    rows = {}
+    for name, index in indexes.items():
+        samples, correct = [], 0
+        for target, probe in zip(targets, probes):
+            matches, ms = timed(index.search, probe, 5)
+            samples.append(ms)
+            correct += int(matches and matches[0][0].user_id == target)
+        rows[name] = summarize(samples)
+        print(f"{name}: top-1 정확도 {correct / len(targets):.3f}")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+/child/login 얼굴 비교 경로 벤치마크 (등록 사용자 N 명).
+
+    python -m benchmarks.bench_face_login --users 10000 --logins 2000
+
+- json:   기존 방식. TEXT 컬럼의 468×3 JSON 을 매번 json.loads 하고 배열을 제자리 변경하며 비교
+- blob:   캐시 미스. BLOB 템플릿을 np.frombuffer 로 복원해 캐시에 넣고 비교
+- cache:  캐시 적중. DB 조회/파싱 없이 메모리 템플릿과 비교
+
+DB 왕복 시간과 MediaPipe 랜드마크 추출은 세 경로에 공통이거나 캐시 적중 시 사라지는 비용이라 제외합니다
+(캐시 미스/기존 방식은 여기에 DB 왕복 1~2회가 더해짐).
+"""
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks.common import timed, summarize, print_table
+from src.models.face_template import (
+    FaceTemplate, TemplateCache, encode_template, decode_template, template_distance, MATCH_THRESHOLD
+)
+
+
+def legacy_compare(text, input_landmarks):
+    db_landmarks = np.array(json.loads(text))
+    db_landmarks -= db_landmarks.mean(axis=0)
+    input_landmarks = input_landmarks.copy()
+    input_landmarks -= input_landmarks.mean(axis=0)
+    return np.linalg.norm(db_landmarks - input_landmarks) < MATCH_THRESHOLD
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--logins", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    faces = rng.random((args.users, 468, 3))
+    usernames = [f"student{i:05d}" for i in range(args.users)]
+
+    json_rows = {name: json.dumps(face.tolist()) for name, face in zip(usernames, faces)}
+    blob_rows = {name: encode_template(face) for name, face in zip(usernames, faces)}
+    print(f"등록 사용자 {args.users}명: JSON {sum(map(len, json_rows.values())) / args.users:.0f} bytes/행, "
+          f"BLOB {len(next(iter(blob_rows.values())))} bytes/행")
+
+    cache = TemplateCache()
+    picks = rng.integers(0, args.users, args.logins)
+    probes = [faces[i] + rng.normal(0, 0.001, faces[i].shape) for i in picks]
+
+    samples = {"json (기존)": [], "blob (캐시 미스)": [], "cache (캐시 적중)": []}
+    for i, probe in zip(picks, probes):
+        name = usernames[i]
+        _, ms = timed(legacy_compare, json_rows[name], probe)
+        samples["json (기존)"].append(ms)
+
+        def load_and_compare():
+            entry = FaceTemplate(int(i), name, f"STU-{i:04x}", decode_template(blob_rows[name]))
+            cache.put(entry)
+            return template_distance(entry.template, probe) < MATCH_THRESHOLD
+        cache.invalidate(username=name)
+        _, ms = timed(load_and_compare)
+        samples["blob (캐시 미스)"].append(ms)
+
+        def cached_compare():
+            entry = cache.get(name)
+            return template_distance(entry.template, probe) < MATCH_THRESHOLD
+        _, ms = timed(cached_compare)
+        samples["cache (캐시 적중)"].append(ms)
+
+    print_table({name: summarize(values) for name, values in samples.items()})
+
+
+if __name__ == "__main__":
+    main()
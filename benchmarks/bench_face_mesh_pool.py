@@ -0,0 +1,52 @@
+"""
+얼굴 등록/로그인 랜드마크 추출: 요청마다 FaceMesh 생성(cold) vs 미리 로드한 풀(warm).
+
+    python -m benchmarks.bench_face_mesh_pool --video face.mp4 --requests 50 --pool-size 2
+
+cold 는 기존 extract_face_landmarks 처럼 매번 static FaceMesh 를 만들고 닫으며,
+warm 은 FaceMeshPool.warm_up() 뒤 extract() 만 측정합니다. 마지막으로 동시 요청 처리율도 출력합니다.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from benchmarks.common import load_frames, timed, summarize, print_table
+from src.models.face_mesh_pool import FaceMeshPool, create_static_face_mesh, landmarks_from_results
+
+
+def cold_extract(frame):
+    with create_static_face_mesh() as face_mesh:
+        return landmarks_from_results(face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", help="얼굴이 나오는 녹화 영상 (없으면 합성 프레임)")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, count=args.requests)
+
+    cold = [timed(cold_extract, frame)[1] for frame in frames]
+
+    pool = FaceMeshPool(size=args.pool_size)
+    _, warm_up_ms = timed(pool.warm_up)
+    print(f"워밍업 (FaceMesh {args.pool_size}개): {warm_up_ms:.1f} ms")
+    warm = [timed(pool.extract, frame)[1] for frame in frames]
+
+    print_table({"cold (요청마다 생성)": summarize(cold), "warm (풀)": summarize(warm)})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+        list(clients.map(pool.extract, frames))
+    elapsed = time.perf_counter() - started
+    print(f"동시 요청 {args.concurrency}: {len(frames) / elapsed:.1f} req/s")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+GazeTracker 프레임당 처리 시간: 이전 방식(get_gaze + draw_debug 가 각각 FaceMesh 실행) vs analyze() 한 번.
+
+    python -m benchmarks.bench_gaze_tracker --video sample.mp4 --frames 300
+
+이전 방식은 analyze() 뒤에 예전 draw_debug(복사본으로 RGB 변환 + FaceMesh 재추론 + 주석 이미지 복사 +
+눈 랜드마크 원 그리기)를 그대로 옮긴 legacy_draw_debug 를 실행해 재현합니다.
+두 경로는 각각 새 GazeTracker 를 사용하므로 트래킹 상태가 서로 섞이지 않습니다.
+"""
+import argparse
+import cv2
+
+from benchmarks.common import load_frames, timed, summarize, print_table
+from src.models.gaze_tracker import GazeTracker
+
+
+def legacy_draw_debug(tracker, frame):
+    """예전 GazeTracker.draw_debug: 넘겨받은 이미지로 FaceMesh 를 다시 돌려 눈 랜드마크를 그림."""
+    result = tracker.mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if not result.multi_face_landmarks:
+        return frame
+    annotated = frame.copy()
+    h, w = annotated.shape[:2]
+    for idx in tracker.left_eye + tracker.right_eye:
+        lm = result.multi_face_landmarks[0].landmark[idx]
+        cv2.circle(annotated, (int(lm.x * w), int(lm.y * h)), 2, (0, 255, 0), -1)
+    return annotated
+
+
+def run_before(frames):
+    tracker = GazeTracker()
+    samples = []
+    for frame in frames:
+        def step():
+            tracker.analyze(frame)
+            # 예전 detector: 원본 복사본에 주석을 그린 뒤 draw_debug 에 넘김
+            return legacy_draw_debug(tracker, frame.copy())
+        _, ms = timed(step)
+        samples.append(ms)
+    tracker.close()
+    return samples
+
+
+def run_after(frames):
+    tracker = GazeTracker()
+    samples = []
+    for frame in frames:
+        def step():
+            result = tracker.analyze(frame)
+            return tracker.draw_debug(frame, result)
+        _, ms = timed(step)
+        samples.append(ms)
+    tracker.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", help="녹화 영상 경로 (없으면 합성 프레임)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames + args.warmup)
+    before = run_before(frames)[args.warmup:]
+    after = run_after(frames)[args.warmup:]
+
+    print_table({
+        "before (mesh x2)": summarize(before),
+        "after (analyze)": summarize(after),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+GazeTracker 랜드마크 연산 마이크로 벤치마크 (MediaPipe 불필요, 합성 랜드마크 사용).
+
+    python -m benchmarks.bench_landmark_math --repeat 20000
+
+이전 구현(랜드마크 객체 목록 + 리스트 컴프리헨션, list.pop(0) 이력)을 이 파일 안에 그대로 두고
+현재 구현과 호출당 µs 를 비교합니다.
+"""
+import argparse
+import timeit
+from collections import namedtuple
+
+import numpy as np
+
+from src.models.gaze_tracker import GazeTracker
+
+Landmark = namedtuple("Landmark", "x y z")
+
+
+def make_landmarks(n=468, seed=0):
+    rng = np.random.default_rng(seed)
+    pts = rng.uniform(0.3, 0.7, (n, 3))
+    return [Landmark(*map(float, p)) for p in pts]
+
+
+# --- 이전 구현 (비교용) ---
+
+def legacy_ear(landmarks, eye_indices):
+    pts = np.array([[landmarks[i].x, landmarks[i].y] for i in eye_indices])
+    v1 = np.linalg.norm(pts[1] - pts[5])
+    v2 = np.linalg.norm(pts[2] - pts[4])
+    h = np.linalg.norm(pts[0] - pts[3])
+    return (v1 + v2) / (2.0 * h)
+
+
+def legacy_gaze_points(landmarks, eye_indices, w=640, h=480):
+    return np.array([[landmarks[i].x * w, landmarks[i].y * h] for i in eye_indices], dtype=np.int32)
+
+
+def legacy_history(hist, value, size=10):
+    hist.append(value)
+    if len(hist) > size:
+        hist.pop(0)
+    return float(np.mean(hist))
+
+
+def bench(name, stmt, repeat):
+    per_call_us = min(timeit.repeat(stmt, number=repeat, repeat=3)) / repeat * 1e6
+    print(f"{name:<36}{per_call_us:>10.2f} µs")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    tracker = GazeTracker()
+    raw = make_landmarks()
+    arr = tracker._landmarks_to_array(raw)
+    frame = np.random.default_rng(1).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    hist = []
+
+    print(f"{'function':<36}{'per call':>13}")
+    bench("landmarks -> (468,3) array", lambda: tracker._landmarks_to_array(raw), args.repeat // 10)
+    bench("EAR legacy (2 eyes, list comp)",
+          lambda: np.mean([legacy_ear(raw, tracker.left_eye), legacy_ear(raw, tracker.right_eye)]), args.repeat)
+    bench("EAR vectorized (2 eyes)", lambda: GazeTracker._calculate_ear(arr, tracker._eye_idx), args.repeat)
+    bench("gaze points legacy (2 eyes)",
+          lambda: (legacy_gaze_points(raw, tracker.left_eye), legacy_gaze_points(raw, tracker.right_eye)), args.repeat)
+    bench("gaze ratio (2 eyes, full)",
+          lambda: (GazeTracker._calculate_gaze_ratio(frame, arr, tracker.left_eye),
+                   GazeTracker._calculate_gaze_ratio(frame, arr, tracker.right_eye)), args.repeat // 10)
+    bench("history legacy (list.pop(0)+mean)", lambda: legacy_history(hist, 1.0), args.repeat)
+    bench("history ring buffer", lambda: tracker._push_history(1.0), args.repeat)
+    bench("face_box", lambda: GazeTracker.face_box(arr), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
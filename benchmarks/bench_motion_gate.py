@@ -0,0 +1,70 @@
+"""
+움직임 게이트(MotionGate) 효과 측정: 매 프레임 추론 vs 장면이 그대로인 프레임 추론 생략.
+
+    python -m benchmarks.bench_motion_gate --video session.mp4 --frames 900 --stride 6 \
+        --threshold 2 --threshold 4 --threshold 8 --refresh 5
+
+실시간 파이프라인은 ANALYSIS_FPS(기본 5) 로 분석하므로 30fps 녹화 영상이면 --stride 6 으로
+같은 간격의 프레임만 넣는 것이 실제와 가깝습니다. 설정별 CPU 시간(process_time), 프레임당 지연,
+추론 생략 비율, 그리고 게이트 없는 결과와의 status / gaze_status / face_detected 일치율을 출력합니다.
+"""
+import time
+import argparse
+
+from benchmarks.common import load_frames, timed, summarize, print_table
+from src.models.detector import ConcentrationDetector
+from src.models.motion_gate import MotionGate
+
+
+def run(frames, gate):
+    detector = ConcentrationDetector(motion_gate=gate if gate is not None else False)
+    if not detector.is_initialized:
+        raise RuntimeError("ConcentrationDetector 초기화 실패")
+
+    samples, outcomes = [], []
+    cpu_started = time.process_time()
+    for frame in frames:
+        result, ms = timed(detector.process_image, frame, draw=False)
+        samples.append(ms)
+        outcomes.append((result.get("status"), result.get("gaze_status"), result.get("face_detected", False)))
+    cpu = time.process_time() - cpu_started
+    detector.close()
+    return samples, outcomes, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", help="녹화 영상 경로 (없으면 합성 프레임)")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--stride", type=int, default=1, help="N 프레임마다 한 장 분석")
+    parser.add_argument("--threshold", type=float, action="append", help="비교할 MOTION_THRESHOLD (여러 번 지정)")
+    parser.add_argument("--refresh", type=int, default=5, help="최대 연속 생략 프레임 수")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)[::max(1, args.stride)]
+    baseline_ms, baseline, baseline_cpu = run(frames, None)
+
+    rows = {"gate off": summarize(baseline_ms)}
+    report = []
+    for threshold in args.threshold or [4.0]:
+        gate = MotionGate(threshold=threshold, refresh_after=args.refresh)
+        samples, outcomes, cpu = run(frames, gate)
+        rows[f"gate th={threshold:g}"] = summarize(samples)
+        n = len(frames)
+        report.append((
+            threshold, gate.skip_ratio, cpu,
+            sum(a[0] == b[0] for a, b in zip(baseline, outcomes)) / n,
+            sum(a[1] == b[1] for a, b in zip(baseline, outcomes)) / n,
+            sum(a[2] == b[2] for a, b in zip(baseline, outcomes)) / n
+        ))
+
+    print_table(rows)
+    print(f"gate off   CPU {baseline_cpu:.2f}s")
+    for threshold, skip_ratio, cpu, status_agree, gaze_agree, face_agree in report:
+        reduction = (1 - cpu / baseline_cpu) if baseline_cpu else 0.0
+        print(f"th={threshold:<6g} CPU {cpu:.2f}s ({reduction:+.1%} 감소)  생략 {skip_ratio:.1%}  "
+              f"status 일치 {status_agree:.1%}  gaze 일치 {gaze_agree:.1%}  face 일치 {face_agree:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+SessionRegistry 부하 확인: 영상 파일을 카메라 대신 사용해 학생 N 명을 한 프로세스에서 감독합니다.
+
+    python -m benchmarks.bench_sessions --video sample.mp4 --students 24 --seconds 30
+
+학생마다 같은 파일을 독립적으로 재생(realtime, loop)하고, 세션별 분석/인코딩 처리율과
+전체 처리율, idle 정리 동작을 출력합니다.
+"""
+import argparse
+import time
+
+from src.core.camera import CameraManager
+from src.core.sessions import SessionRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", required=True, help="카메라 대신 재생할 영상 파일")
+    parser.add_argument("--students", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--analysis-fps", type=float, default=5.0)
+    parser.add_argument("--idle-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    registry = SessionRegistry(
+        source_factory=lambda key: (CameraManager(device_index=args.video, loop=True, realtime=True), True),
+        max_sessions=args.students,
+        idle_timeout=args.idle_timeout,
+        analysis_fps=args.analysis_fps
+    )
+
+    keys = [f"STU-{i:04d}-bench" for i in range(args.students)]
+    started = time.monotonic()
+    for key in keys:
+        registry.get(key)
+    print(f"세션 {len(registry)}개 생성: {time.monotonic() - started:.1f}s")
+
+    deadline = time.monotonic() + args.seconds
+    while time.monotonic() < deadline:
+        for key in keys:
+            registry.get(key, create=False)  # 시청 중인 것처럼 접근 시간 갱신
+        time.sleep(1.0)
+
+    total_analyzed = total_encoded = 0
+    for key in keys:
+        session = registry.peek(key)
+        analyzed, encoded = session.pipeline.analyzed_frames, session.pipeline.encoded_frames
+        total_analyzed += analyzed
+        total_encoded += encoded
+        print(f"{key}: 분석 {analyzed / args.seconds:5.1f}/s  인코딩 {encoded / args.seconds:5.1f}/s  "
+              f"status={session.get_status().get('status')}")
+    print(f"합계: 분석 {total_analyzed / args.seconds:.1f}/s  인코딩 {total_encoded / args.seconds:.1f}/s")
+
+    time.sleep(args.idle_timeout + 1)
+    print(f"idle 정리: {len(registry.evict_idle())}개")
+    registry.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+벤치마크 공통 도구.
+
+레포 루트에서 `python -m benchmarks.<스크립트>` 형태로 실행합니다.
+--video 를 주지 않으면 합성 프레임을 사용하므로 얼굴 관련 분기는 측정되지 않습니다.
+"""
+import time
+import numpy as np
+import cv2
+
+
+def load_frames(video=None, count=200, width=640, height=480, mirror=True):
+    """녹화 영상(없으면 합성 프레임)에서 count 장의 BGR 프레임을 메모리에 미리 읽어 둡니다."""
+    frames = []
+    if video:
+        cap = cv2.VideoCapture(video)
+        while len(frames) < count:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if frame.shape[:2] != (height, width):
+                frame = cv2.resize(frame, (width, height))
+            frames.append(cv2.flip(frame, 1) if mirror else frame)
+        cap.release()
+        if not frames:
+            raise RuntimeError(f"영상에서 프레임을 읽을 수 없습니다: {video}")
+    else:
+        rng = np.random.default_rng(0)
+        base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        for i in range(count):
+            frames.append(np.roll(base, i * 3, axis=1))
+    return frames
+
+
+def timed(fn, *args, **kwargs):
+    """fn 을 실행하고 (결과, 경과 ms) 를 반환합니다."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+def summarize(samples_ms):
+    """ms 샘플 목록의 평균/백분위 요약."""
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    if arr.size == 0:
+        return {"count": 0}
+    return {
+        "count": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+    }
+
+
+def print_table(rows):
+    """{이름: summarize() 결과} 를 표로 출력합니다."""
+    print(f"{'stage':<28}{'n':>6}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, stats in rows.items():
+        if not stats.get("count"):
+            print(f"{name:<28}{0:>6}")
+            continue
+        print(f"{name:<28}{stats['count']:>6}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
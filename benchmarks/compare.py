@@ -0,0 +1,70 @@
+"""
+benchmarks.suite 결과 JSON 두 개를 비교합니다.
+
+    python -m benchmarks.compare bench/base.json bench/HEAD.json --threshold 10
+
+단계별 p50/p95 지연과 파이프라인 FPS 의 변화율을 출력하고, threshold(%) 이상 느려진 항목이 있으면
+종료 코드 1 로 끝나 CI 에서 회귀를 막을 수 있습니다.
+"""
+import sys
+import json
+import argparse
+
+
+def change(base, new):
+    if not base:
+        return 0.0
+    return (new - base) / base * 100.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 판단할 변화율 (%)")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"base {base['environment'].get('commit', '?')} → new {new['environment'].get('commit', '?')}")
+    print(f"{'stage':<18}{'p50 base':>10}{'p50 new':>10}{'Δ%':>8}{'p95 base':>10}{'p95 new':>10}{'Δ%':>8}")
+
+    regressions = []
+    for name, stats in base["stages"].items():
+        other = new["stages"].get(name)
+        if not other or not stats.get("count") or not other.get("count"):
+            continue
+        d50 = change(stats["p50_ms"], other["p50_ms"])
+        d95 = change(stats["p95_ms"], other["p95_ms"])
+        flag = " ❗" if d50 > args.threshold or d95 > args.threshold else ""
+        print(f"{name:<18}{stats['p50_ms']:>10.2f}{other['p50_ms']:>10.2f}{d50:>8.1f}"
+              f"{stats['p95_ms']:>10.2f}{other['p95_ms']:>10.2f}{d95:>8.1f}{flag}")
+        if flag:
+            regressions.append(name)
+
+    # FPS 는 낮아질수록 회귀
+    for key in ("analyzed_fps", "encoded_fps", "consumer_fps"):
+        b, n = base["pipeline"].get(key), new["pipeline"].get(key)
+        if b is None or n is None:
+            continue
+        d = change(b, n)
+        flag = " ❗" if d < -args.threshold else ""
+        print(f"{key:<18}{b:>10.2f}{n:>10.2f}{d:>8.1f}{flag}")
+        if flag:
+            regressions.append(key)
+
+    b, n = base["memory"].get("max_rss_mb"), new["memory"].get("max_rss_mb")
+    if b and n:
+        print(f"{'max_rss_mb':<18}{b:>10.1f}{n:>10.1f}{change(b, n):>8.1f}")
+
+    if regressions:
+        print(f"❗ {args.threshold}% 이상 회귀: {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
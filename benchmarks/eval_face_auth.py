@@ -0,0 +1,97 @@
+"""
+얼굴 등록/로그인 오프라인 평가: 단일 프레임 방식 vs 품질 게이트 + 다중 프레임 방식.
+
+    python -m benchmarks.eval_face_auth --clip alice=clips/alice.mp4 --clip bob=clips/bob.mp4 \
+        --enroll-frames 30 --window 10
+
+사용자마다 녹화 클립 앞부분(enroll-frames)으로 등록하고, 나머지 프레임을 window 장씩 잘라
+로그인 시도로 사용합니다. 본인 클립의 시도는 genuine, 다른 사용자 템플릿과의 비교는 impostor 입니다.
+
+- single: 첫 프레임 하나로 등록 / 시도 구간의 첫 프레임 하나로 인증 (기존 방식)
+- stream: capture_enrollment 로 등록 / verify_stream 으로 구간 내 첫 통과 프레임에서 인증
+오거부율(FRR), 오수락율(FAR), 인증까지 본 평균 프레임 수를 출력합니다.
+"""
+import argparse
+from collections import defaultdict
+
+from benchmarks.common import load_frames
+from src.models.face_mesh_pool import FaceMeshPool
+from src.models.face_quality import capture_enrollment, verify_stream
+from src.models.face_template import normalize_landmarks, template_distance, MATCH_THRESHOLD
+
+
+class ListFrameSource:
+    """미리 읽은 프레임을 CameraManager.wait_for_frame 처럼 순서대로 돌려주는 가짜 소스"""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def wait_for_frame(self, last_seq=0, timeout=1.0, copy=False):
+        if last_seq >= len(self.frames):
+            return last_seq, None
+        return last_seq + 1, self.frames[last_seq]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clip", action="append", required=True, help="사용자=영상 경로 (여러 번 지정)")
+    parser.add_argument("--frames", type=int, default=300, help="클립마다 읽을 최대 프레임 수")
+    parser.add_argument("--enroll-frames", type=int, default=30)
+    parser.add_argument("--keep", type=int, default=4)
+    parser.add_argument("--window", type=int, default=10)
+    args = parser.parse_args()
+
+    clips = dict(item.split("=", 1) for item in args.clip)
+    pool = FaceMeshPool(size=1)
+    extract = pool.extract
+
+    enrolled = defaultdict(dict)
+    attempts = {}
+    for user, path in clips.items():
+        frames = load_frames(path, count=args.frames)
+        enroll, rest = frames[:args.enroll_frames], frames[args.enroll_frames:]
+
+        first = extract(enroll[0])
+        enrolled["single"][user] = normalize_landmarks(first) if first is not None else None
+        landmarks, _ = capture_enrollment(ListFrameSource(enroll), extract, burst=len(enroll), keep=args.keep)
+        enrolled["stream"][user] = normalize_landmarks(landmarks) if landmarks is not None else None
+
+        attempts[user] = [rest[i:i + args.window] for i in range(0, len(rest) - args.window + 1, args.window)]
+        print(f"{user}: 시도 {len(attempts[user])}회, 등록 성공 single={enrolled['single'][user] is not None} "
+              f"stream={enrolled['stream'][user] is not None}")
+
+    for mode in ("single", "stream"):
+        genuine = rejected = impostor = accepted = frames_used = 0
+        for user, windows in attempts.items():
+            for window in windows:
+                for target, template in enrolled[mode].items():
+                    if template is None:
+                        matched, checked = False, 0
+                    elif mode == "single":
+                        probe = extract(window[0])
+                        matched, checked = probe is not None and template_distance(template, probe) < MATCH_THRESHOLD, 1
+                    else:
+                        matched, checked, _ = verify_stream(
+                            ListFrameSource(window), extract,
+                            lambda landmarks: template_distance(template, landmarks) < MATCH_THRESHOLD,
+                            max_frames=len(window)
+                        )
+                    if target == user:
+                        genuine += 1
+                        rejected += int(not matched)
+                        frames_used += checked
+                    else:
+                        impostor += 1
+                        accepted += int(matched)
+
+        frr = rejected / genuine if genuine else 0.0
+        far = accepted / impostor if impostor else 0.0
+        mean_frames = frames_used / genuine if genuine else 0.0
+        print(f"{mode:<8} FRR {frr:.3f} ({rejected}/{genuine})  FAR {far:.3f} ({accepted}/{impostor})  "
+              f"평균 프레임 {mean_frames:.2f}")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
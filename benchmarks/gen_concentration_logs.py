@@ -0,0 +1,179 @@
+"""
+통계 벤치마크용 집중도 데이터 생성기.
+
+    python -m benchmarks.gen_concentration_logs --students 1000 --days 365 --raw-students 20
+    python -m benchmarks.gen_concentration_logs --drop      # 생성한 데이터 삭제
+
+학생마다 하루 한 번 학습 세션(평균 --hours-per-day 시간)을 만들고 study_sessions 에 기록합니다.
+초 단위 점수는 무작위 보행으로 만들며, 1년 x 1천 명의 초 단위 원본 로그(수십억 행)는 현실적으로
+넣기 어려우므로 다음처럼 나눠서 기록합니다.
+
+- 앞의 --raw-students 명: 초 단위 concentration_logs 원본 + rollup (원본 vs rollup 조회 비교용)
+- 나머지: 같은 분포로 계산한 분 단위 합계를 rollup 표에만 기록
+
+생성한 사용자는 username 이 "bench_" 로 시작하며 --drop 으로 지웁니다.
+"""
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.db.database import get_db
+from src.db.rollups import GRAINS, FOCUSING_STATUS, bucket_start, upsert_rollups
+
+PREFIX = "bench_"
+STATUSES = np.array([FOCUSING_STATUS, "Partially focusing", "Not focusing"])
+
+
+def session_scores(rng, seconds):
+    """세션 하나의 초 단위 점수 (0~80 사이 무작위 보행)."""
+    steps = rng.normal(0, 3, seconds)
+    scores = np.clip(60 + np.cumsum(steps), 0, 80)
+    return scores.astype(np.int64)
+
+
+def statuses_for(scores):
+    return STATUSES[np.where(scores >= 70, 0, np.where(scores >= 40, 1, 2))]
+
+
+def create_students(cursor, count):
+    ids = []
+    for i in range(count):
+        username = f"{PREFIX}{i:05d}"
+        cursor.execute("INSERT INTO users (username, email) VALUES (%s, %s)", (username, f"{username}@bench.local"))
+        user_id = cursor.lastrowid
+        cursor.execute("""
+            INSERT INTO face_landmarks (user_id, landmarks, child_code, region, school_name)
+            VALUES (%s, '[]', %s, 'bench', 'bench')
+        """, (user_id, f"BEN-{i // 10000:04d}-{i % 10000:04d}"))
+        ids.append(user_id)
+    return ids
+
+
+def flush_minutes(cursor, minutes):
+    """분 단위 합계 {(user_id, 분 시작): [행 수, 점수 합, 집중 행 수]} 를 분/시/일 rollup 표에 기록합니다."""
+    for _, table, seconds in GRAINS:
+        totals = defaultdict(lambda: [0, 0, 0])
+        for (user_id, minute), (samples, score_sum, focusing) in minutes.items():
+            total = totals[user_id, bucket_start(minute, seconds)]
+            total[0] += samples
+            total[1] += score_sum
+            total[2] += focusing
+        cursor.executemany(f"""
+            INSERT INTO {table} (user_id, bucket_start, samples, score_sum, focusing_samples, study_seconds)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                samples = samples + VALUES(samples),
+                score_sum = score_sum + VALUES(score_sum),
+                focusing_samples = focusing_samples + VALUES(focusing_samples),
+                study_seconds = study_seconds + VALUES(study_seconds)
+        """, [(u, start, n, s, f, float(n)) for (u, start), (n, s, f) in totals.items()])
+
+
+def generate(db, students, days, hours_per_day, raw_students, batch, seed):
+    rng = np.random.default_rng(seed)
+    cursor = db.cursor()
+    try:
+        user_ids = create_students(cursor, students)
+        db.commit()
+        print(f"✅ 학생 {len(user_ids)}명 생성")
+
+        first_day = (datetime.now() - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        raw_rows = 0
+        for n, user_id in enumerate(user_ids):
+            raw = n < raw_students
+            logs, minutes, sessions = [], defaultdict(lambda: [0, 0, 0]), []
+            for day in range(days):
+                start = first_day + timedelta(days=day, hours=int(rng.integers(15, 21)), minutes=int(rng.integers(0, 60)))
+                seconds = max(60, int(hours_per_day * 3600 * rng.uniform(0.5, 1.5)))
+                scores = session_scores(rng, seconds)
+                statuses = statuses_for(scores)
+                sessions.append((user_id, start, start + timedelta(seconds=seconds), seconds // 60,
+                                 round(float(scores.mean()), 2)))
+
+                if raw:
+                    logs.extend((user_id, int(score), str(status), "Focusing", start + timedelta(seconds=i))
+                                for i, (score, status) in enumerate(zip(scores, statuses)))
+                    if len(logs) >= batch:
+                        raw_rows += write_logs(cursor, logs)
+                        db.commit()
+                        logs = []
+                else:
+                    # 초마다 속한 분을 구해 분 단위 합계만 계산
+                    slots = (start.second + np.arange(seconds)) // 60
+                    counts = np.bincount(slots)
+                    sums = np.bincount(slots, weights=scores)
+                    focusing = np.bincount(slots, weights=scores >= 70)
+                    first_minute = bucket_start(start, 60)
+                    for k in np.nonzero(counts)[0]:
+                        total = minutes[user_id, first_minute + timedelta(minutes=int(k))]
+                        total[0] += int(counts[k])
+                        total[1] += int(sums[k])
+                        total[2] += int(focusing[k])
+
+            if logs:
+                raw_rows += write_logs(cursor, logs)
+            if minutes:
+                flush_minutes(cursor, minutes)
+            cursor.executemany("""
+                INSERT INTO study_sessions (user_id, start_time, end_time, total_duration, avg_concentration)
+                VALUES (%s, %s, %s, %s, %s)
+            """, sessions)
+            db.commit()
+            if (n + 1) % 50 == 0:
+                print(f"   {n + 1}/{len(user_ids)}명 완료 (원본 로그 {raw_rows}행)")
+        print(f"✅ 생성 완료: 학생 {len(user_ids)}명 x {days}일, 원본 로그 {raw_rows}행")
+    finally:
+        cursor.close()
+
+
+def write_logs(cursor, logs):
+    cursor.executemany("""
+        INSERT INTO concentration_logs (user_id, concentration_score, status, gaze_status, created_at)
+        VALUES (%s, %s, %s, %s, %s)
+    """, logs)
+    upsert_rollups(cursor, [(user_id, created_at, score, status) for user_id, score, status, _, created_at in logs])
+    return len(logs)
+
+
+def drop(db):
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT user_id FROM users WHERE username LIKE %s", (PREFIX + "%",))
+        user_ids = [row[0] for row in cursor.fetchall()]
+        tables = [table for _, table, _ in GRAINS] + ["concentration_logs", "study_sessions", "face_landmarks", "users"]
+        for i in range(0, len(user_ids), 500):
+            chunk = user_ids[i:i + 500]
+            marks = ", ".join(["%s"] * len(chunk))
+            for table in tables:
+                cursor.execute(f"DELETE FROM {table} WHERE user_id IN ({marks})", chunk)
+            db.commit()
+        print(f"🧹 벤치마크 학생 {len(user_ids)}명 삭제")
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--hours-per-day", type=float, default=2.0)
+    parser.add_argument("--raw-students", type=int, default=20, help="초 단위 원본 로그까지 넣을 학생 수")
+    parser.add_argument("--batch", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drop", action="store_true", help="생성한 벤치마크 데이터를 삭제")
+    args = parser.parse_args()
+
+    db = get_db()
+    try:
+        if args.drop:
+            drop(db)
+        else:
+            generate(db, args.students, args.days, args.hours_per_day, args.raw_students, args.batch, args.seed)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
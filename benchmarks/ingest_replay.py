@@ -0,0 +1,98 @@
+"""
+/video/ingest WebSocket 재생 클라이언트: 영상 파일을 브라우저 대신 서버로 보냅니다.
+
+    python -m benchmarks.ingest_replay --url ws://localhost:8000/video/ingest \\
+        --token <session_token 쿠키 값> --video sample.mp4 --fps 15 --seconds 30
+
+--clients 로 같은 토큰 목록(쉼표 구분)을 여러 연결로 보내 원격 학생 여러 명을 흉내낼 수 있습니다.
+서버 ack 를 받은 뒤 다음 프레임을 보내며, 전송/수락/드롭 수와 왕복 지연을 출력합니다.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import cv2
+import numpy as np
+import websockets
+
+from benchmarks.common import summarize, print_table
+
+
+async def connect(url, token):
+    headers = {"Cookie": f"session_token={token}"}
+    try:
+        return await websockets.connect(url, additional_headers=headers, max_size=None)
+    except TypeError:
+        # websockets < 14
+        return await websockets.connect(url, extra_headers=headers, max_size=None)
+
+
+def encode_frames(video, width, height, quality, limit=300):
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frame = cv2.resize(frame, (width, height))
+        ok, buffer = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        if ok:
+            frames.append(buffer.tobytes())
+    cap.release()
+    if not frames:
+        raise RuntimeError(f"영상에서 프레임을 읽을 수 없습니다: {video}")
+    return frames
+
+
+async def run_client(url, token, frames, fps, seconds):
+    ws = await connect(url, token)
+    interval = 1.0 / fps
+    sent, rtts, last_ack = 0, [], {}
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            await ws.send(frames[sent % len(frames)])
+            last_ack = json.loads(await ws.recv())
+            rtts.append((time.monotonic() - started) * 1000.0)
+            sent += 1
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+    finally:
+        await ws.close()
+    return sent, last_ack, rtts
+
+
+async def main_async(args):
+    frames = encode_frames(args.video, args.width, args.height, args.quality)
+    tokens = [t for t in args.token.split(",") if t]
+    results = await asyncio.gather(*[
+        run_client(args.url, tokens[i % len(tokens)], frames, args.fps, args.seconds)
+        for i in range(args.clients)
+    ])
+
+    all_rtts = []
+    for i, (sent, ack, rtts) in enumerate(results):
+        all_rtts.extend(rtts)
+        print(f"client {i}: sent={sent} received={ack.get('received')} dropped={ack.get('dropped')} "
+              f"({sent / args.seconds:.1f} fps)")
+    print_table({"ack round-trip": summarize(all_rtts)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="ws://localhost:8000/video/ingest")
+    parser.add_argument("--token", required=True, help="session_token 쿠키 값 (쉼표로 여러 개)")
+    parser.add_argument("--video", required=True)
+    parser.add_argument("--fps", type=float, default=15.0)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--quality", type=int, default=70)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
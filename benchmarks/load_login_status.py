@@ -0,0 +1,115 @@
+"""
+로그인 폭주 중 /child/status 지연 부하 테스트. 실행 중인 서버에 대해 두 구간을 차례로 잽니다.
+
+1. 기준: /child/status 폴링만
+2. 로그인 폭주: 같은 폴링 + 부모 로그인(bcrypt) 동시 요청 --logins 개
+
+    python -m benchmarks.load_login_status --base-url http://localhost:8000 \\
+        --username parent1 --password secret --logins 32 --pollers 4 --seconds 15
+
+/child/status 의 p99 가 두 구간에서 크게 다르지 않아야 합니다 (bcrypt 는 auth 작업 풀에서만 실행).
+로그인 응답 중 503 은 AUTH_EXECUTOR_WORKERS + AUTH_EXECUTOR_QUEUE 를 넘어 거절된 요청입니다.
+"""
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+from benchmarks.common import summarize, print_table
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """로그인 성공(303) 뒤 대시보드까지 따라가지 않도록 리다이렉트를 막습니다."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def poll_status(url, stop, samples, errors, lock):
+    local_samples, local_errors = [], 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                response.read()
+            local_samples.append((time.perf_counter() - start) * 1000.0)
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+    with lock:
+        samples.extend(local_samples)
+        errors[0] += local_errors
+
+
+def login_loop(url, body, stop, samples, codes, lock):
+    opener = urllib.request.build_opener(_NoRedirect)
+    local_samples, local_codes = [], Counter()
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with opener.open(url, data=body, timeout=30) as response:
+                response.read()
+                code = response.status
+        except urllib.error.HTTPError as e:
+            code = e.code
+        except (urllib.error.URLError, OSError):
+            code = "error"
+        local_samples.append((time.perf_counter() - start) * 1000.0)
+        local_codes[code] += 1
+    with lock:
+        samples.extend(local_samples)
+        codes.update(local_codes)
+
+
+def run_phase(base_url, pollers, logins, body, seconds):
+    """pollers 개가 상태를 폴링하는 동안 logins 개가 로그인을 반복합니다."""
+    stop, lock = threading.Event(), threading.Lock()
+    status_samples, status_errors = [], [0]
+    login_samples, login_codes = [], Counter()
+    threads = [
+        threading.Thread(target=poll_status, args=(f"{base_url}/child/status", stop, status_samples, status_errors, lock))
+        for _ in range(pollers)
+    ] + [
+        threading.Thread(target=login_loop, args=(f"{base_url}/parent/login", body, stop, login_samples, login_codes, lock))
+        for _ in range(logins)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return status_samples, status_errors[0], login_samples, login_codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=32, help="동시 로그인 요청 수")
+    parser.add_argument("--pollers", type=int, default=4, help="/child/status 를 폴링하는 클라이언트 수")
+    parser.add_argument("--seconds", type=float, default=15.0, help="구간마다 측정할 시간")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    body = urllib.parse.urlencode({"username": args.username, "password": args.password}).encode()
+
+    baseline, baseline_errors, _, _ = run_phase(base_url, args.pollers, 0, body, args.seconds)
+    loaded, loaded_errors, login_samples, login_codes = run_phase(base_url, args.pollers, args.logins, body, args.seconds)
+
+    print_table({
+        "GET /child/status (기준)": summarize(baseline),
+        f"GET /child/status (로그인 {args.logins}개 동시)": summarize(loaded),
+        "POST /parent/login": summarize(login_samples),
+    })
+    print(f"상태 조회 오류: 기준 {baseline_errors}건, 로그인 중 {loaded_errors}건")
+    total = sum(login_codes.values())
+    print(f"로그인 {total}건 ({total / args.seconds:.1f}/s, 303=성공, 503=거절): "
+          + ", ".join(f"{code}={n}" for code, n in sorted(login_codes.items(), key=lambda item: str(item[0]))))
+
+
+if __name__ == "__main__":
+    main()
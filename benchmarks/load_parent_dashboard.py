@@ -0,0 +1,79 @@
+"""
+/parent/dashboard 부하 테스트. 실행 중인 서버(MySQL/MariaDB 연결)에 부모 계정으로 로그인한 뒤
+동시 요청을 보내 req/s 와 지연 시간 백분위를 출력합니다.
+
+    python -m benchmarks.load_parent_dashboard --base-url http://localhost:8000 \
+        --username parent1 --password secret --concurrency 32 --seconds 20
+
+DB_POOL_SIZE 를 바꿔 가며 실행하면 풀 크기에 따른 처리량 변화를 비교할 수 있습니다.
+"""
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+from benchmarks.common import summarize, print_table
+
+
+def login(base_url, username, password) -> str:
+    """폼 로그인으로 session_token 쿠키를 받아 반환합니다."""
+    jar = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    body = urllib.parse.urlencode({"username": username, "password": password}).encode()
+    opener.open(f"{base_url}/parent/login", data=body, timeout=10).read()
+    for cookie in jar:
+        if cookie.name == "session_token":
+            return cookie.value
+    raise RuntimeError("로그인 실패: session_token 쿠키를 받지 못했습니다.")
+
+
+def worker(url, token, deadline, samples, errors, lock):
+    request = urllib.request.Request(url, headers={"Cookie": f"session_token={token}"})
+    local_samples, local_errors = [], 0
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                response.read()
+            local_samples.append((time.perf_counter() - start) * 1000.0)
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+    with lock:
+        samples.extend(local_samples)
+        errors[0] += local_errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    token = login(base_url, args.username, args.password)
+
+    samples, errors, lock = [], [0], threading.Lock()
+    deadline = time.monotonic() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(f"{base_url}/parent/dashboard", token, deadline, samples, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    print(f"동시성 {args.concurrency}, {elapsed:.1f}s: {len(samples) / elapsed:.1f} req/s (오류 {errors[0]}건)")
+    print_table({"GET /parent/dashboard": summarize(samples)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+MJPEG 동시 시청 스트레스 테스트. 실행 중인 서버에 /video/video_feed 연결 --clients 개를 동시에 열어
+연결마다 받은 프레임 수와 프레임 간격을 재고, 그동안 /child/status 지연으로 서버 응답성을 확인합니다.
+
+    python -m benchmarks.stress_mjpeg --base-url http://localhost:8000 --clients 300 --seconds 20 \\
+        --token <session_token 쿠키 값> --abort 0.2
+
+--token 이 없으면 로컬 미리보기 세션을 봅니다. --abort 비율만큼의 연결은 중간에 소켓을 갑자기
+끊습니다. 끝난 뒤 /metrics 의 studybot_active_streams{kind="mjpeg"} 가 0 으로 돌아오면 서버가
+끊긴 연결을 모두 감지해 정리한 것입니다.
+"""
+import argparse
+import asyncio
+import random
+import time
+import urllib.parse
+
+from benchmarks.common import summarize, print_table
+
+BOUNDARY = b"--frame"
+
+
+async def open_stream(host, port, path, token):
+    """GET 요청을 보내고 응답 헤더까지 읽습니다. (reader, writer, 상태 코드)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    cookie = f"Cookie: session_token={token}\r\n" if token else ""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n{cookie}Connection: close\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    return reader, writer, int(head.split(b" ", 2)[1])
+
+
+async def http_get(host, port, path, token=None):
+    reader, writer, code = await open_stream(host, port, path, token)
+    try:
+        body = await reader.read()
+    finally:
+        writer.close()
+    return code, body
+
+
+async def viewer(host, port, path, token, deadline, abort_after):
+    """
+    스트림 하나를 deadline 까지(abort_after 가 있으면 연결 후 그 초만큼만) 읽고
+    (첫 프레임 ms, 프레임 간격 ms 목록, 읽은 시간 초, 오류) 를 반환합니다.
+    """
+    started = time.perf_counter()
+    first_ms, gaps, error = None, [], None
+    writer = None
+    try:
+        reader, writer, code = await asyncio.wait_for(open_stream(host, port, path, token), 10)
+        if code != 200:
+            return None, [], 0.0, f"HTTP {code}"
+        stop_at = min(deadline, time.monotonic() + abort_after) if abort_after else deadline
+        tail, last = b"", None
+        while time.monotonic() < stop_at:
+            try:
+                chunk = await asyncio.wait_for(reader.read(65536), max(0.01, stop_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                error = "closed"
+                break
+            data = tail + chunk
+            for _ in range(data.count(BOUNDARY)):
+                now = time.perf_counter()
+                if first_ms is None:
+                    first_ms = (now - started) * 1000.0
+                elif last is not None:
+                    gaps.append((now - last) * 1000.0)
+                last = now
+            tail = data[-(len(BOUNDARY) - 1):]
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+        error = type(e).__name__
+    finally:
+        if writer is not None:
+            if abort_after and writer.transport is not None:
+                writer.transport.abort()  # 정상 종료 없이 바로 끊음 (탭 강제 종료와 비슷)
+            else:
+                writer.close()
+    return first_ms, gaps, time.perf_counter() - started, error
+
+
+async def poll_status(host, port, deadline, samples, errors):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            code, _ = await asyncio.wait_for(http_get(host, port, "/child/status"), 10)
+            if code == 200:
+                samples.append((time.perf_counter() - start) * 1000.0)
+            else:
+                errors.append(code)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            errors.append("error")
+        await asyncio.sleep(0.1)
+
+
+async def active_mjpeg_streams(host, port):
+    """/metrics 의 studybot_active_streams{kind="mjpeg"} 값. 지표가 꺼져 있으면 None."""
+    try:
+        code, body = await asyncio.wait_for(http_get(host, port, "/metrics"), 10)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        return None
+    if code != 200:
+        return None
+    for line in body.decode(errors="replace").splitlines():
+        if line.startswith('studybot_active_streams{kind="mjpeg"}'):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+async def run(args):
+    url = urllib.parse.urlsplit(args.base_url)
+    host, port = url.hostname, url.port or 80
+    query = urllib.parse.urlencode({k: v for k, v in (("size", args.size), ("fps", args.fps)) if v})
+    path = "/video/video_feed" + (f"?{query}" if query else "")
+
+    rng = random.Random(args.seed)
+    deadline = time.monotonic() + args.seconds
+    aborts = [rng.uniform(1.0, max(1.0, args.seconds - args.ramp)) if rng.random() < args.abort else None
+              for _ in range(args.clients)]
+
+    status_samples, status_errors = [], []
+    viewers = []
+    for abort_after in aborts:
+        viewers.append(asyncio.create_task(viewer(host, port, path, args.token, deadline, abort_after)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.clients)
+    poller = asyncio.create_task(poll_status(host, port, deadline, status_samples, status_errors))
+    results = await asyncio.gather(*viewers)
+    await poller
+
+    first = [r[0] for r in results if r[0] is not None]
+    gaps = [gap for r in results for gap in r[1]]
+    errors = [r[3] for r in results if r[3]]
+    # 끝까지 본 연결의 수신 FPS (연결을 나눠 열었으므로 연결마다 읽은 시간으로 나눔)
+    fps = [(len(r[1]) + 1) / r[2] for r, abort_after in zip(results, aborts)
+           if abort_after is None and r[0] is not None and r[2] > 0]
+
+    print(f"연결 {args.clients}개 (중간 끊기 {sum(a is not None for a in aborts)}개), {args.seconds:.0f}s")
+    print_table({
+        "첫 프레임까지": summarize(first),
+        "프레임 간격": summarize(gaps),
+        "GET /child/status": summarize(status_samples),
+    })
+    if fps:
+        print(f"연결당 수신 FPS: 최소 {min(fps):.1f}, 평균 {sum(fps) / len(fps):.1f}, 최대 {max(fps):.1f}")
+    print(f"스트림 오류 {len(errors)}건 {sorted(set(map(str, errors)))}, 상태 조회 오류 {len(status_errors)}건")
+
+    # 서버가 끊긴 연결을 정리할 시간을 준 뒤 남은 스트림 수 확인
+    await asyncio.sleep(args.settle)
+    remaining = await active_mjpeg_streams(host, port)
+    if remaining is not None:
+        print(f"종료 {args.settle:.0f}s 후 서버의 열린 MJPEG 스트림: {remaining:.0f}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", help="session_token 쿠키 값 (없으면 로컬 미리보기 세션)")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--size", help="thumb/small/medium/full 또는 너비 px")
+    parser.add_argument("--fps", type=float, help="연결별 최대 전송 FPS")
+    parser.add_argument("--abort", type=float, default=0.0, help="중간에 갑자기 끊을 연결 비율 (0~1)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="연결을 나눠 여는 시간 (초)")
+    parser.add_argument("--settle", type=float, default=3.0, help="끝난 뒤 열린 스트림 수를 확인하기 전 대기 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+영상 파이프라인 성능 벤치마크 모음. 결과를 JSON 으로 저장해 커밋 간에 비교합니다.
+
+    python -m benchmarks.suite --video sample.mp4 --out bench/HEAD.json
+    python -m benchmarks.compare bench/base.json bench/HEAD.json
+
+측정 항목:
+- 단계별 지연 (p50/p95/p99): cv2.flip, BGR→RGB, FaceDetection, FaceMesh, _calculate_gaze_ratio,
+  draw_overlay, cv2.imencode, 그리고 detector.process_image 전체
+- 종단 처리율: PushFrameSource(CameraManager 호환 가짜 소스) → VideoPipeline 으로 프레임을 재생하며
+  분석/인코딩 FPS 와 generate_frames 처럼 wait_for_jpeg 로 받는 소비자의 FPS
+- 메모리: tracemalloc 최대 Python 할당량, 프로세스 최대 RSS
+
+--video 가 없으면 합성 프레임을 쓰므로 얼굴 관련 단계는 "얼굴 없음" 경로를 측정합니다
+(gaze_ratio 는 합성 랜드마크로 측정). 같은 입력으로 비교해야 의미가 있습니다.
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+import subprocess
+import tracemalloc
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+from benchmarks.common import load_frames, timed, summarize, print_table
+from src.core.camera import PushFrameSource
+from src.core.config import JPEG_QUALITY
+from src.core.pipeline import VideoPipeline
+from src.models.detector import ConcentrationDetector
+from src.models.gaze_tracker import GazeTracker
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "mediapipe": getattr(mp, "__version__", "unknown"),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def synthetic_landmarks():
+    """얼굴이 없는 입력에서도 gaze_ratio 단계를 측정할 수 있도록 프레임 가운데에 놓인 가짜 랜드마크"""
+    rng = np.random.default_rng(0)
+    landmarks = np.empty((468, 3), dtype=np.float32)
+    landmarks[:, :2] = rng.uniform(0.35, 0.65, (468, 2))
+    landmarks[:, 2] = 0.0
+    return landmarks
+
+
+def measure_stages(raw_frames, frames, warmup):
+    stages = {name: [] for name in (
+        "flip", "bgr2rgb", "face_detection", "face_mesh", "gaze_ratio", "overlay", "imencode", "process_image"
+    )}
+    face_detection = mp.solutions.face_detection.FaceDetection(min_detection_confidence=0.3, model_selection=0)
+    tracker = GazeTracker(refine=False)
+    tracker._init_mesh()
+    detector = ConcentrationDetector(motion_gate=False)
+    params = [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY]
+    fallback_landmarks = synthetic_landmarks()
+
+    for i, (raw, frame) in enumerate(zip(raw_frames, frames)):
+        record = i >= warmup
+        samples = {}
+
+        _, samples["flip"] = timed(cv2.flip, raw, 1)
+        rgb, samples["bgr2rgb"] = timed(cv2.cvtColor, frame, cv2.COLOR_BGR2RGB)
+        _, samples["face_detection"] = timed(face_detection.process, rgb)
+        mesh_result, samples["face_mesh"] = timed(tracker.mesh.process, rgb)
+
+        if mesh_result.multi_face_landmarks:
+            landmarks = tracker._landmarks_to_array(mesh_result.multi_face_landmarks[0].landmark)
+        else:
+            landmarks = fallback_landmarks
+        _, samples["gaze_ratio"] = timed(GazeTracker._calculate_gaze_ratio, frame, landmarks, tracker.left_eye)
+
+        result, samples["process_image"] = timed(detector.process_image, frame, draw=False)
+        annotated, samples["overlay"] = timed(detector.draw_overlay, frame, result)
+        _, samples["imencode"] = timed(cv2.imencode, ".jpg", annotated, params)
+
+        if record:
+            for name, ms in samples.items():
+                stages[name].append(ms)
+
+    face_detection.close()
+    tracker.close()
+    detector.close()
+    return {name: summarize(values) for name, values in stages.items()}
+
+
+def measure_pipeline(frames, seconds, source_fps, analysis_fps):
+    """가짜 소스에 source_fps 로 프레임을 넣으며 VideoPipeline 과 JPEG 소비자의 처리율을 잽니다."""
+    h, w = frames[0].shape[:2]
+    source = PushFrameSource(width=w, height=h, mirror=False)
+    source.start()
+    # 움직임 게이트가 켜지면 반복/합성 프레임에서 추론을 건너뛰어 이전 기록과 비교할 수 없음
+    detector = ConcentrationDetector(motion_gate=False)
+    pipeline = VideoPipeline(source, detector, analysis_fps=analysis_fps, jpeg_quality=JPEG_QUALITY)
+    pipeline.start()
+
+    stop = threading.Event()
+    consumed = [0]
+
+    def feed():
+        interval = 1.0 / source_fps if source_fps > 0 else 0.0
+        i = 0
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            source.push(frames[i % len(frames)])
+            i += 1
+            if interval:
+                next_at += interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def consume():
+        # generate_frames 와 같은 방식으로 기본 tier 를 구독하고 새 JPEG 을 기다려 받음
+        last_seq = 0
+        pipeline.subscribe()
+        while not stop.is_set():
+            seq, jpeg = pipeline.wait_for_jpeg(last_seq, timeout=0.5)
+            if jpeg is not None:
+                last_seq = seq
+                consumed[0] += 1
+
+    threads = [threading.Thread(target=feed, daemon=True), threading.Thread(target=consume, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    # 첫 1초는 워밍업
+    time.sleep(1.0)
+    analyzed0, encoded0, consumed0 = pipeline.analyzed_frames, pipeline.encoded_frames, consumed[0]
+    started = time.perf_counter()
+    time.sleep(seconds)
+    elapsed = time.perf_counter() - started
+    analyzed, encoded, received = (pipeline.analyzed_frames - analyzed0, pipeline.encoded_frames - encoded0,
+                                   consumed[0] - consumed0)
+
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=2)
+    pipeline.stop()
+    detector.close()
+    source.release()
+
+    return {
+        "seconds": round(elapsed, 2),
+        "source_fps": source_fps,
+        "analysis_fps_target": analysis_fps,
+        "analyzed_fps": round(analyzed / elapsed, 2),
+        "encoded_fps": round(encoded / elapsed, 2),
+        "consumer_fps": round(received / elapsed, 2),
+        "analysis_dropped": pipeline.analysis_queue.dropped,
+        "encode_dropped": pipeline.encode_queue.dropped
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", help="녹화 영상 경로 (없으면 합성 프레임)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--pipeline-seconds", type=float, default=10.0)
+    parser.add_argument("--source-fps", type=float, default=30.0, help="가짜 소스 입력 속도 (0 이면 최대 속도)")
+    parser.add_argument("--analysis-fps", type=float, default=5.0)
+    parser.add_argument("--out", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    raw_frames = load_frames(args.video, args.frames + args.warmup, mirror=False)
+    frames = [cv2.flip(frame, 1) for frame in raw_frames]
+
+    stages = measure_stages(raw_frames, frames, args.warmup)
+    print_table(stages)
+
+    pipeline = measure_pipeline(frames, args.pipeline_seconds, args.source_fps, args.analysis_fps)
+    print(f"파이프라인: 분석 {pipeline['analyzed_fps']} fps, 인코딩 {pipeline['encoded_fps']} fps, "
+          f"소비자 {pipeline['consumer_fps']} fps")
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    memory = {"python_peak_mb": round(peak / (1024 * 1024), 1), "max_rss_mb": max_rss_mb()}
+    print(f"메모리: Python 최대 {memory['python_peak_mb']} MB, 최대 RSS {memory['max_rss_mb']} MB")
+
+    report = {
+        "environment": environment(),
+        "input": {"video": args.video, "frames": args.frames, "warmup": args.warmup,
+                  "resolution": list(frames[0].shape[1::-1]), "motion_gate": False},
+        "stages": stages,
+        "pipeline": pipeline,
+        "memory": memory
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
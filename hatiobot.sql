@@ -21,6 +21,7 @@ CREATE TABLE face_landmarks (
     landmark_id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
     landmarks TEXT NOT NULL,
+    template BLOB NULL,  -- 중심 정렬된 float32 468x3 템플릿 (로그인 비교용, NULL 이면 landmarks 에서 변환)
     child_code VARCHAR(20) NOT NULL UNIQUE,  -- 자녀 코드
     region VARCHAR(100) NOT NULL,  -- 지역명 추가
     school_name VARCHAR(100) NOT NULL,  -- 학교명 추가
@@ -34,6 +35,9 @@ CREATE TABLE face_landmarks (
     INDEX idx_school_name (school_name)  -- 학교 검색을 위한 인덱스
 );
 
+-- 기존 데이터베이스 마이그레이션:
+-- ALTER TABLE face_landmarks ADD COLUMN template BLOB NULL AFTER landmarks;
+
 
 -- 로그인 기록 테이블
 CREATE TABLE login_history (
@@ -79,9 +83,30 @@ CREATE TABLE concentration_logs (
     gaze_status VARCHAR(50) NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(user_id),
-    INDEX idx_concentration_user (user_id)
+    INDEX idx_concentration_user_time (user_id, created_at)  -- 사용자별 기간 조회
+);
+
+-- 집중도 사전 집계 (분/시/일). 로그 기록과 같은 트랜잭션에서 누적되며 통계 API 는 이 표만 읽음
+-- bucket_start: 구간 시작 시각, samples: 로그 행 수, score_sum: 점수 합,
+-- focusing_samples: 'Focusing' 행 수, study_seconds: 학습 시간(로그 행 수 x LOG_BUCKET_SECONDS)
+CREATE TABLE concentration_rollup_minute (
+    user_id INT NOT NULL,
+    bucket_start DATETIME NOT NULL,
+    samples INT NOT NULL,
+    score_sum BIGINT NOT NULL,
+    focusing_samples INT NOT NULL,
+    study_seconds DOUBLE NOT NULL,
+    PRIMARY KEY (user_id, bucket_start),
+    INDEX idx_rollup_bucket (bucket_start),  -- 보존 기간 작업의 기간 삭제
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
 );
 
+CREATE TABLE concentration_rollup_hour LIKE concentration_rollup_minute;
+ALTER TABLE concentration_rollup_hour ADD FOREIGN KEY (user_id) REFERENCES users(user_id);
+
+CREATE TABLE concentration_rollup_day LIKE concentration_rollup_minute;
+ALTER TABLE concentration_rollup_day ADD FOREIGN KEY (user_id) REFERENCES users(user_id);
+
 -- 학습 세션 테이블
 CREATE TABLE study_sessions (
     session_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -93,5 +118,31 @@ CREATE TABLE study_sessions (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(user_id),
-    INDEX idx_study_sessions_user (user_id)
-);
\ No newline at end of file
+    INDEX idx_study_sessions_user_time (user_id, start_time)  -- 사용자별 기간 조회
+);
+
+-- 보존 기간 작업 상태. rollup_covered_from: 이 log_id 미만 원본 행은 rollup 에 반영되지 않았으므로
+-- 삭제 전에 압축해야 함 (0 이면 모두 반영됨)
+CREATE TABLE retention_state (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL
+);
+INSERT INTO retention_state (name, value) VALUES ('rollup_covered_from', 0);
+
+-- 기존 데이터베이스 마이그레이션 (rollup 표를 만든 뒤 python -m src.db.rollups --rebuild,
+-- 또는 재계산 대신 보존 기간 작업이 지우기 전에 압축하도록
+-- INSERT INTO retention_state (name, value) SELECT 'rollup_covered_from', IFNULL(MAX(log_id), 0) + 1 FROM concentration_logs
+--     ON DUPLICATE KEY UPDATE value = VALUES(value);):
+-- ALTER TABLE concentration_logs ADD INDEX idx_concentration_user_time (user_id, created_at), DROP INDEX idx_concentration_user;
+-- ALTER TABLE study_sessions ADD INDEX idx_study_sessions_user_time (user_id, start_time), DROP INDEX idx_study_sessions_user;
+
+-- (선택) concentration_logs 월 단위 파티션. 보존 기간 작업이 오래된 파티션을 통째로 DROP 하고
+-- 다음 달 파티션을 미리 만듭니다. MySQL 파티션 표는 외래 키를 가질 수 없고 기본 키에 파티션 열이
+-- 포함되어야 하므로 외래 키를 빼고 기본 키를 (log_id, created_at) 으로 바꿔야 합니다.
+-- ALTER TABLE concentration_logs DROP FOREIGN KEY <fk 이름>;
+-- ALTER TABLE concentration_logs MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+--     DROP PRIMARY KEY, ADD PRIMARY KEY (log_id, created_at);
+-- ALTER TABLE concentration_logs PARTITION BY RANGE (TO_DAYS(created_at)) (
+--     PARTITION p202401 VALUES LESS THAN (TO_DAYS('2024-02-01')),
+--     PARTITION pmax VALUES LESS THAN MAXVALUE
+-- );
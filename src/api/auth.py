@@ -1,56 +1,15 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.responses import JSONResponse
-import jwt
 from datetime import datetime, timedelta
 
-from src.core.config import SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-from src.core.security import verify_password, create_access_token
-from src.db.database import get_db
+from src.core.security import verify_password, create_access_token, get_current_user, decode_access_token
+from src.db.database import db_connection
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-async def get_current_user(request: Request):
-    """현재 로그인한 사용자 정보 확인"""
-    token = request.cookies.get("session_token")
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="인증되지 않은 사용자입니다.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        username: str = payload.get("sub")
-        user_type: str = payload.get("type")
-        if username is None or user_type is None:  # 수정된 부분
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="유효하지 않은 인증 정보입니다.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return {
-            "sub": username,
-            "type": user_type,
-            "user_id": payload.get("user_id"),
-            "parent_id": payload.get("parent_id"),
-            "child_code": payload.get("child_code")
-        }
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="인증이 만료되었습니다.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except jwt.JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="유효하지 않은 인증 토큰입니다.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
 async def get_current_active_user(current_user: dict = Depends(get_current_user)):
     """활성 사용자 확인"""
     if not current_user:
@@ -67,10 +26,9 @@ async def check_session(current_user: dict = Depends(get_current_user)):
     }
 
 @router.get("/user-info")
-async def get_user_info(current_user: dict = Depends(get_current_user)):
+def get_user_info(current_user: dict = Depends(get_current_user), db=Depends(db_connection)):
     """현재 사용자 정보 조회"""
     try:
-        db = get_db()
         cursor = db.cursor(dictionary=True)
         
         user_type = current_user.get("type")
@@ -108,7 +66,6 @@ async def get_user_info(current_user: dict = Depends(get_current_user)):
             
         finally:
             cursor.close()
-            db.close()
             
     except Exception as e:
         print(f"사용자 정보 조회 오류: {str(e)}")
@@ -184,14 +141,12 @@ async def get_permissions(current_user: dict = Depends(get_current_user)):
 async def validate_token(token: str):
     """토큰 유효성 검증"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return {
-            "valid": True,
-            "user_type": payload.get("type"),
-            "username": payload.get("sub"),
-            "expires_at": datetime.fromtimestamp(payload.get("exp")).isoformat()
-        }
-    except jwt.ExpiredSignatureError:
-        return {"valid": False, "error": "만료된 토큰입니다."}
-    except jwt.JWTError:
-        return {"valid": False, "error": "유효하지 않은 토큰입니다."}
\ No newline at end of file
+        payload = decode_access_token(token)
+    except HTTPException as e:
+        return {"valid": False, "error": e.detail}
+    return {
+        "valid": True,
+        "user_type": payload.get("type"),
+        "username": payload.get("sub"),
+        "expires_at": datetime.fromtimestamp(payload.get("exp")).isoformat()
+    }
\ No newline at end of file
@@ -2,110 +2,186 @@ from fastapi import APIRouter, Request, Depends, HTTPException, status
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from datetime import datetime
+from collections import Counter
 import json
 import cv2
 import secrets
 import string
 import numpy as np
-import mysql.connector
-import mediapipe as mp
 
 from src.core.security import create_access_token, get_current_user
-from src.core.config import DB_CONFIG
-from src.db.database import get_db
-from src.core.camera import CameraManager
-from src.models.detector import ConcentrationDetector
+from src.core.config import (
+    INGEST_FROM_BROWSER, FACE_IDENTIFY_THRESHOLD,
+    ENROLL_BURST_FRAMES, ENROLL_KEEP_FRAMES, LOGIN_WINDOW_FRAMES, LOGIN_WINDOW_SECONDS
+)
+from src.db.database import get_db, run_db
+from src.core.executors import ExecutorSaturated, face_executor
+from src.models.face_template import (
+    FaceTemplate, MATCH_THRESHOLD, template_cache, encode_template, decode_template,
+    template_from_json, template_distance
+)
+from src.models.face_index import face_index
+from src.models.face_mesh_pool import create_static_face_mesh, landmarks_from_results
+from src.models.face_quality import capture_enrollment, verify_stream
+from src import state
+from src.api.video import get_session, resolve_session_key, status_event_stream, sse_response
 
 
 router = APIRouter()
 templates = Jinja2Templates(directory="src/templates")
-detector = ConcentrationDetector()
 
-camera_manager = CameraManager()
-detector = ConcentrationDetector()
+QUALITY_MESSAGES = {
+    "Face not detected": "얼굴이 보이지 않습니다",
+    "Face too small": "카메라에 더 가까이 와 주세요",
+    "Blurry": "움직이지 말고 잠시 멈춰 주세요",
+    "Eyes closed": "눈을 떠 주세요",
+    "Head turned": "카메라를 정면으로 봐 주세요"
+}
 
 
-def get_db_connection():
-    return mysql.connector.connect(**DB_CONFIG)
-
 def extract_face_landmarks(frame):
-    mp_face_mesh = mp.solutions.face_mesh
-    with mp_face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, refine_landmarks=False) as face_mesh:
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(frame_rgb)
-
-        if results.multi_face_landmarks:
-            landmarks = results.multi_face_landmarks[0]
-            points = []
-            for landmark in landmarks.landmark:
-                points.append([landmark.x, landmark.y, landmark.z])
-            return np.array(points)
-
-    return None
-
-def compare_landmarks(db_landmarks, input_landmarks):
+    """정지 이미지 FaceMesh 풀에서 랜드마크를 추출합니다. 풀이 없으면(startup 전) 일회용 FaceMesh 를 사용합니다."""
+    pool = state.face_mesh_pool
+    if pool is not None:
+        return pool.extract(frame)
+    with create_static_face_mesh() as face_mesh:
+        return landmarks_from_results(face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+
+def compare_landmarks(template, input_landmarks):
+    """저장된 템플릿(중심 정렬된 float32)과 입력 랜드마크를 비교합니다. 입력 배열은 변경하지 않습니다."""
     if input_landmarks is None:
         return False
 
-    if db_landmarks.shape != input_landmarks.shape:
-        return False
-
-    db_landmarks -= db_landmarks.mean(axis=0)
-    input_landmarks -= input_landmarks.mean(axis=0)
-    distance = np.linalg.norm(db_landmarks - input_landmarks)
+    distance = template_distance(template, input_landmarks)
     print(f"[DEBUG] 평균 거리: {distance:.4f}")
-    return distance < 3.0
+    return distance < MATCH_THRESHOLD
 
-def verify_face(username: str, input_frame) -> bool:
+def _load_face_template(username):
+    """DB 에서 활성 얼굴 템플릿을 읽어 캐시에 넣습니다. template 이 없는 기존 행은 JSON 에서 변환해 채워 둡니다."""
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
     try:
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
-
-        try:
-            cursor.execute("SELECT user_id, username FROM users WHERE username = %s", (username,))
-            user = cursor.fetchone()
-
-            if not user:
-                print(f"사용자 정보 없음: username={username}")
-                return False
-
-            print(f"사용자 정보 찾음: user_id={user['user_id']}, username={user['username']}")
-
-            cursor.execute("""
-                SELECT landmarks 
-                FROM face_landmarks 
-                WHERE user_id = %s AND is_active = TRUE
-            """, (user['user_id'],))
-
-            result = cursor.fetchone()
-
-            if result:
-                print(f"얼굴 데이터 찾음: user_id={user['user_id']}")
-                db_landmarks = np.array(json.loads(result['landmarks']))
+        cursor.execute("""
+            SELECT u.user_id, u.username, f.landmark_id, f.child_code, f.template, f.landmarks
+            FROM users u
+            JOIN face_landmarks f ON u.user_id = f.user_id
+            WHERE u.username = %s AND f.is_active = TRUE
+        """, (username,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        if row["template"]:
+            template = decode_template(row["template"])
+        else:
+            template = template_from_json(row["landmarks"])
+            cursor.execute("UPDATE face_landmarks SET template = %s WHERE landmark_id = %s",
+                           (template.tobytes(), row["landmark_id"]))
+            db.commit()
+
+        entry = FaceTemplate(row["user_id"], row["username"], row["child_code"], template)
+        template_cache.put(entry)
+        return entry
+    finally:
+        cursor.close()
+        db.close()
+
+def verify_face(username: str, camera_manager):
+    """
+    카메라의 새 프레임들로 username 을 인증합니다. 품질 기준을 통과하고 등록 템플릿과 일치하는
+    첫 프레임에서 바로 끝나며, (일치한 FaceTemplate 또는 None, 마지막 프레임 평가) 를 반환합니다.
+    """
+    try:
+        entry = template_cache.get(username) or _load_face_template(username)
+        if entry is None:
+            print(f"얼굴 데이터 없음: username={username}")
+            return None, None
+
+        matched, checked, quality = verify_stream(
+            camera_manager,
+            extract_face_landmarks,
+            lambda landmarks: compare_landmarks(entry.template, landmarks),
+            max_frames=LOGIN_WINDOW_FRAMES,
+            timeout=LOGIN_WINDOW_SECONDS
+        )
+        if matched:
+            print(f"얼굴 인증 성공: user_id={entry.user_id} ({checked}번째 프레임)")
+            return entry, quality
 
-                input_landmarks = extract_face_landmarks(input_frame)
+        print(f"얼굴 인증 실패: user_id={entry.user_id} (프레임 {checked}장, 마지막 상태: {quality.reason if quality else '프레임 없음'})")
+        return None, quality
 
-                if input_landmarks is None:
-                    print("⚠️ 입력 프레임에서 얼굴 인식 실패")
-                    return False
+    except Exception as e:
+        print(f"얼굴 검증 오류: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return None, None
 
-                print(f"[DEBUG] DB shape: {db_landmarks.shape}, Input shape: {input_landmarks.shape}")
+def _load_face_index():
+    """모든 활성 얼굴 템플릿을 읽어 캐시와 1:N 인덱스를 구성합니다."""
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT u.user_id, u.username, f.child_code, f.template, f.landmarks
+            FROM users u
+            JOIN face_landmarks f ON u.user_id = f.user_id
+            WHERE f.is_active = TRUE
+        """)
+        entries = []
+        for row in cursor:
+            template = decode_template(row["template"]) if row["template"] else template_from_json(row["landmarks"])
+            entry = FaceTemplate(row["user_id"], row["username"], row["child_code"], template)
+            template_cache.put(entry)
+            entries.append(entry)
+    finally:
+        cursor.close()
+        db.close()
+    face_index.build(entries)
+
+def identify_face(input_frame):
+    """프레임 속 얼굴을 등록된 전체 사용자와 비교해 (입력 얼굴 감지 여부, 가장 가까운 (FaceTemplate, distance) 또는 None) 을 반환합니다."""
+    if not face_index.loaded:
+        _load_face_index()
+
+    input_landmarks = extract_face_landmarks(input_frame)
+    if input_landmarks is None:
+        return False, None
+    matches = face_index.search(input_landmarks, 1)
+    return True, matches[0] if matches else None
+
+def _create_child(username, email, region, school_name, landmarks):
+    """자녀 계정과 얼굴 데이터를 저장하고 (user_id, child_code) 를 반환합니다. 이미 있으면 None."""
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT u.user_id, u.username, u.email, f.region, f.school_name
+            FROM users u
+            LEFT JOIN face_landmarks f ON u.user_id = f.user_id
+            WHERE u.username = %s OR u.email = %s
+        """, (username, email))
+        if cursor.fetchone():
+            return None
 
-                if compare_landmarks(db_landmarks, input_landmarks):
-                    return True
+        child_code = f"STU-{secrets.token_hex(2)}-{secrets.token_hex(2)}"
 
-            print(f"얼굴 인증 실패: user_id={user['user_id']}")
-            return False
+        cursor.execute("INSERT INTO users (username, email) VALUES (%s, %s)", (username, email))
+        user_id = cursor.lastrowid
 
-        finally:
-            cursor.close()
-            db.close()
+        cursor.execute("""
+            INSERT INTO face_landmarks (user_id, landmarks, template, child_code, region, school_name)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (user_id, json.dumps(landmarks.tolist()), encode_template(landmarks), child_code, region, school_name))
 
-    except Exception as e:
-        print(f"얼굴 검증 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
+        db.commit()
+        template_cache.invalidate(user_id=user_id, username=username)
+        if face_index.loaded:
+            face_index.add(FaceTemplate(user_id, username, child_code, decode_template(encode_template(landmarks))))
+        return user_id, child_code
+    finally:
+        cursor.close()
+        db.close()
 
 @router.post("/register")
 async def register(request: Request):
@@ -121,51 +197,34 @@ async def register(request: Request):
             missing = [k for k, v in zip(["사용자 이름", "이메일", "지역", "학교명"], [username, email, region, school_name]) if not v]
             return JSONResponse(content={"success": False, "message": f"다음 정보가 필요합니다: {', '.join(missing)}"}, status_code=400)
 
-        camera = camera_manager.get_camera()
-        if camera is None or not camera.isOpened():
+        camera_manager = state.shared_camera_manager
+        if camera_manager is None or not camera_manager.is_running:
             return JSONResponse(content={"success": False, "message": "카메라를 초기화할 수 없습니다."}, status_code=500)
 
-        success, frame = camera.read()
-        if not success:
+        # 연속 촬영한 프레임 중 품질 기준을 통과한 상위 프레임의 평균 랜드마크로 등록
+        landmarks, qualities = await face_executor.run(
+            capture_enrollment, camera_manager, extract_face_landmarks,
+            burst=ENROLL_BURST_FRAMES, keep=ENROLL_KEEP_FRAMES
+        )
+        if not qualities:
             return JSONResponse(content={"success": False, "message": "카메라에서 이미지를 읽을 수 없습니다."}, status_code=500)
 
-        frame = cv2.resize(frame, (640, 480))
-        frame = cv2.flip(frame, 1)
-
-        landmarks = extract_face_landmarks(frame)
-
         if landmarks is None:
-            return JSONResponse(content={"success": False, "message": "얼굴을 감지할 수 없습니다."}, status_code=400)
-
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
+            reason = Counter(q.reason for q in qualities).most_common(1)[0][0]
+            return JSONResponse(content={"success": False, "message": f"얼굴을 감지할 수 없습니다. ({QUALITY_MESSAGES.get(reason, reason)})"}, status_code=400)
 
-        cursor.execute("""
-            SELECT u.user_id, u.username, u.email, f.region, f.school_name
-            FROM users u
-            LEFT JOIN face_landmarks f ON u.user_id = f.user_id
-            WHERE u.username = %s OR u.email = %s
-        """, (username, email))
-        if cursor.fetchone():
+        created = await run_db(_create_child, username, email, region, school_name, landmarks)
+        if created is None:
             return JSONResponse(content={"success": False, "message": "이미 등록된 사용자입니다."}, status_code=400)
+        user_id, child_code = created
 
-        child_code = f"STU-{secrets.token_hex(2)}-{secrets.token_hex(2)}"
-
-        cursor.execute("INSERT INTO users (username, email) VALUES (%s, %s)", (username, email))
-        user_id = cursor.lastrowid
-
-        cursor.execute("""
-            INSERT INTO face_landmarks (user_id, landmarks, child_code, region, school_name)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (user_id, json.dumps(landmarks.tolist()), child_code, region, school_name))
-
-        db.commit()
-
-        access_token = create_access_token({"sub": username, "type": "child", "user_id": user_id})
+        access_token = create_access_token({"sub": username, "type": "child", "user_id": user_id, "child_code": child_code})
         response = JSONResponse(content={"success": True, "child_code": child_code})
         response.set_cookie(key="session_token", value=access_token, httponly=True, max_age=1800)
         return response
 
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         print("등록 오류:", str(e))
         import traceback
@@ -178,40 +237,67 @@ async def login(request: Request):
         data = await request.json()
         username = data.get("username")
 
-        camera = camera_manager.get_camera()
-        if camera is None or not camera.isOpened():
+        camera_manager = state.shared_camera_manager
+        if camera_manager is None or not camera_manager.is_running:
             return JSONResponse(content={"success": False, "message": "카메라 초기화 실패"}, status_code=500)
 
-        success, frame = camera.read()
-        if not success:
-            return JSONResponse(content={"success": False, "message": "카메라 프레임 읽기 실패"}, status_code=500)
-
-        frame = cv2.resize(frame, (640, 480))
-        frame = cv2.flip(frame, 1)
-
-        if verify_face(username, frame):
-            db = get_db()
-            cursor = db.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT u.user_id, u.username, f.child_code
-                FROM users u 
-                JOIN face_landmarks f ON u.user_id = f.user_id 
-                WHERE u.username = %s AND f.is_active = TRUE
-            """, (username,))
-            user = cursor.fetchone()
-            access_token = create_access_token({"sub": username, "type": "child", "user_id": user["user_id"], "child_code": user["child_code"]})
+        user, quality = await face_executor.run(verify_face, username, camera_manager)
+        if user is not None:
+            access_token = create_access_token({"sub": username, "type": "child", "user_id": user.user_id, "child_code": user.child_code})
             response = JSONResponse(content={"success": True})
             response.set_cookie(key="session_token", value=access_token, httponly=True, max_age=1800)
             return response
         else:
-            return JSONResponse(content={"success": False, "message": "얼굴 인증 실패"}, status_code=401)
+            message = "얼굴 인증 실패"
+            if quality is not None and not quality.passed:
+                message += f" ({QUALITY_MESSAGES.get(quality.reason, quality.reason)})"
+            return JSONResponse(content={"success": False, "message": message}, status_code=401)
 
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         print("로그인 오류:", str(e))
         import traceback
         traceback.print_exc()
         return JSONResponse(content={"success": False, "message": str(e)}, status_code=500)
 
+@router.post("/identify")
+async def identify(request: Request):
+    """
+    아이디 입력 없이 현재 카메라 얼굴로 사용자를 찾습니다 (1:N 식별).
+    가장 가까운 후보가 임계값 안이면 그 사용자로 로그인합니다.
+    """
+    try:
+        camera_manager = state.shared_camera_manager
+        if camera_manager is None or not camera_manager.is_running:
+            return JSONResponse(content={"success": False, "message": "카메라 초기화 실패"}, status_code=500)
+
+        _, frame = camera_manager.read_latest(copy=True)
+        if frame is None:
+            return JSONResponse(content={"success": False, "message": "카메라 프레임 읽기 실패"}, status_code=500)
+
+        detected, match = await face_executor.run(identify_face, frame)
+        if not detected:
+            return JSONResponse(content={"success": False, "message": "얼굴을 감지할 수 없습니다."}, status_code=400)
+
+        # 후보 목록(다른 학생 이름/거리)은 인증 전 호출자에게 노출하지 않으므로 가장 가까운 한 명만 찾음
+        if match is None or match[1] >= FACE_IDENTIFY_THRESHOLD:
+            return JSONResponse(content={"success": False, "message": "일치하는 사용자가 없습니다."}, status_code=401)
+
+        user = match[0]
+        access_token = create_access_token({"sub": user.username, "type": "child", "user_id": user.user_id, "child_code": user.child_code})
+        response = JSONResponse(content={"success": True, "username": user.username})
+        response.set_cookie(key="session_token", value=access_token, httponly=True, max_age=1800)
+        return response
+
+    except ExecutorSaturated:
+        raise
+    except Exception as e:
+        print("식별 오류:", str(e))
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(content={"success": False, "message": str(e)}, status_code=500)
+
 @router.get("/main")
 async def main_page(request: Request):
     current_user = await get_current_user(request)
@@ -219,13 +305,17 @@ async def main_page(request: Request):
     return templates.TemplateResponse("main.html", {
         "request": request,
         "username": current_user["sub"],
-        "video_feed_url": f"/video/video_feed?t={timestamp}"
+        "video_feed_url": f"/video/video_feed?t={timestamp}",
+        "ingest_enabled": INGEST_FROM_BROWSER
     })
 
 @router.get("/status")
 async def get_status(request: Request):
     try:
-        current_status = detector.get_current_status()
+        # 로그인한 자녀 본인의 세션 (로그인 전이면 로컬 미리보기 세션)
+        session = await get_session(await resolve_session_key(request))
+        session.touch()
+        current_status = session.get_status()
         response_data = {
             "success": True,
             "status": current_status.get("status", "Unknown"),
@@ -235,6 +325,9 @@ async def get_status(request: Request):
         }
         return JSONResponse(content=response_data)
 
+    except (ExecutorSaturated, HTTPException):
+        # 세션/작업 풀 한도 초과(503) 는 그대로 전달
+        raise
     except Exception as e:
         print(f"상태 확인 오류: {str(e)}")
         return JSONResponse(
@@ -245,3 +338,10 @@ async def get_status(request: Request):
             },
             status_code=500
         )
+
+@router.get("/status/stream")
+async def status_stream(request: Request):
+    """상태 변경을 Server-Sent Events 로 push (폴링 대체)"""
+    key = await resolve_session_key(request)
+    await get_session(key)
+    return sse_response(status_event_stream(request, key, lambda payload: {"success": True, **payload}, keep_alive=True))
@@ -1,12 +1,19 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, status, Form
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import JSONResponse, RedirectResponse
-from src.core.security import hash_password, verify_password, create_access_token
-from src.core.config import DB_CONFIG, SECRET_KEY, JWT_ALGORITHM
-from src.db.database import get_db
-from datetime import datetime
-from typing import Dict, Any
-import jwt
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
+from src.core.security import hash_password, verify_password, create_access_token, get_current_user
+from src.core.config import DB_CONFIG, MOSAIC_FPS, MOSAIC_TILE_WIDTH, ROLLUP_MINUTE_RETENTION_DAYS
+from src.core.metrics import ACTIVE_STREAMS
+from src.core.executors import auth_executor
+from src.core.mosaic import snap_fps, snap_tile_width
+from src.db.database import get_db, db_connection, run_db
+from src import state
+from src.core.sessions import OFFLINE_STATUS
+from src.db.rollups import query_history
+from src.schemas.user import ChildStatistics, ParentDashboard
+from src.api.video import parent_has_child, status_event_stream, sse_response
+from datetime import datetime, timedelta
+from typing import Optional
 
 router = APIRouter()
 templates = Jinja2Templates(directory="src/templates")
@@ -22,96 +29,101 @@ STATUS_TRANSLATION = {
     "Looking right": "오른쪽 응시"
 }
 
-def raise_unauthenticated():
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-
 def raise_forbidden():
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="부모 계정만 접근 가능합니다.")
 
-def decode_token(token: str) -> Dict[str, Any]:
-    try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-    except jwt.ExpiredSignatureError:
-        raise_unauthenticated()
-    except jwt.JWTError:
-        raise_unauthenticated()
-
-async def get_current_user(request: Request):
-    token = request.cookies.get("session_token")
-    if not token:
-        raise_unauthenticated()
-    return decode_token(token)
-
 @router.get("/register")
 async def parent_register_page(request: Request):
     return templates.TemplateResponse("parent_register.html", {"request": request})
 
-@router.post("/register")
-async def parent_register(
-    request: Request,
-    username: str = Form(...),
-    password: str = Form(...),
-    password_confirm: str = Form(...),
-    email: str = Form(...),
-    child_code: str = Form(...)
-):
-    if password != password_confirm:
-        return templates.TemplateResponse("parent_register.html", {"request": request, "error": "비밀번호가 일치하지 않습니다."})
-
+def _registration_error(username, child_code):
+    """회원가입 입력 검증. 문제가 없으면 None."""
     db = get_db()
     cursor = db.cursor(dictionary=True)
     try:
         cursor.execute("SELECT username FROM parents WHERE username = %s", (username,))
         if cursor.fetchone():
-            return templates.TemplateResponse("parent_register.html", {"request": request, "error": "이미 사용 중인 아이디입니다."})
+            return "이미 사용 중인 아이디입니다."
 
         cursor.execute("SELECT f.landmark_id FROM face_landmarks f WHERE f.child_code = %s AND f.is_active = TRUE", (child_code,))
         if not cursor.fetchone():
-            return templates.TemplateResponse("parent_register.html", {"request": request, "error": "유효하지 않은 자녀 코드입니다."})
+            return "유효하지 않은 자녀 코드입니다."
+        return None
+    finally:
+        cursor.close()
+        db.close()
 
-        hashed_pw = hash_password(password)
+def _create_parent(username, hashed_pw, email, child_code):
+    db = get_db()
+    cursor = db.cursor()
+    try:
         cursor.execute("INSERT INTO parents (username, password, email) VALUES (%s, %s, %s)", (username, hashed_pw, email))
         parent_id = cursor.lastrowid
         cursor.execute("INSERT INTO parent_child (parent_id, child_code) VALUES (%s, %s)", (parent_id, child_code))
         db.commit()
-        return RedirectResponse(url="/parent/login", status_code=303)
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"회원가입 오류: {e}")
-        return templates.TemplateResponse("parent_register.html", {"request": request, "error": "회원가입 중 오류 발생."})
+        raise
+    finally:
+        cursor.close()
+        db.close()
+
+def _find_parent(username):
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT parent_id, password FROM parents WHERE username = %s", (username,))
+        return cursor.fetchone()
     finally:
         cursor.close()
         db.close()
 
+@router.post("/register")
+async def parent_register(
+    request: Request,
+    username: str = Form(...),
+    password: str = Form(...),
+    password_confirm: str = Form(...),
+    email: str = Form(...),
+    child_code: str = Form(...)
+):
+    if password != password_confirm:
+        return templates.TemplateResponse("parent_register.html", {"request": request, "error": "비밀번호가 일치하지 않습니다."})
+
+    error = await run_db(_registration_error, username, child_code)
+    if error:
+        return templates.TemplateResponse("parent_register.html", {"request": request, "error": error})
+
+    # bcrypt 는 요청당 100ms 이상 CPU 를 쓰므로 전용 작업 풀에서 (가득 차면 503)
+    hashed_pw = await auth_executor.run(hash_password, password)
+    try:
+        await run_db(_create_parent, username, hashed_pw, email, child_code)
+    except Exception as e:
+        print(f"회원가입 오류: {e}")
+        return templates.TemplateResponse("parent_register.html", {"request": request, "error": "회원가입 중 오류 발생."})
+    return RedirectResponse(url="/parent/login", status_code=303)
+
 @router.get("/login")
 async def parent_login_page(request: Request):
     return templates.TemplateResponse("parent_login.html", {"request": request})
 
 @router.post("/login")
 async def parent_login(request: Request, username: str = Form(...), password: str = Form(...)):
-    db = get_db()
-    cursor = db.cursor(dictionary=True)
-    try:
-        cursor.execute("SELECT parent_id, password FROM parents WHERE username = %s", (username,))
-        parent = cursor.fetchone()
+    parent = await run_db(_find_parent, username)
 
-        if not parent or not verify_password(password, parent["password"]):
-            return templates.TemplateResponse("parent_login.html", {"request": request, "error": "아이디 또는 비밀번호가 일치하지 않습니다."})
+    if not parent or not await auth_executor.run(verify_password, password, parent["password"]):
+        return templates.TemplateResponse("parent_login.html", {"request": request, "error": "아이디 또는 비밀번호가 일치하지 않습니다."})
 
-        access_token = create_access_token(data={"sub": username, "type": "parent", "parent_id": parent["parent_id"]})
-        response = RedirectResponse(url="/parent/dashboard", status_code=303)
-        response.set_cookie("session_token", access_token, httponly=True, secure=True, samesite="lax", max_age=1800)
-        return response
-    finally:
-        cursor.close()
-        db.close()
+    access_token = create_access_token(data={"sub": username, "type": "parent", "parent_id": parent["parent_id"]})
+    response = RedirectResponse(url="/parent/dashboard", status_code=303)
+    response.set_cookie("session_token", access_token, httponly=True, secure=True, samesite="lax", max_age=1800)
+    return response
 
 @router.get("/dashboard")
-async def parent_dashboard(request: Request, current_user: dict = Depends(get_current_user)):
+def parent_dashboard(request: Request, current_user: dict = Depends(get_current_user), db=Depends(db_connection)):
     if current_user.get("type") != "parent":
         raise_forbidden()
 
-    db = get_db()
     cursor = db.cursor(dictionary=True)
     try:
         cursor.execute("""
@@ -120,10 +132,88 @@ async def parent_dashboard(request: Request, current_user: dict = Depends(get_cu
             JOIN face_landmarks f ON pc.child_code = f.child_code
             JOIN users u ON f.user_id = u.user_id
             WHERE pc.parent_id = %s
+            ORDER BY pc.child_code
         """, (current_user["parent_id"],))
 
         children = cursor.fetchall()
-        return templates.TemplateResponse("parent_dashboard.html", {"request": request, "username": current_user["sub"], "children": children})
+        return templates.TemplateResponse("parent_dashboard.html", {
+            "request": request,
+            "username": current_user["sub"],
+            "children": children,
+            "mosaic_url": f"/parent/mosaic?t={datetime.now().timestamp()}" if children else None
+        })
+    finally:
+        cursor.close()
+
+def _child_codes(parent_id):
+    db = get_db()
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT child_code FROM parent_child WHERE parent_id = %s ORDER BY child_code", (parent_id,))
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        db.close()
+
+async def generate_mosaic(child_codes, tile_width, fps, request: Optional[Request] = None):
+    """
+    모자이크 MJPEG 비동기 생성기. 합성/인코딩은 MosaicStream 스레드가 한 번만 하고 시청자는 바이트만 공유합니다.
+    새 프레임 알림을 코루틴으로 기다리므로 시청자마다 스레드풀 슬롯을 잡지 않습니다.
+    스트림은 생성기 안에서 acquire 하므로, 응답이 시작되지 않고 끝나도 참조 수가 새지 않습니다.
+    """
+    stream = state.mosaic_hub.acquire(child_codes, tile_width, fps)
+    last_seq = 0
+    ACTIVE_STREAMS.labels("mosaic").inc()
+    try:
+        while stream.is_running:
+            seq, jpeg = await stream.wait_for_jpeg_async(last_seq, timeout=2.0)
+            if jpeg is None:
+                if request is not None and await request.is_disconnected():
+                    break
+                continue
+            last_seq = seq
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+    finally:
+        ACTIVE_STREAMS.labels("mosaic").dec()
+        state.mosaic_hub.release(stream)
+
+@router.get("/mosaic")
+async def mosaic_feed(request: Request, current_user: dict = Depends(get_current_user), tile: Optional[int] = None, fps: Optional[float] = None):
+    """
+    연결된 모든 자녀의 최신 프레임을 격자로 합친 MJPEG 한 개. 타일 순서는 child_code 순이고
+    tile(타일 너비 px), fps(MOSAIC_FPS 이하)로 조절하며 각각 정해진 단계로 맞춥니다. 같은 설정의 시청자는 인코딩을 공유합니다.
+    """
+    if current_user.get("type") != "parent":
+        raise_forbidden()
+    if state.mosaic_hub is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="모자이크 스트림이 초기화되지 않았습니다.")
+
+    child_codes = await run_db(_child_codes, current_user["parent_id"])
+    if not child_codes:
+        raise HTTPException(status_code=404, detail="등록된 자녀가 없습니다.")
+
+    tile_width = snap_tile_width(tile or MOSAIC_TILE_WIDTH)
+    return StreamingResponse(
+        generate_mosaic(child_codes, tile_width, snap_fps(fps, MOSAIC_FPS), request),
+        media_type="multipart/x-mixed-replace; boundary=frame"
+    )
+
+def _add_child(parent_id, child_code):
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT landmark_id FROM face_landmarks WHERE child_code = %s AND is_active = TRUE", (child_code,))
+        if not cursor.fetchone():
+            return JSONResponse(content={"success": False, "message": "유효하지 않은 자녀 코드입니다."})
+
+        cursor.execute("SELECT * FROM parent_child WHERE parent_id = %s AND child_code = %s", (parent_id, child_code))
+        if cursor.fetchone():
+            return JSONResponse(content={"success": False, "message": "이미 등록된 자녀입니다."})
+
+        cursor.execute("INSERT INTO parent_child (parent_id, child_code) VALUES (%s, %s)", (parent_id, child_code))
+        db.commit()
+        return JSONResponse(content={"success": True})
     finally:
         cursor.close()
         db.close()
@@ -136,37 +226,26 @@ async def add_child(request: Request, current_user: dict = Depends(get_current_u
     try:
         data = await request.json()
         child_code = data.get("child_code")
-
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
-        try:
-            cursor.execute("SELECT landmark_id FROM face_landmarks WHERE child_code = %s AND is_active = TRUE", (child_code,))
-            if not cursor.fetchone():
-                return JSONResponse(content={"success": False, "message": "유효하지 않은 자녀 코드입니다."})
-
-            cursor.execute("SELECT * FROM parent_child WHERE parent_id = %s AND child_code = %s", (current_user["parent_id"], child_code))
-            if cursor.fetchone():
-                return JSONResponse(content={"success": False, "message": "이미 등록된 자녀입니다."})
-
-            cursor.execute("INSERT INTO parent_child (parent_id, child_code) VALUES (%s, %s)", (current_user["parent_id"], child_code))
-            db.commit()
-            return JSONResponse(content={"success": True})
-        finally:
-            cursor.close()
-            db.close()
+        return await run_db(_add_child, current_user["parent_id"], child_code)
     except Exception as e:
         print(f"자녀 추가 오류: {e}")
         return JSONResponse(content={"success": False, "message": "자녀 추가 중 오류 발생"})
 
 @router.get("/child_status/{child_code}")
-async def get_child_status(request: Request, child_code: str, current_user: dict = Depends(get_current_user)):
+def get_child_status(request: Request, child_code: str, current_user: dict = Depends(get_current_user), db=Depends(db_connection)):
     if current_user.get("type") != "parent":
         raise_forbidden()
 
-    db = get_db()
     cursor = db.cursor(dictionary=True)
     try:
-        cursor.execute("SELECT u.username AS child_name, fl.region, fl.school_name FROM users u JOIN face_landmarks fl ON u.user_id = fl.user_id WHERE fl.child_code = %s", (child_code,))
+        # 이 부모에게 연결된 자녀만 조회 (다른 집 자녀 코드는 없는 것과 같게 404)
+        cursor.execute("""
+            SELECT u.username AS child_name, fl.region, fl.school_name
+            FROM parent_child pc
+            JOIN face_landmarks fl ON fl.child_code = pc.child_code
+            JOIN users u ON u.user_id = fl.user_id
+            WHERE pc.parent_id = %s AND pc.child_code = %s
+        """, (current_user["parent_id"], child_code))
         child = cursor.fetchone()
         if not child:
             raise HTTPException(status_code=404, detail="해당 자녀 정보를 찾을 수 없습니다.")
@@ -179,11 +258,12 @@ async def get_child_status(request: Request, child_code: str, current_user: dict
                 "child_name": child["child_name"],
                 "region": child["region"],
                 "school_name": child["school_name"],
-                "video_feed_url": f"/video/video_feed?t={datetime.now().timestamp()}"
+                "video_feed_url": f"/video/video_feed?child_code={child_code}&t={datetime.now().timestamp()}"
             })
         else:
-            from src.state import shared_detector
-            status_data = shared_detector.get_current_status()
+            # 세션을 새로 만들지 않고 조회만 함 (자녀가 접속 중이 아니면 오프라인 상태)
+            session = state.session_registry.peek(child_code) if state.session_registry else None
+            status_data = session.get_status() if session else OFFLINE_STATUS
             return JSONResponse(content={
                 "success": True,
                 "child_code": child_code,
@@ -192,8 +272,110 @@ async def get_child_status(request: Request, child_code: str, current_user: dict
                 "concentration_score": status_data.get("concentration_score", 0),
                 "gaze_status": STATUS_TRANSLATION.get(status_data.get("gaze_status"), "알 수 없음"),
                 "face_detected": status_data.get("face_detected", False),
+                "active": session is not None,
                 "timestamp": datetime.now().isoformat()
             })
     finally:
         cursor.close()
-        db.close()
+
+STATS_DEFAULT_DAYS = 7
+STATS_MAX_POINTS = 1000
+
+def _stats_range(start: Optional[datetime], end: Optional[datetime], points: int):
+    end = end or datetime.now()
+    start = start or end - timedelta(days=STATS_DEFAULT_DAYS)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start 는 end 보다 이전이어야 합니다.")
+    return start, end, min(max(points, 1), STATS_MAX_POINTS)
+
+def _child_statistics(cursor, user_id, child_code, start, end, points) -> ChildStatistics:
+    """rollup 표(기록/평균/학습 시간)와 study_sessions(세션 수/마지막 세션)로 한 자녀의 구간 통계를 만듭니다."""
+    minute_since = datetime.now() - timedelta(days=ROLLUP_MINUTE_RETENTION_DAYS)
+    summary = query_history(cursor, user_id, start, end, points, minute_since)
+    # 세션 수도 rollup 과 같은 (구간 경계로 맞춘) 범위에서 셈
+    cursor.execute("""
+        SELECT COUNT(*) AS total_sessions, MAX(start_time) AS last_session
+        FROM study_sessions
+        WHERE user_id = %s AND start_time >= %s AND start_time < %s
+    """, (user_id, summary["start"], summary["end"]))
+    sessions = cursor.fetchone() or {}
+    return ChildStatistics(
+        user_id=user_id,
+        child_code=child_code,
+        total_sessions=sessions.get("total_sessions") or 0,
+        average_concentration=summary["average_concentration"],
+        total_study_time=summary["total_study_time"],
+        last_session=sessions.get("last_session"),
+        concentration_history=summary["history"],
+        range_start=summary["start"],
+        range_end=summary["end"]
+    )
+
+@router.get("/child_stats/{child_code}", response_model=ChildStatistics)
+def get_child_stats(child_code: str, start: Optional[datetime] = None, end: Optional[datetime] = None, points: int = 100,
+                    current_user: dict = Depends(get_current_user), db=Depends(db_connection)):
+    """
+    [start, end) 구간(기본 최근 7일)의 자녀 집중도 통계. 원본 로그가 아니라 분/시/일 rollup 표에서
+    구간 길이에 맞는 단위를 골라 points 개 이하의 기록 점으로 내려받습니다.
+    """
+    if current_user.get("type") != "parent":
+        raise_forbidden()
+    start, end, points = _stats_range(start, end, points)
+
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT fl.user_id FROM parent_child pc
+            JOIN face_landmarks fl ON pc.child_code = fl.child_code
+            WHERE pc.parent_id = %s AND pc.child_code = %s
+        """, (current_user["parent_id"], child_code))
+        child = cursor.fetchone()
+        if not child:
+            raise HTTPException(status_code=404, detail="해당 자녀 정보를 찾을 수 없습니다.")
+        return _child_statistics(cursor, child["user_id"], child_code, start, end, points)
+    finally:
+        cursor.close()
+
+@router.get("/stats", response_model=ParentDashboard)
+def get_parent_stats(start: Optional[datetime] = None, end: Optional[datetime] = None, points: int = 24,
+                     current_user: dict = Depends(get_current_user), db=Depends(db_connection)):
+    """연결된 모든 자녀의 구간 통계 (자녀별 child_stats 와 같은 방식)."""
+    if current_user.get("type") != "parent":
+        raise_forbidden()
+    start, end, points = _stats_range(start, end, points)
+
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT fl.user_id, pc.child_code FROM parent_child pc
+            JOIN face_landmarks fl ON pc.child_code = fl.child_code
+            WHERE pc.parent_id = %s
+            ORDER BY pc.child_code
+        """, (current_user["parent_id"],))
+        children = cursor.fetchall()
+        stats = [_child_statistics(cursor, c["user_id"], c["child_code"], start, end, points) for c in children]
+        return ParentDashboard(parent_id=current_user["parent_id"], children_count=len(stats), children_stats=stats)
+    finally:
+        cursor.close()
+
+@router.get("/child_status/{child_code}/stream")
+async def child_status_stream(request: Request, child_code: str, current_user: dict = Depends(get_current_user)):
+    """자녀 상태 변경을 Server-Sent Events 로 push. 권한 확인은 구독 시작 시 한 번만 합니다."""
+    if current_user.get("type") != "parent":
+        raise_forbidden()
+    if not await run_db(parent_has_child, current_user.get("parent_id"), child_code):
+        raise HTTPException(status_code=404, detail="해당 자녀 정보를 찾을 수 없습니다.")
+
+    def format_payload(payload):
+        return {
+            "success": True,
+            "child_code": child_code,
+            "status": STATUS_TRANSLATION.get(payload["status"], "알 수 없음"),
+            "concentration_score": payload["concentration_score"],
+            "gaze_status": STATUS_TRANSLATION.get(payload["gaze_status"], "알 수 없음"),
+            "face_detected": payload["face_detected"],
+            "active": payload["active"],
+            "timestamp": datetime.now().isoformat()
+        }
+
+    return sse_response(status_event_stream(request, child_code, format_payload))
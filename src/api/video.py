@@ -1,62 +1,324 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-import cv2
+from typing import Optional, Callable
+import json
 import time
-from src.core.camera import CameraManager
-from src.models.detector import ConcentrationDetector
+import asyncio
+import cv2
+import numpy as np
+from src import state
+from src.core.camera import PushFrameSource
+from src.core.config import INGEST_MAX_FPS, INGEST_MAX_FRAME_BYTES, JPEG_QUALITY, STREAM_MAX_FPS
+from src.core.pipeline import EncodeTier
+from src.core.metrics import ACTIVE_STREAMS, DROPPED_FRAMES
+from src.core.security import get_current_user
+from src.core.sessions import LOCAL_SESSION_KEY, SessionLimitError, status_payload
+from src.db.database import get_db, run_db
+from src.core.executors import ExecutorSaturated, io_executor
 
 router = APIRouter()
 
-# 싱글톤처럼 사용할 전역 객체
-camera_manager = CameraManager()
-detector = ConcentrationDetector()
-
 
-def generate_frames():
-    """MJPEG 프레임 생성기"""
-    retries = 0
-    camera = camera_manager.get_camera()
+def parent_has_child(parent_id, child_code) -> bool:
+    db = get_db()
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM parent_child WHERE parent_id = %s AND child_code = %s", (parent_id, child_code))
+        return cursor.fetchone() is not None
+    finally:
+        cursor.close()
+        db.close()
 
-    if camera is None:
-        print("카메라 없음. 프레임 생성 중단.")
-        return
 
-    while True:
+async def resolve_session_key(request: Request, child_code: Optional[str] = None) -> str:
+    """
+    스트림/상태를 볼 세션 키를 결정합니다.
+    - child_code 없음: 로그인한 자녀 본인의 세션, 로그인 전이면 로컬 미리보기 세션
+    - child_code 지정: 본인(자녀)이거나 연결된 부모만 허용
+    """
+    if child_code is None:
         try:
-            success, frame = camera.read()
-            if not success or frame is None or frame.size == 0:
-                print("프레임 읽기 실패. 재시도 중...")
-                retries += 1
-                if retries >= 5:
-                    print("프레임 재시도 초과. 카메라 재초기화 시도.")
-                    camera.release()
-                    camera_manager.initialize_camera()
-                    camera = camera_manager.get_camera()
-                    retries = 0
-                    time.sleep(1)
+            current_user = await get_current_user(request)
+        except HTTPException:
+            return LOCAL_SESSION_KEY
+        return current_user.get("child_code") or LOCAL_SESSION_KEY
+
+    current_user = await get_current_user(request)
+    if current_user.get("type") == "child" and current_user.get("child_code") == child_code:
+        return child_code
+    if current_user.get("type") == "parent" and await run_db(
+            parent_has_child, current_user.get("parent_id"), child_code):
+        return child_code
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="해당 자녀의 영상에 접근할 수 없습니다.")
+
+
+async def get_session(key: str):
+    """
+    세션을 가져오거나 만듭니다. 이미 있으면 이벤트 루프에서 바로 반환하고(상태 폴링의 대부분),
+    생성만 카메라/MediaPipe 초기화로 느리므로 I/O 작업 풀에서 실행합니다 (가득 차면 503).
+    """
+    if state.session_registry is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="세션 관리자가 초기화되지 않았습니다.")
+    session = state.session_registry.peek(key)
+    if session is not None:
+        session.touch()
+        return session
+    try:
+        return await io_executor.run(state.session_registry.get, key)
+    except SessionLimitError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+async def status_event_stream(request: Request, key: str, format_payload: Callable[[dict], dict],
+                              keep_alive: bool = False, ping_interval: float = 15.0):
+    """
+    상태 허브의 key 를 구독해 Server-Sent Events 로 내보내는 비동기 생성기.
+    keep_alive=True 면 구독 중에 세션 접근 시간을 갱신해 유휴 정리되지 않게 합니다 (자녀 본인).
+    """
+    subscription = state.status_hub.subscribe(key)
+    ACTIVE_STREAMS.labels("sse").inc()
+    try:
+        if state.status_hub.last(key) is None:
+            session = state.session_registry.peek(key) if state.session_registry else None
+            initial = session.detector.get_current_status() if session and session.detector else None
+            yield f"data: {json.dumps(format_payload(status_payload(initial)))}\n\n"
+
+        while not await request.is_disconnected():
+            payload = await subscription.get(timeout=ping_interval)
+            if keep_alive and state.session_registry is not None:
+                state.session_registry.get(key, create=False)
+            if payload is None:
+                yield ": ping\n\n"
                 continue
+            yield f"data: {json.dumps(format_payload(payload))}\n\n"
+    finally:
+        subscription.close()
+        ACTIVE_STREAMS.labels("sse").dec()
+
+
+def sse_response(generator):
+    return StreamingResponse(
+        generator,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# 시청자끼리 인코딩 결과를 최대한 공유하도록 요청한 크기/품질을 몇 단계로 맞춤
+STREAM_SIZES = {"thumb": 160, "small": 320, "medium": 480, "full": None}
+STREAM_QUALITIES = (30, 50, 70, 85)
+
+# 적응형 조절: yield 뒤 다음 프레임 요청까지(=클라이언트로 보내는 데) 걸린 시간이
+# 프레임 간격의 SLOW_FACTOR 배를 SLOW_STREAK 번 연속 넘으면 한 단계 낮추고,
+# FAST_STREAK 번 연속 여유가 있으면 요청한 단계 쪽으로 한 단계 올림
+SLOW_FACTOR = 2.0
+SLOW_STREAK = 3
+FAST_STREAK = 60
+
+
+def resolve_tier(size: Optional[str] = None, quality: Optional[int] = None) -> EncodeTier:
+    """쿼리의 size(thumb/small/medium/full 또는 너비)와 quality 를 가장 가까운 공유 tier 로 맞춥니다."""
+    if size is None or size == "full":
+        width = None
+    elif size in STREAM_SIZES:
+        width = STREAM_SIZES[size]
+    else:
+        try:
+            requested = int(size)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"알 수 없는 size: {size}")
+        widths = [w for w in STREAM_SIZES.values() if w]
+        width = None if requested >= max(widths) else min(widths, key=lambda w: abs(w - requested))
+
+    if quality is None:
+        quality = JPEG_QUALITY
+    quality = min(STREAM_QUALITIES, key=lambda q: abs(q - quality))
+    return EncodeTier(width, quality)
+
+
+def tier_ladder(tier: EncodeTier) -> list:
+    """혼잡할 때 차례로 내려갈 tier 목록: 같은 크기에서 품질을 낮춘 뒤, 더 작은 크기로."""
+    ladder = [EncodeTier(tier.width, q) for q in sorted(STREAM_QUALITIES, reverse=True) if q <= tier.quality]
+    widths = sorted((w for w in STREAM_SIZES.values() if w), reverse=True)
+    ladder += [EncodeTier(w, STREAM_QUALITIES[1]) for w in widths if tier.width is None or w < tier.width]
+    return ladder
 
-            retries = 0
-            frame = cv2.flip(frame, 1)
-            result = detector.process_image(frame)
-            debug_frame = result.get("debug_image", frame)
 
-            ret, buffer = cv2.imencode('.jpg', debug_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-            if not ret:
+async def generate_frames(session, tier: Optional[EncodeTier] = None, max_fps: float = 0.0, adaptive: bool = True,
+                          request: Optional[Request] = None):
+    """
+    MJPEG 프레임 비동기 생성기. 세션 파이프라인이 tier 별로 한 번 인코딩한 최신 JPEG 을 공유합니다.
+    인코딩 단계의 새 프레임 알림을 코루틴으로 기다리므로 시청자마다 스레드풀 슬롯을 잡지 않습니다.
+    max_fps 로 연결별 전송 속도를 제한하고, adaptive=True 면 클라이언트가 밀릴 때 tier 를 낮춥니다.
+    전송 중 연결이 끊기면 StreamingResponse 가 생성기를 취소하고, 새 프레임이 없는 동안에는
+    request 로 연결 종료를 확인해 세션을 붙잡아 두지 않습니다.
+    """
+    pipeline = session.pipeline
+
+    if pipeline is None or not pipeline.is_running:
+        print("영상 파이프라인 없음. 프레임 생성 중단.")
+        return
+
+    ladder = tier_ladder(tier or pipeline.default_tier) if adaptive else [tier or pipeline.default_tier]
+    level = 0
+    current = pipeline.subscribe(ladder[level])
+    interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+    next_send = 0.0
+    slow = fast = 0
+
+    last_seq = 0
+    ACTIVE_STREAMS.labels("mjpeg").inc()
+    try:
+        while pipeline.is_running:
+            if interval:
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            seq, jpeg = await pipeline.wait_for_jpeg_async(last_seq, timeout=2.0, tier=current)
+            if jpeg is None:
+                if request is not None and await request.is_disconnected():
+                    break
                 continue
+            last_seq = seq
+            session.touch()
 
+            sent_at = time.monotonic()
+            if interval:
+                next_send = max(next_send + interval, sent_at - interval)
             yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        except Exception as e:
-            print(f"프레임 처리 중 오류: {e}")
-            time.sleep(1)
-            continue
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+
+            if len(ladder) == 1:
+                continue
+            # 다음 프레임을 요청받기까지의 시간 = 전송이 막혀 있던 시간
+            blocked = time.monotonic() - sent_at
+            if blocked > SLOW_FACTOR * max(interval, 1.0 / 30):
+                slow, fast = slow + 1, 0
+            else:
+                slow, fast = 0, fast + 1
+
+            target = level
+            if slow >= SLOW_STREAK and level < len(ladder) - 1:
+                target = level + 1
+            elif fast >= FAST_STREAK and level > 0:
+                target = level - 1
+            if target != level:
+                pipeline.unsubscribe(current)
+                level = target
+                current = pipeline.subscribe(ladder[level])
+                slow = fast = 0
+    finally:
+        pipeline.unsubscribe(current)
+        ACTIVE_STREAMS.labels("mjpeg").dec()
 
 
 @router.get("/video_feed")
-async def video_feed():
-    """MJPEG 영상 스트리밍"""
+async def video_feed(request: Request, child_code: Optional[str] = None, size: Optional[str] = None,
+                     quality: Optional[int] = None, fps: Optional[float] = None, adaptive: bool = True):
+    """
+    MJPEG 영상 스트리밍.
+    size(thumb/small/medium/full 또는 너비 px), quality(JPEG 품질), fps(최대 전송 속도) 로 화질을 고를 수 있고,
+    adaptive=true(기본) 면 전송이 밀릴 때 자동으로 품질/크기를 낮춥니다.
+    """
+    tier = resolve_tier(size, quality)
+    max_fps = min(fps, STREAM_MAX_FPS) if fps and fps > 0 else STREAM_MAX_FPS
+    key = await resolve_session_key(request, child_code)
+    session = await get_session(key)
     return StreamingResponse(
-        generate_frames(),
+        generate_frames(session, tier, max_fps, adaptive, request),
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
+
+
+def decode_frame(data: bytes):
+    """JPEG/PNG 바이트를 BGR 프레임으로 디코딩합니다. 실패하면 None."""
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None or frame.size == 0:
+        return None
+    return frame
+
+
+@router.websocket("/ingest")
+async def ingest(websocket: WebSocket):
+    """
+    학생 브라우저가 보내는 JPEG 프레임을 받아 해당 학생 세션의 파이프라인에 넣습니다.
+
+    - 로그인한 자녀만 연결할 수 있고, 연결된 동안 그 자녀의 세션은 이 연결을 캡처 소스로 사용합니다.
+    - 프레임 디코딩과 세션 정리는 io 작업 풀에서 실행합니다.
+    - 연결별로 INGEST_MAX_FPS 를 넘는 프레임, 크기 제한을 넘는 프레임, 분석 대기 프레임이 아직
+      남아 있는 상태(서버 분석이 밀린 상태)의 프레임은 디코딩하지 않고 버립니다. 인코딩 큐는 시청자가
+      없으면 늘 비어 있으므로 기준으로 쓰지 않습니다.
+    - 인증 실패는 1008, 세션/작업 풀 한도 초과는 1013 으로 닫습니다.
+    - 매 메시지마다 ack 를 돌려보내므로 클라이언트는 ack 를 받은 뒤 다음 프레임을 보내면 됩니다.
+    """
+    # accept 전에 close 하면 Starlette 가 HTTP 403 으로 거절해 브라우저는 1006 만 보므로,
+    # 먼저 accept 한 뒤 닫아야 클라이언트가 1008 을 받고 재연결을 멈춤
+    await websocket.accept()
+    try:
+        current_user = await get_current_user(websocket)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    child_code = current_user.get("child_code")
+    if current_user.get("type") != "child" or not child_code or state.session_registry is None:
+        await websocket.close(code=1008)
+        return
+
+    source = PushFrameSource()
+    source.start()
+    try:
+        session = await io_executor.run(state.session_registry.open_with_source, child_code, source)
+    except (SessionLimitError, ExecutorSaturated):
+        source.release()
+        await websocket.close(code=1013)
+        return
+
+    min_interval = 1.0 / INGEST_MAX_FPS if INGEST_MAX_FPS > 0 else 0.0
+    next_accept = 0.0
+    received = dropped = 0
+    ACTIVE_STREAMS.labels("ingest").inc()
+
+    try:
+        while True:
+            data = await websocket.receive_bytes()
+            received += 1
+            now = time.monotonic()
+
+            accepted = False
+            if (now >= next_accept
+                    and len(data) <= INGEST_MAX_FRAME_BYTES
+                    and not session.pipeline.analysis_backlog):
+                # 늦게 온 프레임 뒤에 한 번은 바로 받을 수 있게 하되 평균 속도는 max_fps 로 제한
+                next_accept = max(next_accept + min_interval, now - min_interval)
+                try:
+                    frame = await io_executor.run(decode_frame, data)
+                except ExecutorSaturated:
+                    # 작업 풀이 찼으면 이 프레임만 버림 (클라이언트는 다음 ack 뒤에 다시 보냄)
+                    frame = None
+                if frame is not None:
+                    source.push(frame)
+                    session.touch()
+                    accepted = True
+
+            if not accepted:
+                dropped += 1
+                DROPPED_FRAMES.labels("ingest").inc()
+
+            await websocket.send_json({
+                "type": "ack",
+                "accepted": accepted,
+                "received": received,
+                "dropped": dropped
+            })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        ACTIVE_STREAMS.labels("ingest").dec()
+        # 이 연결이 만든 세션일 때만 닫음 (다른 탭에서 새로 연결했으면 그대로 둠)
+        try:
+            await io_executor.run(state.session_registry.remove, child_code, source)
+        except ExecutorSaturated:
+            # 정리는 건너뛸 수 없으므로 작업 풀이 찼을 때만 기본 스레드풀로 넘김
+            await run_in_threadpool(state.session_registry.remove, child_code, source)
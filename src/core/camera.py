@@ -1,11 +1,20 @@
 import cv2
 import time
 import logging
+import threading
+import numpy as np
+
+from src.core.metrics import CAMERA_READ_SECONDS
 
 logger = logging.getLogger("camera_manager")
 
 class CameraManager:
-    def __init__(self, device_index=0, backend=None, width=640, height=480, max_retries=3):
+    def __init__(self, device_index=0, backend=None, width=640, height=480, max_retries=3,
+                 buffer_size=4, mirror=True, loop=False, realtime=False):
+        """
+        device_index 에는 장치 번호 외에 영상 파일 경로/스트림 URL 도 줄 수 있습니다.
+        파일 소스는 loop=True 로 끝에서 처음으로 되감고, realtime=True 로 파일의 FPS 에 맞춰 읽습니다.
+        """
         self.device_index = device_index
         self.backend = backend
         self.width = width
@@ -14,6 +23,17 @@ class CameraManager:
 
         self.camera = None
         self.is_initialized = False
+        self.loop = loop
+        self.realtime = realtime
+
+        # 캡처 스레드가 채우는 고정 크기 링 버퍼 (start() 시 한 번만 할당)
+        self.buffer_size = max(2, buffer_size)
+        self.mirror = mirror
+        self._ring = None
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._capture_thread = None
+        self._running = False
 
     def initialize_camera(self) -> bool:
         """
@@ -74,9 +94,174 @@ class CameraManager:
     def get_camera(self):
         return self.camera
 
+    # --- 공유 캡처 스레드 ---
+
+    def start(self):
+        """
+        백그라운드 캡처 스레드를 시작합니다.
+        장치는 이 스레드 하나만 읽고, 모든 소비자는 링 버퍼의 최신 프레임을 공유합니다.
+        """
+        if self._running:
+            return
+        if not self.is_initialized:
+            self.initialize_camera()
+
+        if self._ring is None:
+            self._ring = np.zeros((self.buffer_size, self.height, self.width, 3), dtype=np.uint8)
+
+        self._running = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._capture_thread.start()
+        logger.info("🎥 캡처 스레드 시작")
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._capture_thread and self._capture_thread is not threading.current_thread():
+            self._capture_thread.join(timeout=2)
+        self._capture_thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def frame_seq(self) -> int:
+        """마지막으로 기록된 프레임의 시퀀스 번호 (프레임이 없으면 0)"""
+        return self._seq
+
+    def _capture_loop(self):
+        retries = 0
+        scratch = None
+        interval = self._frame_interval()
+        next_frame = time.monotonic()
+
+        while self._running:
+            camera = self.camera
+            if camera is None:
+                if not self._reinitialize():
+                    time.sleep(1)
+                continue
+
+            if interval:
+                delay = next_frame - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_frame = max(next_frame + interval, time.monotonic() - interval)
+
+            read_started = time.perf_counter()
+            ret, scratch = camera.read(scratch)
+            CAMERA_READ_SECONDS.observe(time.perf_counter() - read_started)
+            if not ret and self.loop:
+                # 파일 끝: 처음으로 되감고 다시 읽기
+                camera.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, scratch = camera.read(scratch)
+            if not ret or scratch is None or scratch.size == 0:
+                retries += 1
+                if retries >= 5:
+                    logger.warning("⚠️ 프레임 재시도 초과. 카메라 재초기화 시도.")
+                    retries = 0
+                    self._reinitialize()
+                    time.sleep(1)
+                continue
+            retries = 0
+            self._publish(scratch)
+
+    def _publish(self, frame):
+        # 다음 슬롯에 기록한 뒤 시퀀스를 올려야 소비자가 반쯤 쓰인 프레임을 보지 않음
+        slot = self._ring[(self._seq + 1) % self.buffer_size]
+        self._store(frame, slot)
+
+        with self._cond:
+            self._seq += 1
+            self._cond.notify_all()
+
+    def _frame_interval(self) -> float:
+        """realtime 파일 재생 시 프레임 간격(초). 실시간 장치는 read() 자체가 속도를 맞추므로 0."""
+        if not self.realtime or self.camera is None:
+            return 0.0
+        fps = self.camera.get(cv2.CAP_PROP_FPS) or 0
+        return 1.0 / fps if fps > 0 else 1.0 / 30
+
+    def _store(self, frame, slot):
+        if frame.shape != slot.shape:
+            frame = cv2.resize(frame, (self.width, self.height))
+        if self.mirror:
+            cv2.flip(frame, 1, dst=slot)
+        else:
+            np.copyto(slot, frame)
+
+    def _reinitialize(self) -> bool:
+        self._reset_camera()
+        try:
+            return self.initialize_camera()
+        except RuntimeError:
+            logger.exception("❌ 카메라 재초기화 실패")
+            return False
+
+    def _slot_view(self, seq, copy):
+        frame = self._ring[seq % self.buffer_size]
+        return frame.copy() if copy else frame
+
+    def read_latest(self, copy=False):
+        """
+        가장 최근 프레임을 (seq, frame) 으로 반환합니다. 프레임이 없으면 (0, None).
+
+        copy=False 인 경우 링 버퍼 슬롯의 뷰를 그대로 돌려주므로 수정하면 안 되며,
+        buffer_size 프레임 이상 붙잡고 있으면 덮어쓰일 수 있습니다.
+        오래 보관해야 하는 경우(얼굴 등록/로그인 등)에는 copy=True 를 사용하세요.
+        """
+        with self._cond:
+            seq = self._seq
+            if seq == 0:
+                return 0, None
+            return seq, self._slot_view(seq, copy)
+
+    def wait_for_frame(self, last_seq=0, timeout=1.0, copy=False):
+        """last_seq 이후의 새 프레임이 기록될 때까지 기다린 뒤 (seq, frame) 을 반환합니다."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq or not self._running, timeout):
+                return last_seq, None
+            if self._seq <= last_seq:
+                return last_seq, None
+            seq = self._seq
+            return seq, self._slot_view(seq, copy)
+
     def release(self):
+        self.stop()
         if self.camera:
             self.camera.release()
             logger.info("🧹 카메라 자원 해제 완료")
         self.camera = None
         self.is_initialized = False
+
+
+class PushFrameSource(CameraManager):
+    """
+    장치를 직접 읽지 않고 외부에서 push() 로 넣어 주는 프레임을 같은 링 버퍼로 제공하는 소스.
+    브라우저가 WebSocket 으로 보낸 프레임을 VideoPipeline 에 연결할 때 사용합니다.
+    """
+
+    def __init__(self, width=640, height=480, buffer_size=4, mirror=True):
+        super().__init__(device_index=None, width=width, height=height,
+                         buffer_size=buffer_size, mirror=mirror)
+
+    def start(self):
+        if self._running:
+            return
+        if self._ring is None:
+            self._ring = np.zeros((self.buffer_size, self.height, self.width, 3), dtype=np.uint8)
+        self.is_initialized = True
+        self._running = True
+
+    def push(self, frame) -> int:
+        """디코딩된 BGR 프레임을 링 버퍼에 기록하고 새 시퀀스 번호를 반환합니다."""
+        if not self._running:
+            raise RuntimeError("PushFrameSource 가 시작되지 않았습니다.")
+        self._publish(frame)
+        return self._seq
+
+    def release(self):
+        self.stop()
+        self.is_initialized = False
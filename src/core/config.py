@@ -21,13 +21,103 @@ class Settings(BaseSettings):
     # 데이터베이스 설정
     db: DatabaseSettings = DatabaseSettings()
     
+    # 데이터베이스 연결 풀 설정
+    db_pool_size: int = int(os.getenv('DB_POOL_SIZE', '10'))
+    db_pool_timeout: float = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+    db_pool_recycle: float = float(os.getenv('DB_POOL_RECYCLE', '1800'))
+    db_pool_ping_after: float = float(os.getenv('DB_POOL_PING_AFTER', '30'))
+
+    # 블로킹 작업 풀 (src.core.executors): 작업 스레드 수 / 추가로 기다릴 수 있는 작업 수 (넘치면 503)
+    auth_executor_workers: int = int(os.getenv('AUTH_EXECUTOR_WORKERS', '4'))
+    auth_executor_queue: int = int(os.getenv('AUTH_EXECUTOR_QUEUE', '32'))
+    face_executor_workers: int = int(os.getenv('FACE_EXECUTOR_WORKERS', '4'))
+    face_executor_queue: int = int(os.getenv('FACE_EXECUTOR_QUEUE', '8'))
+    io_executor_workers: int = int(os.getenv('IO_EXECUTOR_WORKERS', '16'))
+    io_executor_queue: int = int(os.getenv('IO_EXECUTOR_QUEUE', '64'))
+
     # 얼굴 인식 모델 경로
     face_landmark_model: str = os.getenv('FACE_LANDMARK_MODEL', 'shape_predictor_68_face_landmarks.dat')
     
+    # 영상 파이프라인 설정
+    analysis_fps: float = float(os.getenv('ANALYSIS_FPS', '5'))
+    jpeg_quality: int = int(os.getenv('JPEG_QUALITY', '85'))
+
+    # 시청자별 MJPEG 최대 전송 FPS (video_feed?fps= 는 이 값 이하로만 지정 가능, 0 이면 제한 없음)
+    stream_max_fps: float = float(os.getenv('STREAM_MAX_FPS', '30'))
+
+    # 부모 대시보드 모자이크(/parent/mosaic): 자녀 최신 프레임을 한 장으로 합쳐 한 번 인코딩
+    mosaic_fps: float = float(os.getenv('MOSAIC_FPS', '5'))
+    mosaic_tile_width: int = int(os.getenv('MOSAIC_TILE_WIDTH', '320'))
+    mosaic_max_tiles: int = int(os.getenv('MOSAIC_MAX_TILES', '16'))
+    mosaic_jpeg_quality: int = int(os.getenv('MOSAIC_JPEG_QUALITY', '70'))
+
+    # 얼굴 검출 방식: facemesh (랜드마크 기반, FaceDetection 은 재탐색용) / detector (매 프레임 FaceDetection)
+    face_detection_mode: str = os.getenv('FACE_DETECTION_MODE', 'facemesh')
+    face_reacquire_after: int = int(os.getenv('FACE_REACQUIRE_AFTER', '5'))
+
+    # 움직임 게이트: 얼굴 영역 썸네일의 블록 평균 밝기 차가 MOTION_THRESHOLD 미만이면 추론 생략,
+    # 최대 MOTION_REFRESH_FRAMES 프레임 연속 생략 후에는 강제로 다시 분석
+    motion_gate_enabled: bool = os.getenv('MOTION_GATE_ENABLED', 'true').lower() == 'true'
+    motion_threshold: float = float(os.getenv('MOTION_THRESHOLD', '4.0'))
+    motion_refresh_frames: int = int(os.getenv('MOTION_REFRESH_FRAMES', '5'))
+
+    # 얼굴 등록/로그인용 정지 이미지 FaceMesh 작업 스레드 수
+    face_mesh_pool_size: int = int(os.getenv('FACE_MESH_POOL_SIZE', '2'))
+    # thread | process (process 는 작업 프로세스마다 FaceMesh 하나를 두어 웹 서버 프로세스와 GIL 을 나누지 않음)
+    face_mesh_pool_kind: str = os.getenv('FACE_MESH_POOL_KIND', 'thread')
+
+    # 얼굴 등록(연속 촬영)/로그인(스트리밍 검증) 프레임 품질 기준
+    enroll_burst_frames: int = int(os.getenv('ENROLL_BURST_FRAMES', '12'))
+    enroll_keep_frames: int = int(os.getenv('ENROLL_KEEP_FRAMES', '4'))
+    login_window_frames: int = int(os.getenv('LOGIN_WINDOW_FRAMES', '10'))
+    login_window_seconds: float = float(os.getenv('LOGIN_WINDOW_SECONDS', '3'))
+    face_min_size: float = float(os.getenv('FACE_MIN_SIZE', '0.12'))
+    face_min_sharpness: float = float(os.getenv('FACE_MIN_SHARPNESS', '40'))
+    face_min_ear: float = float(os.getenv('FACE_MIN_EAR', '0.18'))
+    face_max_yaw: float = float(os.getenv('FACE_MAX_YAW', '0.35'))
+    face_max_roll: float = float(os.getenv('FACE_MAX_ROLL', '15'))
+
+    # 1:N 얼굴 식별 (/child/identify) 설정. FACE_INDEX_PCA_DIM=0 이면 전체 행렬 비교만 사용
+    face_identify_threshold: float = float(os.getenv('FACE_IDENTIFY_THRESHOLD', '0.05'))
+    face_index_pca_dim: int = int(os.getenv('FACE_INDEX_PCA_DIM', '64'))
+    face_index_rerank: int = int(os.getenv('FACE_INDEX_RERANK', '200'))
+
+    # 학생 세션 설정 (CAMERA_SOURCES 예: "STU-aaaa-bbbb=/videos/a.mp4,STU-cccc-dddd=1")
+    max_sessions: int = int(os.getenv('MAX_SESSIONS', '32'))
+    session_idle_timeout: float = float(os.getenv('SESSION_IDLE_TIMEOUT', '300'))
+    camera_sources: str = os.getenv('CAMERA_SOURCES', '')
+
+    # 브라우저 프레임 수신(/video/ingest) 설정
+    ingest_from_browser: bool = os.getenv('INGEST_FROM_BROWSER', 'false').lower() == 'true'
+    ingest_max_fps: float = float(os.getenv('INGEST_MAX_FPS', '15'))
+    ingest_max_frame_bytes: int = int(os.getenv('INGEST_MAX_FRAME_BYTES', '1000000'))
+
+    # 집중도 기록(concentration_logs / study_sessions) 설정
+    log_writer_enabled: bool = os.getenv('LOG_WRITER_ENABLED', 'true').lower() == 'true'
+    log_bucket_seconds: float = float(os.getenv('LOG_BUCKET_SECONDS', '1'))
+    log_batch_size: int = int(os.getenv('LOG_BATCH_SIZE', '200'))
+    log_flush_interval: float = float(os.getenv('LOG_FLUSH_INTERVAL', '5'))
+    study_session_gap: float = float(os.getenv('STUDY_SESSION_GAP', '120'))
+    log_spool_path: str = os.getenv('LOG_SPOOL_PATH', 'data/log_spool.jsonl')
+    log_spool_max_bytes: int = int(os.getenv('LOG_SPOOL_MAX_BYTES', str(50 * 1024 * 1024)))
+
+    # 보존 기간: 원본 로그 / 분 단위 rollup 보관 일수 (시/일 rollup 은 계속 보관).
+    # RETENTION_INTERVAL 초마다 앱 안에서 실행 (0 이면 비활성, python -m src.db.retention 으로 수동 실행)
+    log_retention_days: int = int(os.getenv('LOG_RETENTION_DAYS', '90'))
+    rollup_minute_retention_days: int = int(os.getenv('ROLLUP_MINUTE_RETENTION_DAYS', '30'))
+    retention_batch_size: int = int(os.getenv('RETENTION_BATCH_SIZE', '5000'))
+    retention_pause: float = float(os.getenv('RETENTION_PAUSE', '0.05'))
+    retention_interval: float = float(os.getenv('RETENTION_INTERVAL', '3600'))
+
+    # /metrics (Prometheus 텍스트 형식) 지표 수집
+    metrics_enabled: bool = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
     # JWT 설정
     secret_key: str = os.getenv('SECRET_KEY', 'your-secret-key')
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '30'))
+    # 검증된 JWT → claims 캐시 크기 (0 이면 매 요청 검증)
+    auth_cache_size: int = int(os.getenv('AUTH_CACHE_SIZE', '4096'))
     
     class Config:
         env_file = ".env"
@@ -43,7 +133,64 @@ DB_CONFIG = {
     'database': settings.db.database
 }
 
+DB_POOL_SIZE = settings.db_pool_size
+DB_POOL_TIMEOUT = settings.db_pool_timeout
+DB_POOL_RECYCLE = settings.db_pool_recycle
+DB_POOL_PING_AFTER = settings.db_pool_ping_after
+AUTH_EXECUTOR_WORKERS = settings.auth_executor_workers
+AUTH_EXECUTOR_QUEUE = settings.auth_executor_queue
+FACE_EXECUTOR_WORKERS = settings.face_executor_workers
+FACE_EXECUTOR_QUEUE = settings.face_executor_queue
+IO_EXECUTOR_WORKERS = settings.io_executor_workers
+IO_EXECUTOR_QUEUE = settings.io_executor_queue
+
 FACE_LANDMARK_MODEL = settings.face_landmark_model
 SECRET_KEY = settings.secret_key
 JWT_ALGORITHM = settings.jwt_algorithm
-ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+AUTH_CACHE_SIZE = settings.auth_cache_size
+ANALYSIS_FPS = settings.analysis_fps
+JPEG_QUALITY = settings.jpeg_quality
+STREAM_MAX_FPS = settings.stream_max_fps
+MOSAIC_FPS = settings.mosaic_fps
+MOSAIC_TILE_WIDTH = settings.mosaic_tile_width
+MOSAIC_MAX_TILES = settings.mosaic_max_tiles
+MOSAIC_JPEG_QUALITY = settings.mosaic_jpeg_quality
+FACE_DETECTION_MODE = settings.face_detection_mode
+FACE_REACQUIRE_AFTER = settings.face_reacquire_after
+MOTION_GATE_ENABLED = settings.motion_gate_enabled
+MOTION_THRESHOLD = settings.motion_threshold
+MOTION_REFRESH_FRAMES = settings.motion_refresh_frames
+FACE_MESH_POOL_SIZE = settings.face_mesh_pool_size
+FACE_MESH_POOL_KIND = settings.face_mesh_pool_kind
+ENROLL_BURST_FRAMES = settings.enroll_burst_frames
+ENROLL_KEEP_FRAMES = settings.enroll_keep_frames
+LOGIN_WINDOW_FRAMES = settings.login_window_frames
+LOGIN_WINDOW_SECONDS = settings.login_window_seconds
+FACE_MIN_SIZE = settings.face_min_size
+FACE_MIN_SHARPNESS = settings.face_min_sharpness
+FACE_MIN_EAR = settings.face_min_ear
+FACE_MAX_YAW = settings.face_max_yaw
+FACE_MAX_ROLL = settings.face_max_roll
+FACE_IDENTIFY_THRESHOLD = settings.face_identify_threshold
+FACE_INDEX_PCA_DIM = settings.face_index_pca_dim
+FACE_INDEX_RERANK = settings.face_index_rerank
+MAX_SESSIONS = settings.max_sessions
+SESSION_IDLE_TIMEOUT = settings.session_idle_timeout
+CAMERA_SOURCES = settings.camera_sources
+INGEST_FROM_BROWSER = settings.ingest_from_browser
+INGEST_MAX_FPS = settings.ingest_max_fps
+INGEST_MAX_FRAME_BYTES = settings.ingest_max_frame_bytes
+LOG_WRITER_ENABLED = settings.log_writer_enabled
+LOG_BUCKET_SECONDS = settings.log_bucket_seconds
+LOG_BATCH_SIZE = settings.log_batch_size
+LOG_FLUSH_INTERVAL = settings.log_flush_interval
+STUDY_SESSION_GAP = settings.study_session_gap
+LOG_SPOOL_PATH = settings.log_spool_path
+LOG_SPOOL_MAX_BYTES = settings.log_spool_max_bytes
+LOG_RETENTION_DAYS = settings.log_retention_days
+ROLLUP_MINUTE_RETENTION_DAYS = settings.rollup_minute_retention_days
+RETENTION_BATCH_SIZE = settings.retention_batch_size
+RETENTION_PAUSE = settings.retention_pause
+RETENTION_INTERVAL = settings.retention_interval
+METRICS_ENABLED = settings.metrics_enabled
\ No newline at end of file
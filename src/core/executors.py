@@ -0,0 +1,117 @@
+"""
+블로킹 작업용 제한 실행기(bounded executor).
+
+async 엔드포인트의 블로킹 호출을 용도별 작업 풀로 보냅니다.
+- auth_executor: bcrypt 해시/검증 (요청당 100ms 이상 CPU)
+- face_executor: 얼굴 등록(연속 촬영)/로그인(스트리밍 검증)/식별 (요청당 수 초)
+- io_executor: DB 호출(run_db), 세션 생성(카메라/MediaPipe 초기화)
+
+FastAPI 기본 스레드풀(sync 엔드포인트가 함께 씀)과 분리되어 있어 로그인이
+몰려도 스트림과 상태 조회가 스레드를 기다리지 않습니다. 실행 중 + 대기 작업이 workers + queue 를
+넘으면 작업을 쌓지 않고 바로 ExecutorSaturated 를 던지며, main 의 예외 핸들러가 503 으로 응답합니다.
+
+    hashed = await auth_executor.run(hash_password, password)
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from src.core.config import (
+    AUTH_EXECUTOR_WORKERS, AUTH_EXECUTOR_QUEUE, FACE_EXECUTOR_WORKERS, FACE_EXECUTOR_QUEUE,
+    IO_EXECUTOR_WORKERS, IO_EXECUTOR_QUEUE
+)
+
+logger = logging.getLogger("executors")
+
+
+class ExecutorSaturated(Exception):
+    """작업 풀의 실행 + 대기 슬롯이 모두 찬 상태 (HTTP 503 으로 변환)."""
+
+    def __init__(self, name, retry_after=1):
+        super().__init__(f"서버가 바쁩니다. 잠시 후 다시 시도하세요. ({name})")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    작업 수가 제한된 스레드(또는 프로세스) 풀.
+
+    슬롯은 제출 시 잡고 작업이 실제로 끝날 때 돌려줍니다. 요청이 취소돼도(클라이언트 연결 종료)
+    이미 실행 중인 작업이 끝나기 전까지는 슬롯이 비지 않으므로 풀 안의 실제 작업 수가 한도를 넘지 않습니다.
+    kind="process" 는 인자와 함수가 pickle 가능해야 합니다.
+    """
+
+    def __init__(self, name, workers, queue, kind="thread"):
+        self.name = name
+        self.workers = max(1, workers)
+        self.limit = self.workers + max(0, queue)
+        self.kind = kind
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.limit:
+                self.rejected += 1
+                raise ExecutorSaturated(self.name)
+            self._in_flight += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) 를 풀에서 실행하고 결과를 기다립니다. 가득 찼으면 ExecutorSaturated."""
+        self._acquire()
+        try:
+            future = self._pool().submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "limit": self.limit,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+auth_executor = BoundedExecutor("auth", AUTH_EXECUTOR_WORKERS, AUTH_EXECUTOR_QUEUE)
+face_executor = BoundedExecutor("face", FACE_EXECUTOR_WORKERS, FACE_EXECUTOR_QUEUE)
+io_executor = BoundedExecutor("io", IO_EXECUTOR_WORKERS, IO_EXECUTOR_QUEUE)
+
+EXECUTORS = (auth_executor, face_executor, io_executor)
+
+
+def shutdown_executors(wait=True):
+    for executor in EXECUTORS:
+        executor.shutdown(wait=wait)
+    logger.info("✅ 작업 풀 종료")
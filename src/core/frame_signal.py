@@ -0,0 +1,71 @@
+"""
+인코딩 스레드 → asyncio 코루틴 프레임 준비 알림.
+
+MJPEG 시청자는 스레드 대신 코루틴으로 새 JPEG 을 기다립니다. 생산자(인코딩 스레드)가 새 JPEG 을
+저장한 뒤 notify_all() 을 부르면 기다리던 코루틴들이 깨어납니다. 대기자는 이벤트 루프별로 모아
+루프마다 call_soon_threadsafe 를 한 번만 부르므로, 시청자가 수백 명이어도 프레임당 스레드 간
+호출 수는 이벤트 루프(uvicorn 워커) 수만큼입니다.
+
+    with cond:                        # 생산자의 상태 락
+        if not ready():
+            waiter = signal.waiter()  # 같은 락 안에서 등록해야 알림을 놓치지 않음
+    await signal.wait(waiter, timeout)
+"""
+import asyncio
+import threading
+
+
+def _wake(futures):
+    # 이벤트 루프 스레드에서만 호출됨
+    for future in futures:
+        if not future.done():
+            future.set_result(None)
+
+
+class AsyncFrameSignal:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = {}  # loop -> set(Future)
+
+    def waiter(self) -> asyncio.Future:
+        """현재 이벤트 루프에서 다음 notify_all() 을 기다릴 Future."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._waiters.setdefault(loop, set()).add(future)
+        return future
+
+    def discard(self, future):
+        loop = future.get_loop()
+        with self._lock:
+            futures = self._waiters.get(loop)
+            if futures is None:
+                return
+            futures.discard(future)
+            if not futures:
+                del self._waiters[loop]
+
+    async def wait(self, future, timeout) -> bool:
+        """waiter() 로 받은 Future 를 최대 timeout 초 기다립니다. 알림을 받았으면 True."""
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.discard(future)
+
+    def notify_all(self):
+        """기다리던 코루틴을 모두 깨웁니다. 어느 스레드에서나 호출할 수 있습니다."""
+        with self._lock:
+            waiters, self._waiters = self._waiters, {}
+        for loop, futures in waiters.items():
+            try:
+                loop.call_soon_threadsafe(_wake, futures)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘
+                pass
+
+    def waiter_count(self) -> int:
+        with self._lock:
+            return sum(len(futures) for futures in self._waiters.values())
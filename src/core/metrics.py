@@ -0,0 +1,233 @@
+"""
+Prometheus 텍스트 형식 지표.
+
+외부 라이브러리 없이 Counter / Gauge / Histogram 만 구현합니다. METRICS_ENABLED=false 이면
+모든 기록 메서드가 첫 줄에서 바로 반환하므로 핫 루프 비용은 불리언 검사 하나입니다.
+
+    DETECTOR_SECONDS.observe(elapsed)
+    DROPPED_FRAMES.labels("encode").inc()
+"""
+import time
+import threading
+from bisect import bisect_left
+
+from src.core.config import METRICS_ENABLED
+
+ENABLED = METRICS_ENABLED
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        if not ENABLED:
+            return
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1.0):
+        self.inc(-amount)
+
+    def set(self, value):
+        if not ENABLED:
+            return
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+    def _samples(self):
+        return [f"{self.name}_total{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+                for values, child in list(self._children.items())]
+
+
+class Gauge(_Metric):
+    """값을 직접 set/inc/dec 하거나, callback 을 주면 조회 시점에 계산합니다 (숫자 또는 {라벨 튜플: 값})."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount=1.0):
+        self.labels().dec(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def _samples(self):
+        if self.callback is not None:
+            try:
+                value = self.callback()
+            except Exception:
+                return []
+            items = value.items() if isinstance(value, dict) else [((), value)]
+        else:
+            items = [(values, child.value) for values, child in list(self._children.items())]
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(v)}"
+                for values, v in items if v is not None]
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        if not ENABLED:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("target", "started")
+
+    def __init__(self, target):
+        self.target = target
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.target.observe(time.perf_counter() - self.started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self):
+        lines = []
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = ("le", _format_value(bound) if bound != float("inf") else "+Inf")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {count}")
+        return lines
+
+
+def render() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+    lines = []
+    for metric in list(_registry):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- 영상 파이프라인 ---
+CAMERA_READ_SECONDS = Histogram("studybot_camera_read_seconds", "카메라/영상 파일 프레임 읽기 시간")
+DETECTOR_SECONDS = Histogram("studybot_detector_process_seconds", "ConcentrationDetector.process_image 처리 시간")
+GAZE_SECONDS = Histogram("studybot_gaze_analyze_seconds", "GazeTracker.analyze (FaceMesh + 시선 계산) 처리 시간")
+JPEG_ENCODE_SECONDS = Histogram("studybot_jpeg_encode_seconds", "오버레이 그리기 + JPEG 인코딩 시간")
+MOTION_SKIPPED_FRAMES = Counter("studybot_motion_skipped_frames", "장면 변화가 없어 추론을 건너뛰고 직전 결과를 재사용한 프레임 수")
+DROPPED_FRAMES = Counter("studybot_dropped_frames", "처리되지 못하고 버려진 프레임 수", ["stage"])
+ACTIVE_STREAMS = Gauge("studybot_active_streams", "열려 있는 스트림 연결 수", ["kind"])
+
+# --- DB ---
+DB_ACQUIRE_SECONDS = Histogram("studybot_db_pool_wait_seconds", "DB 연결 풀에서 연결을 얻기까지 기다린 시간")
+DB_QUERY_SECONDS = Histogram("studybot_db_query_seconds", "DB 쿼리 실행 시간", ["operation"])
+
+# --- HTTP ---
+HTTP_REQUEST_SECONDS = Histogram(
+    "studybot_http_request_seconds", "라우트별 요청 처리 시간 (스트리밍은 응답 시작까지)",
+    ["router", "route", "method", "status"]
+)
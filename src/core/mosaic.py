@@ -0,0 +1,233 @@
+import cv2
+import math
+import time
+import logging
+import threading
+
+import numpy as np
+
+from src.core.frame_signal import AsyncFrameSignal
+
+logger = logging.getLogger("mosaic")
+
+# 상태별 타일 테두리 색 (BGR)
+STATUS_COLORS = {
+    "Focusing": (80, 200, 80),
+    "Partially focusing": (0, 200, 230),
+}
+ALERT_COLOR = (60, 60, 230)
+OFFLINE_COLOR = (90, 90, 90)
+
+# 시청자가 고를 수 있는 fps / 타일 너비. 설정 조합마다 합성 스레드가 하나씩 생기므로 몇 단계로 제한
+FPS_STEPS = (1.0, 2.0, 5.0, 10.0, 15.0)
+TILE_WIDTH_STEPS = (160, 240, 320, 480, 640)
+
+
+def snap_fps(fps, max_fps):
+    """요청 fps 를 넘지 않는 가장 큰 단계 (max_fps 이하, 요청이 없으면 max_fps 기준)."""
+    limit = min(fps, max_fps) if fps and fps > 0 else max_fps
+    allowed = [step for step in FPS_STEPS if step <= max_fps] or [min(FPS_STEPS)]
+    return max([step for step in allowed if step <= limit] or [min(allowed)])
+
+
+def snap_tile_width(width):
+    """요청 타일 너비에 가장 가까운 단계."""
+    return min(TILE_WIDTH_STEPS, key=lambda step: abs(step - width))
+
+
+class MosaicStream:
+    """
+    여러 학생 세션의 최신 프레임을 한 장의 격자 이미지로 합쳐 JPEG 하나로 인코딩합니다.
+
+    - 세션 카메라의 최신 프레임 버퍼(read_latest)와 파이프라인의 최신 분석 결과만 읽으므로
+      세션별 MJPEG 인코딩이나 MediaPipe 추론을 추가로 하지 않습니다.
+    - fps 로 합성 속도를 제한하고, 모든 타일의 프레임/분석 결과가 그대로면 다시 인코딩하지 않습니다.
+    - 세션을 새로 만들지 않으며(peek), 접속 중이 아닌 학생은 오프라인 타일로 그립니다.
+    """
+
+    def __init__(self, registry, keys, tile_width=320, fps=5.0, jpeg_quality=70):
+        self.registry = registry
+        self.keys = list(keys)
+        self.tile_width = tile_width
+        self.tile_height = tile_width * 3 // 4
+        self.fps = fps
+        self.jpeg_quality = jpeg_quality
+
+        self.cols = max(1, math.ceil(math.sqrt(len(self.keys))))
+        self.rows = max(1, math.ceil(len(self.keys) / self.cols))
+        self._canvas = np.zeros((self.rows * self.tile_height, self.cols * self.tile_width, 3), dtype=np.uint8)
+        self._signatures = [None] * len(self.keys)
+
+        self._cond = threading.Condition()
+        self._frame_signal = AsyncFrameSignal()
+        self._seq = 0
+        self._jpeg = None
+        self._running = False
+        self._wakeup = threading.Event()  # stop() 이 합성 스레드의 대기를 바로 끊음
+        self._thread = None
+        self.encoded_frames = 0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="mosaic")
+        self._thread.start()
+        logger.info(f"🧩 모자이크 스트림 시작: 타일 {len(self.keys)}개 ({self.cols}x{self.rows}), {self.fps} fps")
+
+    def stop(self):
+        """
+        합성 스레드를 멈춥니다. 마지막 시청자가 끊길 때 이벤트 루프에서 불리므로, 프레임 간격 대기를
+        깨워 join 이 합성 한 번 이상 기다리지 않게 합니다.
+        """
+        self._running = False
+        self._wakeup.set()
+        with self._cond:
+            self._cond.notify_all()
+            self._frame_signal.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def wait_for_jpeg(self, last_seq=0, timeout=1.0):
+        """last_seq 이후 새 모자이크 JPEG 이 나올 때까지 기다립니다. 시간 초과 시 (last_seq, None)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq or not self._running, timeout):
+                return last_seq, None
+            if self._seq <= last_seq:
+                return last_seq, None
+            return self._seq, self._jpeg
+
+    async def wait_for_jpeg_async(self, last_seq=0, timeout=1.0):
+        """wait_for_jpeg 의 코루틴 버전 (스레드를 잡지 않음)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._seq > last_seq:
+                    return self._seq, self._jpeg
+                if not self._running:
+                    return last_seq, None
+                waiter = self._frame_signal.waiter()
+            if not await self._frame_signal.wait(waiter, deadline - time.monotonic()):
+                return last_seq, None
+
+    def _run(self):
+        interval = 1.0 / self.fps if self.fps and self.fps > 0 else 0.2
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality]
+        next_at = time.monotonic()
+        while self._running:
+            try:
+                if self._compose():
+                    ok, buffer = cv2.imencode(".jpg", self._canvas, params)
+                    if ok:
+                        with self._cond:
+                            self._seq += 1
+                            self._jpeg = buffer.tobytes()
+                            self._cond.notify_all()
+                            self._frame_signal.notify_all()
+                        self.encoded_frames += 1
+            except Exception as e:
+                logger.error(f"❌ 모자이크 합성 오류: {e}")
+
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                self._wakeup.wait(delay)
+            else:
+                next_at = time.monotonic()
+
+    def _compose(self) -> bool:
+        """바뀐 타일만 다시 그립니다. 하나라도 바뀌었으면 True."""
+        changed = self._jpeg is None
+        for index, key in enumerate(self.keys):
+            session = self.registry.peek(key) if self.registry else None
+            seq, frame, result = 0, None, None
+            if session is not None:
+                # 읽기만 함: 접근 시간을 갱신하면 자녀가 떠난 뒤에도 세션이 정리되지 않음
+                seq, frame = session.camera_manager.read_latest(copy=False)
+                result = session.pipeline.latest_result
+
+            signature = (id(session), seq, id(result))
+            if signature == self._signatures[index]:
+                continue
+            self._signatures[index] = signature
+            self._draw_tile(index, key, frame, result)
+            changed = True
+        return changed
+
+    def _draw_tile(self, index, key, frame, result):
+        row, col = divmod(index, self.cols)
+        y, x = row * self.tile_height, col * self.tile_width
+        tile = self._canvas[y:y + self.tile_height, x:x + self.tile_width]
+
+        if frame is None:
+            tile[:] = 30
+            color, text = OFFLINE_COLOR, "OFFLINE"
+        else:
+            tile[:] = cv2.resize(frame, (self.tile_width, self.tile_height), interpolation=cv2.INTER_AREA)
+            status = (result or {}).get("status", "No image")
+            color = STATUS_COLORS.get(status, ALERT_COLOR)
+            text = f"{status} ({(result or {}).get('concentration_score', 0)})"
+
+        # 이름 대신 child_code 를 씀 (cv2.putText 는 한글을 그리지 못함)
+        cv2.rectangle(tile, (0, 0), (self.tile_width - 1, 22), (0, 0, 0), -1)
+        cv2.putText(tile, key, (6, 16), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+        cv2.putText(tile, text, (6, self.tile_height - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+        cv2.rectangle(tile, (0, 0), (self.tile_width - 1, self.tile_height - 1), color, 3)
+
+
+class MosaicHub:
+    """
+    같은 학생 목록/타일 크기/fps 의 모자이크를 시청자끼리 공유합니다.
+    첫 시청자가 acquire 할 때 합성 스레드를 시작하고, 마지막 시청자가 release 하면 멈춥니다.
+    """
+
+    def __init__(self, registry, max_tiles=16, jpeg_quality=70):
+        self.registry = registry
+        self.max_tiles = max_tiles
+        self.jpeg_quality = jpeg_quality
+        self._streams = {}
+        self._refs = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, keys, tile_width=320, fps=5.0) -> MosaicStream:
+        keys = tuple(sorted(set(keys)))[:self.max_tiles]
+        stream_key = (keys, tile_width, fps)
+        with self._lock:
+            stream = self._streams.get(stream_key)
+            if stream is None:
+                stream = MosaicStream(self.registry, keys, tile_width, fps, self.jpeg_quality)
+                stream.start()
+                self._streams[stream_key] = stream
+                self._refs[stream_key] = 0
+            self._refs[stream_key] += 1
+            return stream
+
+    def release(self, stream: MosaicStream):
+        stream_key = (tuple(stream.keys), stream.tile_width, stream.fps)
+        with self._lock:
+            if stream_key not in self._refs:
+                return
+            self._refs[stream_key] -= 1
+            if self._refs[stream_key] > 0:
+                return
+            del self._refs[stream_key]
+            self._streams.pop(stream_key, None)
+        stream.stop()
+
+    def stream_count(self) -> int:
+        with self._lock:
+            return len(self._streams)
+
+    def close_all(self):
+        with self._lock:
+            streams = list(self._streams.values())
+            self._streams.clear()
+            self._refs.clear()
+        for stream in streams:
+            stream.stop()
@@ -0,0 +1,288 @@
+import cv2
+import time
+import logging
+import threading
+from collections import deque, Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from src.core.frame_signal import AsyncFrameSignal
+from src.core.metrics import DETECTOR_SECONDS, JPEG_ENCODE_SECONDS, DROPPED_FRAMES
+
+logger = logging.getLogger("video_pipeline")
+
+
+class DropOldestQueue:
+    """
+    크기 제한이 있는 스레드 안전 큐. 가득 찬 상태에서 put 하면 가장 오래된 항목을 버립니다.
+    느린 단계가 앞 단계를 막지 않고 항상 최신 데이터만 처리하도록 하기 위해 사용합니다.
+    """
+
+    def __init__(self, maxsize=1, name="queue"):
+        self.name = name
+        self._items = deque(maxlen=max(1, maxsize))
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item) -> bool:
+        """항목을 넣고, 오래된 항목이 버려졌으면 True 를 반환합니다."""
+        with self._cond:
+            dropped = len(self._items) == self._items.maxlen
+            if dropped:
+                self.dropped += 1
+                DROPPED_FRAMES.labels(self.name).inc()
+            self._items.append(item)
+            self._cond.notify()
+            return dropped
+
+    def get(self, timeout=None):
+        """항목을 꺼냅니다. timeout 안에 항목이 없으면 None."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._items) > 0, timeout):
+                return None
+            return self._items.popleft()
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+@dataclass(frozen=True)
+class EncodeTier:
+    """JPEG 인코딩 단계(tier). 같은 tier 를 보는 모든 시청자가 한 번 인코딩된 바이트를 공유합니다."""
+    width: Optional[int] = None  # None 이면 원본 크기
+    quality: int = 85
+
+
+class VideoPipeline:
+    """
+    캡처 → 분석 → 인코딩 단계를 분리한 영상 파이프라인.
+
+    - 캡처 단계: CameraManager 의 새 프레임을 분석/인코딩 큐로 전달 (분석은 analysis_fps 로 제한)
+    - 분석 단계: ConcentrationDetector.process_image 를 자체 속도로 실행하고 최신 결과를 보관
+    - 인코딩 단계: 카메라 속도로 최신 프레임에 최신 분석 오버레이를 한 번 그린 뒤,
+      시청자가 구독한 tier(크기/품질)마다 한 번씩 JPEG 로 인코딩
+
+    같은 tier 의 시청자는 같은 JPEG 바이트를 공유하며, 구독자가 없는 tier 는 인코딩하지 않습니다.
+    """
+
+    def __init__(self, camera_manager, detector, analysis_fps=5.0, jpeg_quality=85, queue_size=1):
+        self.camera_manager = camera_manager
+        self.detector = detector
+        self.analysis_fps = analysis_fps
+        self.jpeg_quality = jpeg_quality
+
+        self.analysis_queue = DropOldestQueue(queue_size, name="analysis")
+        self.encode_queue = DropOldestQueue(queue_size, name="encode")
+
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+
+        self.default_tier = EncodeTier(None, jpeg_quality)
+        self._jpeg_cond = threading.Condition()
+        self._jpegs = {}  # tier -> (seq, jpeg_bytes)
+        self._tier_refs = Counter()
+        self._frame_signal = AsyncFrameSignal()  # 새 JPEG → 코루틴 시청자
+
+        self._threads = []
+        self._running = False
+
+        # 단계별 처리 프레임 수
+        self.analyzed_frames = 0
+        self.encoded_frames = 0
+
+        # 분석 결과가 나올 때마다 분석 스레드에서 호출되는 콜백 (result) -> None
+        self.listeners = []
+
+    # --- 수명 주기 ---
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._capture_stage, name="pipeline-capture", daemon=True),
+            threading.Thread(target=self._analysis_stage, name="pipeline-analysis", daemon=True),
+            threading.Thread(target=self._encode_stage, name="pipeline-encode", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"🚀 영상 파이프라인 시작 (분석 {self.analysis_fps} Hz)")
+
+    def stop(self):
+        self._running = False
+        with self._jpeg_cond:
+            self._jpeg_cond.notify_all()
+            self._frame_signal.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+        self.analysis_queue.clear()
+        self.encode_queue.clear()
+        logger.info("🛑 영상 파이프라인 중지")
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    # --- 소비자 API ---
+
+    @property
+    def analysis_backlog(self) -> bool:
+        """분석 단계가 아직 가져가지 않은 프레임이 있으면 True (분석이 입력 속도를 못 따라가는 상태)."""
+        return len(self.analysis_queue) > 0
+
+    @property
+    def latest_result(self):
+        with self._result_lock:
+            return self._latest_result
+
+    def subscribe(self, tier=None):
+        """tier 인코딩을 요청합니다. 시청자가 스트림을 시작할 때 호출하고 끝나면 unsubscribe 합니다."""
+        tier = tier or self.default_tier
+        with self._jpeg_cond:
+            self._tier_refs[tier] += 1
+        return tier
+
+    def unsubscribe(self, tier=None):
+        tier = tier or self.default_tier
+        with self._jpeg_cond:
+            self._tier_refs[tier] -= 1
+            if self._tier_refs[tier] <= 0:
+                del self._tier_refs[tier]
+                self._jpegs.pop(tier, None)
+
+    def active_tiers(self):
+        with self._jpeg_cond:
+            return list(self._tier_refs)
+
+    def get_jpeg(self, tier=None):
+        """tier 의 가장 최근 (seq, jpeg_bytes). 아직 없으면 (0, None)."""
+        with self._jpeg_cond:
+            return self._jpegs.get(tier or self.default_tier, (0, None))
+
+    def wait_for_jpeg(self, last_seq=0, timeout=1.0, tier=None):
+        """tier 의 last_seq 이후 새 JPEG 이 나올 때까지 기다립니다 (subscribe 된 tier 여야 함). 시간 초과 시 (last_seq, None)."""
+        tier = tier or self.default_tier
+
+        def ready():
+            return self._jpegs.get(tier, (0, None))[0] > last_seq or not self._running
+
+        with self._jpeg_cond:
+            if not self._jpeg_cond.wait_for(ready, timeout):
+                return last_seq, None
+            seq, jpeg = self._jpegs.get(tier, (0, None))
+            if seq <= last_seq:
+                return last_seq, None
+            return seq, jpeg
+
+    async def wait_for_jpeg_async(self, last_seq=0, timeout=1.0, tier=None):
+        """wait_for_jpeg 의 코루틴 버전. 스레드를 잡지 않고 인코딩 단계의 알림을 기다립니다."""
+        tier = tier or self.default_tier
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._jpeg_cond:
+                seq, jpeg = self._jpegs.get(tier, (0, None))
+                if seq > last_seq:
+                    return seq, jpeg
+                if not self._running:
+                    return last_seq, None
+                waiter = self._frame_signal.waiter()
+            if not await self._frame_signal.wait(waiter, deadline - time.monotonic()):
+                return last_seq, None
+
+    # --- 단계 ---
+
+    def _capture_stage(self):
+        last_seq = 0
+        next_analysis = 0.0
+        interval = 1.0 / self.analysis_fps if self.analysis_fps and self.analysis_fps > 0 else 0.0
+
+        while self._running:
+            seq, frame = self.camera_manager.wait_for_frame(last_seq, timeout=1.0)
+            if frame is None:
+                continue
+            last_seq = seq
+
+            # 인코딩은 곧바로 끝나므로 링 버퍼 뷰를 그대로 넘기고,
+            # 분석은 링 슬롯보다 오래 걸릴 수 있어 복사본을 넘김
+            self.encode_queue.put((seq, frame))
+
+            now = time.monotonic()
+            if now >= next_analysis:
+                next_analysis = now + interval
+                self.analysis_queue.put((seq, frame.copy()))
+
+    def _analysis_stage(self):
+        while self._running:
+            item = self.analysis_queue.get(timeout=1.0)
+            if item is None or self.detector is None:
+                continue
+            _, frame = item
+            started = time.perf_counter()
+            try:
+                result = self.detector.process_image(frame, draw=False)
+            except Exception as e:
+                logger.exception(f"❗ 분석 단계 오류: {e}")
+                continue
+            DETECTOR_SECONDS.observe(time.perf_counter() - started)
+            with self._result_lock:
+                self._latest_result = result
+            self.analyzed_frames += 1
+
+            for listener in self.listeners:
+                try:
+                    listener(result)
+                except Exception as e:
+                    logger.exception(f"❗ 분석 결과 콜백 오류: {e}")
+
+    def _encode_stage(self):
+        while self._running:
+            item = self.encode_queue.get(timeout=1.0)
+            if item is None:
+                continue
+            tiers = self.active_tiers()
+            if not tiers:
+                # 보는 사람이 없으면 그리기/인코딩을 하지 않음
+                continue
+            seq, frame = item
+            started = time.perf_counter()
+            try:
+                encoded = self._encode_tiers(frame, tiers)
+            except Exception as e:
+                logger.exception(f"❗ 인코딩 단계 오류: {e}")
+                continue
+            if not encoded:
+                continue
+            JPEG_ENCODE_SECONDS.observe(time.perf_counter() - started)
+
+            with self._jpeg_cond:
+                for tier, jpeg in encoded.items():
+                    if tier in self._tier_refs:
+                        self._jpegs[tier] = (seq, jpeg)
+                self._jpeg_cond.notify_all()
+                self._frame_signal.notify_all()
+            self.encoded_frames += 1
+
+    def _encode_tiers(self, frame, tiers):
+        """오버레이를 한 번 그리고, 너비별로 한 번 축소한 뒤 tier 마다 인코딩합니다."""
+        result = self.latest_result
+        if self.detector is not None and result is not None:
+            frame = self.detector.draw_overlay(frame, result)
+
+        h, w = frame.shape[:2]
+        resized = {}
+        encoded = {}
+        for tier in sorted(tiers, key=lambda t: -(t.width or w)):
+            width = tier.width if tier.width and tier.width < w else w
+            image = resized.get(width)
+            if image is None:
+                image = frame if width == w else cv2.resize(frame, (width, max(1, h * width // w)), interpolation=cv2.INTER_AREA)
+                resized[width] = image
+            ret, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), tier.quality])
+            if ret:
+                encoded[tier] = buffer.tobytes()
+        return encoded
@@ -1,33 +1,115 @@
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import jwt
 import bcrypt
 from fastapi import Request, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
-from src.core.config import SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from src.core.config import SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_CACHE_SIZE
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-async def get_current_user(request: Request) -> dict:
-    """쿠키에서 세션 토큰을 확인하고 현재 사용자 정보를 반환"""
-    credentials_exception = HTTPException(
+class TokenCache:
+    """
+    검증을 마친 토큰 → claims LRU 캐시와 폐기(로그아웃) 목록.
+
+    상태 폴링처럼 같은 쿠키로 계속 들어오는 요청이 매번 서명 검증을 하지 않도록 합니다.
+    캐시 항목과 폐기 항목은 토큰의 exp 까지만 유효하므로 만료된 토큰이 캐시 때문에 통과하는 일은 없습니다.
+    폐기 목록은 프로세스 메모리에만 있으므로 여러 워커로 실행하면 워커마다 따로 관리됩니다.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._items = OrderedDict()  # token -> (claims, exp)
+        self._revoked = {}           # token -> exp
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            item = self._items.get(token)
+            if item is None:
+                self.misses += 1
+                return None
+            if item[1] <= now:
+                del self._items[token]
+                self.misses += 1
+                return None
+            self._items.move_to_end(token)
+            self.hits += 1
+            return item[0]
+
+    def put(self, token: str, claims: dict):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[token] = (claims, float(claims.get("exp") or 0))
+            self._items.move_to_end(token)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def revoke(self, token: str, exp: float):
+        now = time.time()
+        with self._lock:
+            self._items.pop(token, None)
+            # 만료된 폐기 항목은 더 이상 필요 없으므로 여기서 정리
+            for expired in [t for t, e in self._revoked.items() if e <= now]:
+                del self._revoked[expired]
+            if exp > now:
+                self._revoked[token] = exp
+
+    def is_revoked(self, token: str) -> bool:
+        return token in self._revoked
+
+    def stats(self) -> dict:
+        return {"size": len(self._items), "revoked": len(self._revoked), "hits": self.hits, "misses": self.misses}
+
+token_cache = TokenCache(maxsize=AUTH_CACHE_SIZE)
+
+def _unauthorized(detail: str):
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="인증 정보가 유효하지 않습니다",
+        detail=detail,
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def decode_access_token(token: str) -> dict:
+    """토큰을 검증하고 claims 를 반환합니다 (캐시 사용). 유효하지 않으면 401 HTTPException."""
+    if token_cache.is_revoked(token):
+        raise _unauthorized("로그아웃된 인증 토큰입니다.")
+
+    claims = token_cache.get(token)
+    if claims is None:
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            raise _unauthorized("인증이 만료되었습니다.")
+        except jwt.InvalidTokenError:
+            raise _unauthorized("유효하지 않은 인증 토큰입니다.")
+        if not claims or claims.get("sub") is None or claims.get("type") is None:
+            raise _unauthorized("유효하지 않은 인증 정보입니다.")
+        token_cache.put(token, claims)
+    # 캐시된 claims 가 호출한 쪽에서 바뀌지 않도록 복사본을 반환
+    return dict(claims)
+
+async def get_current_user(request: Request) -> dict:
+    """쿠키에서 세션 토큰을 확인하고 현재 사용자 정보(JWT claims)를 반환. 모든 라우터가 공유하는 인증 의존성."""
     token = request.cookies.get("session_token")
     if not token:
-        raise credentials_exception
-        
+        raise _unauthorized("인증 정보가 유효하지 않습니다")
+    return decode_access_token(token)
+
+def revoke_token(token: str):
+    """로그아웃한 토큰을 만료 시각까지 거부합니다."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        if not payload:
-            raise credentials_exception
-        return payload
-        
-    except jwt.JWTError:
-        raise credentials_exception
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM], options={"verify_exp": False})
+    except jwt.InvalidTokenError:
+        return
+    token_cache.revoke(token, float(claims.get("exp") or 0))
 
 def hash_password(password: str) -> str:
     password_bytes = password.encode('utf-8')
@@ -0,0 +1,310 @@
+import time
+import logging
+import threading
+from functools import partial
+
+from src.core.camera import CameraManager
+from src.core.pipeline import VideoPipeline
+from src.models.detector import ConcentrationDetector
+
+logger = logging.getLogger("session_registry")
+
+# 로그인 전 미리보기(얼굴 등록/로그인 화면)에 쓰는 세션 키
+LOCAL_SESSION_KEY = "local"
+
+OFFLINE_STATUS = {
+    "status": "No image",
+    "concentration_score": 0,
+    "gaze_status": "Face not detected",
+    "face_detected": False
+}
+
+
+def status_payload(result) -> dict:
+    """분석 결과에서 클라이언트로 보낼 상태 필드만 추립니다. result 가 None 이면 오프라인 상태."""
+    active = result is not None
+    result = result or OFFLINE_STATUS
+    return {
+        "status": result.get("status", "Unknown"),
+        "concentration_score": result.get("concentration_score", 0),
+        "gaze_status": result.get("gaze_status", "Unknown"),
+        "face_detected": result.get("face_detected", False),
+        "active": active
+    }
+
+
+class SessionLimitError(RuntimeError):
+    """동시에 감독할 수 있는 학생 수(max_sessions)를 넘은 경우"""
+
+
+def parse_camera_sources(spec: str) -> dict:
+    """
+    "STU-aaaa-bbbb=/videos/a.mp4,STU-cccc-dddd=1" 형식의 문자열을 {child_code: source} 로 바꿉니다.
+    숫자 소스는 장치 번호(int)로 변환합니다.
+    """
+    sources = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        key, source = (part.strip() for part in item.split("=", 1))
+        if key and source:
+            sources[key] = int(source) if source.isdigit() else source
+    return sources
+
+
+class StudentSession:
+    """학생 한 명의 캡처 소스, detector, 영상 파이프라인, 상태를 묶은 단위"""
+
+    def __init__(self, key, camera_manager, detector, pipeline, owns_camera):
+        self.key = key
+        self.camera_manager = camera_manager
+        self.detector = detector
+        self.pipeline = pipeline
+        self.owns_camera = owns_camera
+        self.created_at = time.monotonic()
+        self.last_access = self.created_at
+
+    def touch(self):
+        self.last_access = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_access
+
+    def get_status(self) -> dict:
+        """현재 상태 (부작용 없음: 접근 시간은 세션 주인의 요청에서만 touch() 로 갱신)."""
+        if self.detector is None:
+            return dict(OFFLINE_STATUS)
+        return self.detector.get_current_status()
+
+    def close(self):
+        self.pipeline.stop()
+        if self.owns_camera:
+            self.camera_manager.release()
+        if self.detector is not None:
+            self.detector.close()
+        logger.info(f"🧹 세션 종료: {self.key}")
+
+
+class SessionRegistry:
+    """
+    child_code 별 StudentSession 을 관리합니다.
+
+    - 처음 요청될 때 세션을 만들고(lazy), idle_timeout 동안 접근이 없으면 정리합니다.
+    - 동시에 max_sessions 개까지만 유지하며, 가득 차면 유휴 세션을 먼저 정리한 뒤에도
+      자리가 없으면 SessionLimitError 를 발생시킵니다. 자리는 카메라/MediaPipe 를 만들기 전에
+      잠금 안에서 먼저 예약하므로, 가득 찬 상태의 요청은 세션을 만들지 않고 바로 거절됩니다.
+    - 캡처 소스는 source_factory(key) 가 결정합니다. (CameraManager, 소유 여부) 를 반환해야 하며,
+      기본값은 camera_sources 매핑(영상 파일/장치 번호)에 있으면 새 CameraManager 를, 없으면
+      서버의 공유 카메라를 사용합니다.
+    """
+
+    def __init__(self, shared_camera=None, camera_sources=None, source_factory=None,
+                 detector_factory=ConcentrationDetector, max_sessions=32, idle_timeout=300.0,
+                 analysis_fps=5.0, jpeg_quality=85):
+        self.shared_camera = shared_camera
+        self.camera_sources = camera_sources or {}
+        self.source_factory = source_factory or self._default_source
+        self.detector_factory = detector_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.analysis_fps = analysis_fps
+        self.jpeg_quality = jpeg_quality
+
+        self._sessions = {}
+        self._pending = 0  # 예약했지만 아직 만드는 중인 세션 수
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._reaper_stop = threading.Event()
+
+        # 세션 분석 결과 콜백 (key, result) -> None. 세션이 닫히면 result=None 으로 한 번 호출
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    # --- 조회/생성 ---
+
+    def get(self, key, create=True):
+        """세션을 반환합니다. 없으면 create=True 일 때 새로 만들고, 아니면 None."""
+        with self._lock:
+            session = self._sessions.get(key)
+        if session is not None:
+            session.touch()
+            return session
+        if not create:
+            return None
+
+        self._make_room()
+        existing = self._reserve(key)
+        if existing is not None:
+            existing.touch()
+            return existing
+
+        # 카메라/MediaPipe 초기화는 느리므로 잠금 밖에서 만든 뒤 등록
+        try:
+            session = self._create(key)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        with self._lock:
+            self._pending -= 1
+            existing = self._sessions.get(key)
+            if existing is None:
+                self._sessions[key] = session
+        if existing is not None:
+            # 같은 키를 동시에 요청한 쪽이 먼저 등록함
+            session.close()
+            existing.touch()
+            return existing
+
+        logger.info(f"✅ 세션 생성: {key} (활성 {len(self)})")
+        return session
+
+    def _reserve(self, key, replace=False):
+        """
+        새 세션 자리를 예약합니다. 같은 키의 세션이 이미 있으면 (replace=False 일 때) 예약하지 않고 그 세션을,
+        예약했으면 None 을 반환합니다. 자리가 없으면 SessionLimitError.
+        """
+        with self._lock:
+            existing = self._sessions.get(key)
+            if existing is not None and not replace:
+                return existing
+            if existing is None and len(self._sessions) + self._pending >= self.max_sessions:
+                raise SessionLimitError(f"동시 세션 수 제한 초과 ({self.max_sessions})")
+            self._pending += 1
+        return None
+
+    def peek(self, key):
+        """세션을 만들지 않고, 접근 시간도 갱신하지 않고 조회합니다."""
+        with self._lock:
+            return self._sessions.get(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _default_source(self, key):
+        source = self.camera_sources.get(key)
+        if source is None:
+            if self.shared_camera is None:
+                raise RuntimeError("사용할 수 있는 카메라 소스가 없습니다.")
+            return self.shared_camera, False
+
+        is_file = isinstance(source, str) and "://" not in source
+        camera = CameraManager(device_index=source, loop=is_file, realtime=is_file)
+        return camera, True
+
+    def open_with_source(self, key, camera, owns_camera=True):
+        """
+        주어진 캡처 소스로 세션을 (다시) 엽니다. 같은 키의 기존 세션은 닫습니다.
+        WebSocket 으로 프레임을 받는 원격 학생처럼 소스가 외부에서 정해지는 경우에 사용합니다.
+        """
+        self.remove(key)
+        self._make_room()
+        self._reserve(key, replace=True)
+        try:
+            session = self._create(key, (camera, owns_camera))
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        with self._lock:
+            self._pending -= 1
+            previous = self._sessions.get(key)
+            self._sessions[key] = session
+        if previous is not None:
+            self._close(previous)
+        logger.info(f"✅ 세션 생성(외부 소스): {key} (활성 {len(self)})")
+        return session
+
+    def _create(self, key, source=None):
+        camera, owns_camera = source or self.source_factory(key)
+        detector = None
+        try:
+            if not camera.is_running:
+                camera.start()
+            detector = self.detector_factory()
+            pipeline = VideoPipeline(
+                camera,
+                detector,
+                analysis_fps=self.analysis_fps,
+                jpeg_quality=self.jpeg_quality
+            )
+            pipeline.listeners.extend(partial(listener, key) for listener in self.listeners)
+            pipeline.start()
+        except Exception:
+            if owns_camera:
+                camera.release()
+            if detector is not None:
+                detector.close()
+            raise
+        return StudentSession(key, camera, detector, pipeline, owns_camera)
+
+    # --- 정리 ---
+
+    def _close(self, session):
+        session.close()
+        for listener in self.listeners:
+            try:
+                listener(session.key, None)
+            except Exception as e:
+                logger.exception(f"❗ 세션 종료 콜백 오류: {e}")
+
+    def remove(self, key, camera=None):
+        """세션을 닫습니다. camera 를 주면 그 소스를 쓰는 세션일 때만 닫습니다."""
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None or (camera is not None and session.camera_manager is not camera):
+                return
+            del self._sessions[key]
+        self._close(session)
+
+    def evict_idle(self):
+        """idle_timeout 을 넘긴 세션을 정리하고 정리한 키 목록을 반환합니다."""
+        with self._lock:
+            expired = [key for key, session in self._sessions.items()
+                       if session.idle_seconds() > self.idle_timeout]
+            sessions = [self._sessions.pop(key) for key in expired]
+        for session in sessions:
+            self._close(session)
+        if expired:
+            logger.info(f"🧹 유휴 세션 정리: {expired}")
+        return expired
+
+    def _make_room(self):
+        with self._lock:
+            full = len(self._sessions) + self._pending >= self.max_sessions
+        if full:
+            self.evict_idle()
+
+    def start_reaper(self, interval=30.0):
+        """유휴 세션을 주기적으로 정리하는 백그라운드 스레드를 시작합니다."""
+        if self._reaper is not None:
+            return
+        self._reaper_stop.clear()
+
+        def run():
+            while not self._reaper_stop.wait(interval):
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    logger.exception(f"❗ 유휴 세션 정리 중 오류: {e}")
+
+        self._reaper = threading.Thread(target=run, name="session-reaper", daemon=True)
+        self._reaper.start()
+
+    def close_all(self):
+        self._reaper_stop.set()
+        if self._reaper is not None:
+            self._reaper.join(timeout=2)
+            self._reaper = None
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            self._close(session)
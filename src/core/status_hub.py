@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger("status_hub")
+
+
+class Subscription:
+    """
+    구독자 한 명의 크기 제한 큐. 가득 차면 가장 오래된 상태를 버립니다
+    (상태는 최신 값만 의미가 있으므로 느린 구독자가 발행자를 막지 않게 함).
+    """
+
+    def __init__(self, hub, key, loop, maxsize):
+        self.hub = hub
+        self.key = key
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+
+    def _deliver(self, payload):
+        # 이벤트 루프 스레드에서만 호출됨
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+    async def get(self, timeout=None):
+        """다음 상태를 기다립니다. timeout 안에 없으면 None."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class StatusHub:
+    """
+    child_code 별 상태 pub/sub 허브.
+
+    - publish 는 분석 스레드 등 어느 스레드에서나 호출할 수 있으며, 구독자의 이벤트 루프로 전달됩니다.
+    - 직전에 발행한 값과 같으면 전달하지 않습니다 (변경된 상태만 push).
+    - 구독자마다 크기 제한 큐를 두어 느린 클라이언트가 다른 구독자에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, queue_size=8):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, key, maxsize=None) -> Subscription:
+        """현재 이벤트 루프에서 key 를 구독합니다. 마지막 상태가 있으면 바로 큐에 넣어 둡니다."""
+        subscription = Subscription(self, key, asyncio.get_running_loop(), maxsize or self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(subscription)
+            last = self._last.get(key)
+        if last is not None:
+            subscription._deliver(last)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.key]
+
+    def publish(self, key, payload) -> bool:
+        """상태를 발행합니다. 직전 값과 같아 생략했으면 False."""
+        with self._lock:
+            if self._last.get(key) == payload:
+                return False
+            self._last[key] = payload
+            subscribers = list(self._subscribers.get(key, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, payload)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘
+                self.unsubscribe(subscription)
+        return True
+
+    def last(self, key):
+        with self._lock:
+            return self._last.get(key)
+
+    def subscriber_count(self, key=None) -> int:
+        with self._lock:
+            if key is not None:
+                return len(self._subscribers.get(key, ()))
+            return sum(len(s) for s in self._subscribers.values())
@@ -1,10 +1,243 @@
+import time
+import queue
+import logging
+import threading
 import mysql.connector
-from src.core.config import DB_CONFIG
+from src.core.config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PING_AFTER
+from src.core import metrics
+from src.core.executors import io_executor
+
+logger = logging.getLogger("database")
+
+
+class PoolTimeoutError(RuntimeError):
+    """timeout 안에 풀에서 연결을 얻지 못한 경우"""
+
+
+class TimedCursor:
+    """execute/executemany 실행 시간을 쿼리 종류(select/insert/...)별로 기록하는 커서 래퍼"""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def _timed(self, fn, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(operation, *args, **kwargs)
+        finally:
+            kind = operation.lstrip().split(None, 1)[0].lower() if operation.strip() else "other"
+            metrics.DB_QUERY_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._raw.execute, operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._raw.executemany, operation, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class _PoolEntry:
+    """풀이 보관하는 실제 연결과 생성/마지막 사용 시각."""
+    __slots__ = ("raw", "created_at", "last_used")
+
+    def __init__(self, raw, created_at):
+        self.raw = raw
+        self.created_at = created_at
+        self.last_used = created_at
+
+
+class PooledConnection:
+    """
+    풀에서 빌린 연결. 기존 코드처럼 cursor()/commit()/rollback()/close() 를 그대로 쓰면 되고,
+    close() 는 실제로 연결을 끊지 않고 풀에 반환합니다.
+
+    빌릴 때마다 새 래퍼를 만들므로, 반환한 뒤의 래퍼로 close() 를 다시 불러도(finally 중복 등)
+    지금 다른 요청이 쓰고 있는 연결을 반환하지 않습니다.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+        self._raw = entry.raw
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._raw.cursor(*args, **kwargs)
+        return TimedCursor(cursor) if metrics.ENABLED else cursor
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is None:
+            return
+        self._pool._release(entry)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class ConnectionPool:
+    """
+    MySQL 연결 풀.
+
+    - 최대 size 개 연결을 유지하며, 모두 사용 중이면 timeout 초까지 기다립니다.
+    - 반환된 연결은 recycle 초보다 오래됐으면 닫고 새로 만들고,
+      ping_after 초 이상 놀았으면 꺼낼 때 ping(reconnect) 으로 상태를 확인합니다.
+    - stats() 로 사용 중 연결 수, 대기 시간 등의 지표를 제공합니다.
+    """
+
+    def __init__(self, config, size=10, timeout=5.0, recycle=1800.0, ping_after=30.0, connect=None):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self._connect = connect or (lambda: mysql.connector.connect(**self.config))
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+        self.checked_out = 0
+        self.created = 0
+        self.recycled = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def acquire(self, timeout=None) -> PooledConnection:
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeoutError(f"DB 연결 풀 대기 시간 초과 (size={self.size})")
+        waited = time.monotonic() - started
+        metrics.DB_ACQUIRE_SECONDS.observe(waited)
+
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.checked_out += 1
+            self.acquired += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+        return conn
+
+    def _checkout(self) -> PooledConnection:
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return PooledConnection(self, self._new_entry())
+
+            now = time.monotonic()
+            if self.recycle and now - entry.created_at > self.recycle:
+                self._discard(entry)
+                with self._lock:
+                    self.recycled += 1
+                continue
+
+            if now - entry.last_used > self.ping_after:
+                try:
+                    entry.raw.ping(reconnect=True, attempts=1, delay=0)
+                except Exception:
+                    self._discard(entry)
+                    continue
+
+            return PooledConnection(self, entry)
+
+    def _new_entry(self) -> _PoolEntry:
+        raw = self._connect()
+        with self._lock:
+            self.created += 1
+        return _PoolEntry(raw, time.monotonic())
+
+    def _discard(self, entry):
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+
+    def _release(self, entry):
+        # 끝나지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+        try:
+            if entry.raw.in_transaction:
+                entry.raw.rollback()
+            entry.last_used = time.monotonic()
+            self._idle.put(entry)
+        except Exception:
+            self._discard(entry)
+        finally:
+            with self._lock:
+                self.checked_out -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "checked_out": self.checked_out,
+                "idle": self._idle.qsize(),
+                "created": self.created,
+                "recycled": self.recycled,
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "wait_time_avg_ms": round(1000.0 * self.wait_time_total / self.acquired, 3) if self.acquired else 0.0,
+                "wait_time_max_ms": round(1000.0 * self.wait_time_max, 3)
+            }
+
+    def close_all(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+pool = ConnectionPool(
+    DB_CONFIG,
+    size=DB_POOL_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    recycle=DB_POOL_RECYCLE,
+    ping_after=DB_POOL_PING_AFTER
+)
+
 
 def get_db():
+    """풀에서 연결을 빌립니다. 사용 후 close() 하면 풀에 반환됩니다."""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
+        return pool.acquire()
     except Exception as e:
         print(f"데이터베이스 연결 오류: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def db_connection():
+    """
+    FastAPI 의존성: 요청 동안 연결 하나를 빌려 주고 끝나면 반환합니다.
+    동기(def) 엔드포인트와 함께 쓰면 쿼리가 스레드풀에서 실행되어 이벤트 루프를 막지 않습니다.
+    """
+    db = get_db()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def run_db(fn, *args, **kwargs):
+    """블로킹 DB 작업 fn 을 I/O 작업 풀에서 실행합니다 (async 엔드포인트용, 풀이 가득 차면 ExecutorSaturated)."""
+    return await io_executor.run(fn, *args, **kwargs)
@@ -0,0 +1,437 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+import mysql.connector
+
+from src.db.database import get_db, PoolTimeoutError
+from src.db.rollups import upsert_rollups
+
+logger = logging.getLogger("log_writer")
+
+# child_code 가 아닌 세션 키 (로그인 전 로컬 미리보기) 는 기록하지 않음
+IGNORED_KEYS = {"local"}
+
+# DB 연결 문제: 작업 자체의 잘못이 아니므로 시도 횟수를 세지 않고 스풀을 그대로 유지
+RETRYABLE_ERRORS = (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError, PoolTimeoutError)
+
+
+class _Bucket:
+    """세션 키 하나의 bucket_seconds 구간 집계"""
+
+    __slots__ = ("start", "score_sum", "count", "statuses", "gaze_statuses")
+
+    def __init__(self, start):
+        self.start = start
+        self.score_sum = 0
+        self.count = 0
+        self.statuses = Counter()
+        self.gaze_statuses = Counter()
+
+    def add(self, result):
+        self.score_sum += result.get("concentration_score", 0)
+        self.count += 1
+        self.statuses[result.get("status", "Unknown")] += 1
+        self.gaze_statuses[result.get("gaze_status", "Unknown")] += 1
+
+    def row(self, key):
+        # 구간 평균 점수와 가장 많이 나온 상태로 한 행을 만듦
+        return {
+            "child_code": key,
+            "concentration_score": int(round(self.score_sum / self.count)),
+            "status": self.statuses.most_common(1)[0][0][:50],
+            "gaze_status": self.gaze_statuses.most_common(1)[0][0][:50],
+            "created_at": self.start
+        }
+
+
+class _StudySession:
+    """진행 중인 학습 세션. 평균 집중도는 증분으로 계산합니다."""
+
+    __slots__ = ("key", "start", "last_seen", "samples", "avg", "session_id")
+
+    def __init__(self, key, now):
+        self.key = key
+        self.start = now
+        self.last_seen = now
+        self.samples = 0
+        self.avg = 0.0
+        self.session_id = None
+
+    def add(self, score, now):
+        self.samples += 1
+        self.avg += (score - self.avg) / self.samples
+        self.last_seen = now
+
+    def close_op(self):
+        return {
+            "op": "session_close",
+            "child_code": self.key,
+            "session_id": self.session_id,
+            "start_time": self.start,
+            "end_time": self.last_seen,
+            "total_duration": int((self.last_seen - self.start) // 60),
+            "avg_concentration": round(self.avg, 2)
+        }
+
+
+class LogWriter:
+    """
+    분석 결과를 concentration_logs / study_sessions 에 모아서 기록하는 백그라운드 작성기.
+
+    - submit() 은 분석 스레드에서 호출되며 제한 큐에 넣기만 합니다 (가득 차면 버림, 절대 대기하지 않음).
+    - 작성 스레드가 결과를 세션 키별 bucket_seconds 구간으로 집계하고,
+      batch_size 행이 모이거나 flush_interval 초가 지나면 여러 행 INSERT 한 번으로 기록합니다.
+    - 같은 트랜잭션에서 사용자별 분/시/일 rollup 표에 기록한 행을 누적합니다 (src.db.rollups).
+    - 세션 키의 첫 결과에서 study_sessions 행을 열고, 세션이 닫히거나(result=None)
+      session_gap 초 동안 결과가 없으면 end_time/total_duration/avg_concentration 을 기록하고 닫습니다.
+    - DB 에 쓰지 못한 작업은 spool_path 의 JSONL 파일(최대 spool_max_bytes)에 보관했다가
+      다음 flush 때 먼저 다시 기록합니다. 스풀 재기록이 연결 문제가 아닌 오류로 실패하면 작업을 하나씩
+      기록해 실패한 작업만 남기고, max_attempts 번 실패한 작업은 spool_path + ".dead" 로 옮겨
+      뒤의 작업을 막지 않게 합니다.
+    - child_code → user_id 조회 결과 중 없음(아직 등록 전)은 miss_ttl 초 동안만 기억합니다.
+    """
+
+    def __init__(self, bucket_seconds=1.0, batch_size=200, flush_interval=5.0, session_gap=120.0,
+                 spool_path="data/log_spool.jsonl", spool_max_bytes=50 * 1024 * 1024, queue_size=10000,
+                 max_attempts=5, miss_ttl=60.0):
+        self.bucket_seconds = max(0.1, bucket_seconds)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_gap = session_gap
+        self.spool_path = spool_path
+        self.spool_max_bytes = spool_max_bytes
+        self.dead_letter_path = spool_path + ".dead"
+        self.max_attempts = max_attempts
+        self.miss_ttl = miss_ttl
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._buckets = {}
+        self._sessions = {}
+        self._rows = []
+        self._session_ops = []
+        self._user_ids = {}
+        self._missing_user_ids = {}  # child_code -> 다시 조회할 시각 (monotonic)
+        self._opened = {}  # (child_code, start_time) -> 기록된 study_sessions.session_id
+
+        self._thread = None
+        self._running = False
+
+        self.submitted = 0
+        self.dropped = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.spooled = 0
+        self.spool_dropped = 0
+        self.dead_lettered = 0
+
+    # --- 생산자 API (분석 스레드) ---
+
+    def submit(self, key, result):
+        """세션 분석 결과 하나를 넘깁니다. SessionRegistry 리스너 (key, result) 형식."""
+        if key in IGNORED_KEYS:
+            return
+        try:
+            self._queue.put_nowait((key, result, time.time()))
+            self.submitted += 1
+        except queue.Full:
+            self.dropped += 1
+
+    # --- 수명 주기 ---
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        logger.info("🚀 집중도 로그 작성기 시작")
+
+    def stop(self, timeout=10.0):
+        """남은 결과를 모두 집계하고 열린 세션을 닫은 뒤 마지막으로 flush 합니다."""
+        if not self._running:
+            return
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("🛑 집중도 로그 작성기 중지")
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "spooled": self.spooled,
+            "spool_dropped": self.spool_dropped,
+            "dead_lettered": self.dead_lettered,
+            "open_sessions": len(self._sessions)
+        }
+
+    # --- 작성 스레드 ---
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while self._running:
+            try:
+                key, result, now = self._queue.get(timeout=min(self.bucket_seconds, self.flush_interval))
+                self._consume(key, result, now)
+            except queue.Empty:
+                pass
+
+            now = time.time()
+            self._close_buckets(now)
+            self._close_idle_sessions(now)
+            if len(self._rows) >= self.batch_size or time.monotonic() >= next_flush:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+        # 종료: 큐에 남은 결과까지 반영하고 모든 구간/세션을 닫음
+        while True:
+            try:
+                self._consume(*self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._close_buckets(None)
+        for key in list(self._sessions):
+            self._close_session(key)
+        self._flush()
+
+    def _consume(self, key, result, now):
+        if result is None:
+            # 세션 종료 알림
+            self._close_bucket(key)
+            self._close_session(key)
+            return
+
+        start = now - (now % self.bucket_seconds)
+        bucket = self._buckets.get(key)
+        if bucket is not None and bucket.start != start:
+            self._rows.append(bucket.row(key))
+            bucket = None
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(start)
+        bucket.add(result)
+
+        session = self._sessions.get(key)
+        if session is not None and now - session.last_seen > self.session_gap:
+            self._close_session(key)
+            session = None
+        if session is None:
+            session = self._sessions[key] = _StudySession(key, now)
+            self._session_ops.append({"op": "session_open", "child_code": key, "start_time": now})
+        session.add(result.get("concentration_score", 0), now)
+
+    def _close_bucket(self, key):
+        bucket = self._buckets.pop(key, None)
+        if bucket is not None:
+            self._rows.append(bucket.row(key))
+
+    def _close_buckets(self, now):
+        """now 기준으로 끝난 구간을 행으로 옮깁니다. now=None 이면 전부."""
+        for key, bucket in list(self._buckets.items()):
+            if now is None or now - bucket.start >= self.bucket_seconds:
+                self._close_bucket(key)
+
+    def _close_session(self, key):
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            self._session_ops.append(session.close_op())
+
+    def _close_idle_sessions(self, now):
+        for key, session in list(self._sessions.items()):
+            if now - session.last_seen > self.session_gap:
+                self._close_bucket(key)
+                self._close_session(key)
+
+    # --- 기록 ---
+
+    def _flush(self):
+        ops = []
+        if self._rows:
+            ops.append({"op": "logs", "rows": self._rows})
+        ops.extend(self._session_ops)
+        self._rows, self._session_ops = [], []
+        if not ops and not os.path.exists(self.spool_path):
+            return
+
+        try:
+            self._replay_spool()
+            self._apply(ops)
+            self.flushes += 1
+        except Exception as e:
+            self.flush_errors += 1
+            logger.warning(f"⚠️ 집중도 로그 기록 실패, 스풀에 보관: {e}")
+            self._spool(ops)
+
+    def _apply(self, ops):
+        """작업들을 한 트랜잭션으로 기록합니다. 커밋된 뒤에만 새 세션 id 와 카운터를 반영합니다."""
+        if not ops:
+            return
+        opened, written = {}, 0
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            for op in ops:
+                written += self._apply_op(cursor, op, opened)
+            db.commit()
+        finally:
+            cursor.close()
+            db.close()
+
+        self.rows_written += written
+        self._opened.update(opened)
+        for (key, start), session_id in opened.items():
+            session = self._sessions.get(key)
+            if session is not None and session.start == start:
+                session.session_id = session_id
+
+    def _apply_op(self, cursor, op, opened) -> int:
+        kind = op["op"]
+        if kind == "logs":
+            values = [
+                (self._user_id(cursor, r["child_code"]), r["concentration_score"], r["status"],
+                 r["gaze_status"], datetime.fromtimestamp(r["created_at"]))
+                for r in op["rows"]
+            ]
+            values = [v for v in values if v[0] is not None]
+            if values:
+                cursor.executemany("""
+                    INSERT INTO concentration_logs (user_id, concentration_score, status, gaze_status, created_at)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, values)
+                upsert_rollups(cursor, [(user_id, created_at, score, status)
+                                        for user_id, score, status, _, created_at in values], self.bucket_seconds)
+            return len(values)
+
+        user_id = self._user_id(cursor, op["child_code"])
+        if user_id is None:
+            return 0
+
+        session_key = (op["child_code"], op["start_time"])
+        if kind == "session_open":
+            cursor.execute(
+                "INSERT INTO study_sessions (user_id, start_time) VALUES (%s, %s)",
+                (user_id, datetime.fromtimestamp(op["start_time"]))
+            )
+            opened[session_key] = cursor.lastrowid
+        elif kind == "session_close":
+            session_id = op.get("session_id") or opened.pop(session_key, None) or self._opened.get(session_key)
+            self._opened.pop(session_key, None)
+            end_time = datetime.fromtimestamp(op["end_time"])
+            if session_id:
+                cursor.execute("""
+                    UPDATE study_sessions
+                    SET end_time = %s, total_duration = %s, avg_concentration = %s
+                    WHERE session_id = %s
+                """, (end_time, op["total_duration"], op["avg_concentration"], session_id))
+            else:
+                # 여는 작업이 기록되지 않은 세션은 완성된 행 하나로 기록
+                cursor.execute("""
+                    INSERT INTO study_sessions (user_id, start_time, end_time, total_duration, avg_concentration)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (user_id, datetime.fromtimestamp(op["start_time"]), end_time,
+                      op["total_duration"], op["avg_concentration"]))
+        return 0
+
+    def _user_id(self, cursor, child_code):
+        user_id = self._user_ids.get(child_code)
+        if user_id is not None:
+            return user_id
+        if self._missing_user_ids.get(child_code, 0.0) > time.monotonic():
+            return None
+        cursor.execute("SELECT user_id FROM face_landmarks WHERE child_code = %s", (child_code,))
+        row = cursor.fetchone()
+        if row is None:
+            # 나중에 등록될 수 있으므로 잠시만 기억
+            self._missing_user_ids[child_code] = time.monotonic() + self.miss_ttl
+            return None
+        self._missing_user_ids.pop(child_code, None)
+        self._user_ids[child_code] = row[0]
+        return row[0]
+
+    # --- 스풀 ---
+
+    def _spool(self, ops):
+        if not ops:
+            return
+        lines = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+        size = os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+        if size + len(lines.encode("utf-8")) > self.spool_max_bytes:
+            self.spool_dropped += len(ops)
+            logger.error(f"❗ 로그 스풀 용량 초과 ({self.spool_max_bytes} bytes), 작업 {len(ops)}개 버림")
+            return
+        directory = os.path.dirname(self.spool_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.spool_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        self.spooled += len(ops)
+
+    def _replay_spool(self):
+        """
+        스풀에 남은 작업을 순서대로 다시 기록합니다. DB 연결 문제면 예외를 그대로 올려 스풀을 유지하고,
+        그 밖의 오류면 작업을 하나씩 기록해 실패한 작업만 스풀에 남깁니다.
+        """
+        if not os.path.exists(self.spool_path):
+            return
+        with open(self.spool_path, encoding="utf-8") as f:
+            ops = [json.loads(line) for line in f if line.strip()]
+        try:
+            self._apply(ops)
+        except RETRYABLE_ERRORS:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ 로그 스풀 일괄 기록 실패, 작업별로 다시 기록: {e}")
+            self._replay_each(ops)
+            return
+        os.remove(self.spool_path)
+        logger.info(f"✅ 로그 스풀 작업 {len(ops)}개 기록 완료")
+
+    def _replay_each(self, ops):
+        kept, dead = [], []
+        try:
+            for index, op in enumerate(ops):
+                try:
+                    self._apply([op])
+                except RETRYABLE_ERRORS:
+                    kept.extend(ops[index:])
+                    raise
+                except Exception as e:
+                    op["attempts"] = op.get("attempts", 0) + 1
+                    if op["attempts"] >= self.max_attempts:
+                        logger.error(f"❗ 로그 작업 {op['op']} ({op.get('child_code', '-')}) {op['attempts']}회 실패, 격리: {e}")
+                        dead.append(op)
+                    else:
+                        kept.append(op)
+        finally:
+            self._write_lines(self.dead_letter_path, dead, append=True)
+            self.dead_lettered += len(dead)
+            self._write_lines(self.spool_path, kept, append=False)
+        if kept:
+            logger.warning(f"⚠️ 로그 스풀 작업 {len(ops) - len(kept) - len(dead)}개 기록, {len(kept)}개 남음")
+
+    def _write_lines(self, path, ops, append):
+        """ops 를 JSONL 로 씁니다. append=False 면 임시 파일에 쓴 뒤 교체하고, ops 가 없으면 파일을 지웁니다."""
+        if append:
+            if ops:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops))
+            return
+        if not ops:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops))
+        os.replace(tmp_path, path)
@@ -0,0 +1,292 @@
+"""
+concentration_logs 보존 기간 관리 (압축 + 삭제).
+
+- 원본 로그는 LOG_RETENTION_DAYS 일, 분 단위 rollup 은 ROLLUP_MINUTE_RETENTION_DAYS 일만 보관하고
+  시/일 rollup 은 계속 보관합니다. 통계 API 는 rollup 만 읽으므로 원본을 지워도 결과가 같습니다.
+- rollup 도입 전에 기록된 행(log_id < retention_state.rollup_covered_from)은 지우기 전에
+  같은 트랜잭션에서 rollup 에 먼저 누적합니다(압축).
+- 삭제는 기본 키(log_id) 구간 단위의 짧은 트랜잭션으로 나눠 실행하고 배치 사이에 쉬므로
+  큰 잠금이나 긴 복제 지연을 만들지 않습니다.
+- 표가 월 단위 RANGE 파티션으로 바뀌어 있으면(hatiobot.sql 참고) 오래된 파티션을 통째로 DROP 하고
+  앞으로 쓸 파티션을 미리 만듭니다.
+
+    python -m src.db.retention --dry-run   # 지울 범위만 출력
+    python -m src.db.retention             # 한 번 실행
+"""
+import time
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from src.db.database import get_db
+from src.db.rollups import GRAINS, upsert_rollups
+
+logger = logging.getLogger("retention")
+
+LOGS_TABLE = "concentration_logs"
+MINUTE_TABLE = GRAINS[0][1]
+
+
+def _state(cursor, name, default=0):
+    cursor.execute("SELECT value FROM retention_state WHERE name = %s", (name,))
+    row = cursor.fetchone()
+    return row[0] if row else default
+
+
+def _partitions(cursor, table):
+    """RANGE 파티션 목록 [(이름, 상한 TO_DAYS 값 또는 None=MAXVALUE)]. 파티션이 없으면 빈 목록."""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (table,))
+    return [(name, None if bound == "MAXVALUE" else int(bound)) for name, bound in cursor.fetchall()]
+
+
+def _to_days(moment: datetime) -> int:
+    """MySQL TO_DAYS 와 같은 값 (0000-00-00 기준 일수)."""
+    return moment.toordinal() + 365
+
+
+class RetentionWorker:
+    """
+    보존 기간 작업을 interval 초마다 실행하는 백그라운드 스레드. run_once() 는 CLI 에서도 그대로 씁니다.
+    """
+
+    def __init__(self, retention_days=90, minute_retention_days=30, batch_size=5000, pause=0.05,
+                 interval=3600.0, bucket_seconds=1.0, partitions_ahead=2):
+        self.retention_days = retention_days
+        self.minute_retention_days = minute_retention_days
+        self.batch_size = batch_size
+        self.pause = pause
+        self.interval = interval
+        self.bucket_seconds = bucket_seconds
+        self.partitions_ahead = partitions_ahead
+
+        self._thread = None
+        self._stop = threading.Event()
+
+        self.runs = 0
+        self.rows_deleted = 0
+        self.rows_compacted = 0
+        self.partitions_dropped = 0
+        self.last_run = None
+        self.last_error = None
+
+    # --- 수명 주기 ---
+
+    def start(self):
+        if self._thread is not None or not self.interval or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+        self._thread.start()
+        logger.info(f"🚀 보존 기간 작업 시작 (원본 {self.retention_days}일, {self.interval:.0f}초 간격)")
+
+    def stop(self, timeout=10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "rows_deleted": self.rows_deleted,
+            "rows_compacted": self.rows_compacted,
+            "partitions_dropped": self.partitions_dropped,
+            "last_run": self.last_run,
+            "last_error": self.last_error
+        }
+
+    def _run(self):
+        # 앱 시작 직후의 부하와 겹치지 않도록 한 주기 뒤부터 실행
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"⚠️ 보존 기간 작업 실패: {e}")
+
+    # --- 작업 ---
+
+    def run_once(self, now=None, dry_run=False) -> dict:
+        now = now or datetime.now()
+        log_cutoff = (now - timedelta(days=self.retention_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        minute_cutoff = now - timedelta(days=self.minute_retention_days)
+        started = time.monotonic()
+
+        db = get_db()
+        try:
+            cursor = db.cursor()
+            try:
+                partitions = _partitions(cursor, LOGS_TABLE)
+                covered_from = _state(cursor, "rollup_covered_from")
+            finally:
+                cursor.close()
+
+            if dry_run:
+                return {"log_cutoff": log_cutoff.isoformat(), "minute_cutoff": minute_cutoff.isoformat(),
+                        "partitioned": bool(partitions), "rollup_covered_from": covered_from}
+
+            deleted = compacted = dropped = 0
+            if partitions:
+                # rollup 이 없는 예전 행은 파티션을 지우기 전에 행 단위로 압축
+                if covered_from:
+                    d, c = self._purge_logs(db, log_cutoff, covered_from, max_log_id=covered_from)
+                    deleted, compacted = deleted + d, compacted + c
+                dropped = self._drop_partitions(db, partitions, log_cutoff)
+                self._ensure_partitions(db, now)
+            else:
+                d, c = self._purge_logs(db, log_cutoff, covered_from)
+                deleted, compacted = deleted + d, compacted + c
+            minute_rows = self._purge_minutes(db, minute_cutoff)
+        finally:
+            db.close()
+
+        self.runs += 1
+        self.rows_deleted += deleted
+        self.rows_compacted += compacted
+        self.partitions_dropped += dropped
+        self.last_run = now.isoformat()
+        self.last_error = None
+        result = {"logs_deleted": deleted, "logs_compacted": compacted, "partitions_dropped": dropped,
+                  "minute_rollups_deleted": minute_rows, "seconds": round(time.monotonic() - started, 2)}
+        logger.info(f"🧹 보존 기간 작업 완료: {result}")
+        return result
+
+    def _purge_logs(self, db, cutoff, covered_from, max_log_id=None):
+        """
+        log_id 순서로 batch_size 구간씩 cutoff 이전 행을 지웁니다. 구간 다음 행이 cutoff 이후이면 멈춥니다
+        (log_id 는 기록 순서라 시간 순서와 거의 같음). covered_from 미만 행은 지우기 전에 rollup 에 누적합니다.
+        """
+        deleted = compacted = 0
+        cursor = db.cursor()
+        try:
+            cursor.execute(f"SELECT MIN(log_id) FROM {LOGS_TABLE}")
+            low = (cursor.fetchone() or [None])[0]
+            db.commit()
+            while low is not None and not self._stop.is_set():
+                high = low + self.batch_size
+                if max_log_id is not None:
+                    high = min(high, max_log_id)
+                if high <= low:
+                    break
+
+                if low < covered_from:
+                    cursor.execute(f"""
+                        SELECT user_id, created_at, concentration_score, status FROM {LOGS_TABLE}
+                        WHERE log_id >= %s AND log_id < %s AND log_id < %s AND created_at < %s
+                    """, (low, high, covered_from, cutoff))
+                    rows = cursor.fetchall()
+                    upsert_rollups(cursor, rows, self.bucket_seconds)
+                    compacted += len(rows)
+                cursor.execute(f"DELETE FROM {LOGS_TABLE} WHERE log_id >= %s AND log_id < %s AND created_at < %s",
+                               (low, high, cutoff))
+                deleted += cursor.rowcount
+                db.commit()
+
+                cursor.execute(f"SELECT log_id, created_at FROM {LOGS_TABLE} WHERE log_id >= %s ORDER BY log_id LIMIT 1",
+                               (high,))
+                row = cursor.fetchone()
+                db.commit()
+                if row is None or row[1] >= cutoff:
+                    break
+                low = row[0]
+                if self.pause:
+                    time.sleep(self.pause)
+
+            if covered_from:
+                # 압축 대상이 남아 있지 않으면 다음부터는 확인하지 않음
+                cursor.execute(f"SELECT 1 FROM {LOGS_TABLE} WHERE log_id < %s LIMIT 1", (covered_from,))
+                if cursor.fetchone() is None:
+                    cursor.execute("UPDATE retention_state SET value = 0 WHERE name = 'rollup_covered_from'")
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        return deleted, compacted
+
+    def _purge_minutes(self, db, cutoff):
+        """분 단위 rollup 을 batch_size 행씩 지웁니다 (bucket_start 인덱스 사용)."""
+        deleted = 0
+        cursor = db.cursor()
+        try:
+            while not self._stop.is_set():
+                cursor.execute(f"DELETE FROM {MINUTE_TABLE} WHERE bucket_start < %s LIMIT %s", (cutoff, self.batch_size))
+                count = cursor.rowcount
+                db.commit()
+                deleted += count
+                if count < self.batch_size:
+                    break
+                if self.pause:
+                    time.sleep(self.pause)
+        finally:
+            cursor.close()
+        return deleted
+
+    def _drop_partitions(self, db, partitions, cutoff):
+        """상한이 cutoff 이하인(전부 cutoff 이전인) 파티션을 DROP 합니다. 마지막 파티션은 남깁니다."""
+        limit = _to_days(cutoff)
+        names = [name for name, bound in partitions[:-1] if bound is not None and bound <= limit]
+        if not names:
+            return 0
+        cursor = db.cursor()
+        try:
+            cursor.execute(f"ALTER TABLE {LOGS_TABLE} DROP PARTITION {', '.join(names)}")
+        finally:
+            cursor.close()
+        logger.info(f"🧹 파티션 삭제: {', '.join(names)}")
+        return len(names)
+
+    def _ensure_partitions(self, db, now):
+        """MAXVALUE 파티션(pmax)을 나눠 partitions_ahead 개월 뒤까지 월 파티션을 미리 만듭니다."""
+        cursor = db.cursor()
+        try:
+            partitions = _partitions(cursor, LOGS_TABLE)
+            if not partitions or partitions[-1][1] is not None:
+                return
+            highest = max((bound for _, bound in partitions if bound is not None), default=0)
+
+            month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            additions = []
+            for _ in range(self.partitions_ahead + 1):
+                month = (month + timedelta(days=32)).replace(day=1)
+                if _to_days(month) > highest:
+                    previous = (month - timedelta(days=1)).replace(day=1)
+                    additions.append(f"PARTITION p{previous:%Y%m} VALUES LESS THAN ({_to_days(month)})")
+            if additions:
+                cursor.execute(f"""
+                    ALTER TABLE {LOGS_TABLE} REORGANIZE PARTITION {partitions[-1][0]} INTO (
+                        {', '.join(additions)}, PARTITION {partitions[-1][0]} VALUES LESS THAN MAXVALUE
+                    )
+                """)
+                logger.info(f"✅ 파티션 추가: {len(additions)}개")
+        finally:
+            cursor.close()
+
+
+def main():
+    from src.core.config import (
+        LOG_RETENTION_DAYS, ROLLUP_MINUTE_RETENTION_DAYS, RETENTION_BATCH_SIZE, RETENTION_PAUSE, LOG_BUCKET_SECONDS
+    )
+
+    parser = argparse.ArgumentParser(description="concentration_logs 보존 기간 작업 (압축 + 삭제)")
+    parser.add_argument("--retention-days", type=int, default=LOG_RETENTION_DAYS)
+    parser.add_argument("--minute-retention-days", type=int, default=ROLLUP_MINUTE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=RETENTION_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=RETENTION_PAUSE, help="배치 사이 대기 초")
+    parser.add_argument("--dry-run", action="store_true", help="지울 범위만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    worker = RetentionWorker(args.retention_days, args.minute_retention_days, args.batch_size, args.pause,
+                             interval=0, bucket_seconds=LOG_BUCKET_SECONDS)
+    print(worker.run_once(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+집중도 로그 사전 집계(rollup).
+
+concentration_logs 에 행이 기록될 때 같은 트랜잭션에서 사용자별 분/시/일 단위 합계를
+concentration_rollup_minute / _hour / _day 에 누적합니다 (INSERT ... ON DUPLICATE KEY UPDATE).
+통계 API 는 원본 로그 대신 구간 길이에 맞는 rollup 표만 읽습니다.
+
+    python -m src.db.rollups --rebuild                     # 원본 로그에서 전부 다시 계산 (도입 직후)
+    python -m src.db.rollups --rebuild --since 2024-05-01  # 이 날짜 이후만 (보존 기간 작업 이후)
+    python -m src.db.rollups --rebuild --user 12           # 한 사용자만
+
+보존 기간 작업(src.db.retention)이 오래된 원본 로그를 지운 뒤에는 전체 재계산이 지워진 기간의
+시/일 rollup 까지 없애므로 반드시 --since 로 원본이 남아 있는 기간만 재계산하세요.
+retention_state.rollup_covered_from 이 0 이 아니면(rollup 에 아직 반영되지 않은 원본 행이 있으면)
+보존 기간 작업이 그 행들을 지우기 전에 다시 누적하므로 --since / --user 재계산은 거절됩니다.
+먼저 전체 재계산으로 모든 행을 반영하세요.
+"""
+import argparse
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+logger = logging.getLogger("rollups")
+
+# 단위 이름 → (표 이름, 구간 길이 초). 작은 단위부터
+GRAINS = (
+    ("minute", "concentration_rollup_minute", 60),
+    ("hour", "concentration_rollup_hour", 3600),
+    ("day", "concentration_rollup_day", 86400),
+)
+
+FOCUSING_STATUS = "Focusing"
+
+
+def bucket_start(moment: datetime, grain_seconds: int) -> datetime:
+    """moment 가 속한 구간의 시작 시각 (일 단위는 서버 현지 자정 기준)."""
+    if grain_seconds >= 86400:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if grain_seconds >= 3600:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+def aggregate(rows, bucket_seconds):
+    """
+    (user_id, created_at, concentration_score, status) 목록을 단위별 {(user_id, 구간 시작): [행 수, 점수 합, 집중 행 수, 학습 초]} 로 합칩니다.
+    로그 한 행은 bucket_seconds 초의 학습 시간을 뜻합니다.
+    """
+    totals = {grain: defaultdict(lambda: [0, 0, 0, 0.0]) for grain, _, _ in GRAINS}
+    for user_id, created_at, score, status in rows:
+        for grain, _, seconds in GRAINS:
+            total = totals[grain][user_id, bucket_start(created_at, seconds)]
+            total[0] += 1
+            total[1] += score
+            total[2] += status == FOCUSING_STATUS
+            total[3] += bucket_seconds
+    return totals
+
+
+def upsert_rollups(cursor, rows, bucket_seconds=1.0):
+    """새로 기록한 로그 행들을 rollup 표에 누적합니다. 호출한 쪽의 트랜잭션 안에서 실행됩니다."""
+    if not rows:
+        return
+    for grain, table, _ in GRAINS:
+        values = [
+            (user_id, start, samples, score_sum, focusing, study_seconds)
+            for (user_id, start), (samples, score_sum, focusing, study_seconds) in aggregate(rows, bucket_seconds)[grain].items()
+        ]
+        cursor.executemany(f"""
+            INSERT INTO {table} (user_id, bucket_start, samples, score_sum, focusing_samples, study_seconds)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                samples = samples + VALUES(samples),
+                score_sum = score_sum + VALUES(score_sum),
+                focusing_samples = focusing_samples + VALUES(focusing_samples),
+                study_seconds = study_seconds + VALUES(study_seconds)
+        """, values)
+
+
+def rebuild_rollups(db, user_id=None, bucket_seconds=1.0, since: Optional[datetime] = None):
+    """
+    원본 concentration_logs 에서 rollup 표를 다시 계산합니다 (도입 직후 / 데이터 정정 후).
+    since 를 주면 그날 자정 이후 구간만 지우고 다시 계산합니다.
+    user_id / since 재계산은 rollup_covered_from 이 0 일 때만 할 수 있습니다 (아니면 RuntimeError).
+    """
+    partial = user_id is not None or since is not None
+    conditions, params = [], ()
+    if user_id is not None:
+        conditions.append("user_id = %s")
+        params += (user_id,)
+    if since is not None:
+        since = bucket_start(since, 86400)
+    formats = {"minute": "%Y-%m-%d %H:%i:00", "hour": "%Y-%m-%d %H:00:00", "day": "%Y-%m-%d"}
+    cursor = db.cursor()
+    try:
+        if partial:
+            # 부분 재계산으로 다시 센 행을 보존 기간 작업이 지우기 전에 한 번 더 누적하지 않도록
+            cursor.execute("SELECT value FROM retention_state WHERE name = 'rollup_covered_from' FOR UPDATE")
+            row = cursor.fetchone()
+            if row and row[0]:
+                raise RuntimeError(
+                    f"rollup_covered_from={row[0]}: rollup 에 반영되지 않은 원본 행이 있어 부분 재계산을 할 수 없습니다. "
+                    "먼저 --since / --user 없이 전체 재계산하세요."
+                )
+        for grain, table, _ in GRAINS:
+            rollup_where = " AND ".join(conditions + (["bucket_start >= %s"] if since else [])) or "1 = 1"
+            log_where = " AND ".join(conditions + (["created_at >= %s"] if since else [])) or "1 = 1"
+            extra = (since,) if since else ()
+            cursor.execute(f"DELETE FROM {table} WHERE {rollup_where}", params + extra)
+            cursor.execute(f"""
+                INSERT INTO {table} (user_id, bucket_start, samples, score_sum, focusing_samples, study_seconds)
+                SELECT user_id, CAST(DATE_FORMAT(created_at, '{formats[grain]}') AS DATETIME) AS bucket,
+                       COUNT(*), SUM(concentration_score), SUM(status = %s), COUNT(*) * %s
+                FROM concentration_logs WHERE {log_where}
+                GROUP BY user_id, bucket
+            """, (FOCUSING_STATUS, bucket_seconds) + params + extra)
+            logger.info(f"✅ {table} 재계산: {cursor.rowcount}행")
+        if not partial:
+            # 모든 원본 행이 rollup 에 반영됨 → 보존 기간 작업이 따로 압축할 행 없음
+            cursor.execute("""
+                INSERT INTO retention_state (name, value) VALUES ('rollup_covered_from', 0)
+                ON DUPLICATE KEY UPDATE value = 0
+            """)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def choose_grain(start: datetime, end: datetime, points: int, minute_since: Optional[datetime] = None):
+    """
+    요청 구간을 points 개 정도의 점으로 나눌 때 쓸 (표 이름, 점 간격 초).
+    점 간격보다 크지 않은 가장 큰 단위를 골라 읽는 행 수를 줄이고, 간격은 그 단위의 배수로 맞춥니다.
+    minute_since 보다 이전 구간은 분 단위 rollup 이 보존 기간 작업으로 지워졌으므로 시 단위부터 씁니다.
+    """
+    step = max(1.0, (end - start).total_seconds() / max(1, points))
+    grains = GRAINS[1:] if minute_since is not None and start < minute_since else GRAINS
+    table, grain_seconds = grains[0][1], grains[0][2]
+    for _, candidate, seconds in grains:
+        if seconds <= step:
+            table, grain_seconds = candidate, seconds
+    step = max(grain_seconds, int(step // grain_seconds) * grain_seconds)
+    return table, step
+
+
+def align_range(start: datetime, end: datetime, grain_seconds: int):
+    """start 는 그 구간의 시작으로 내리고 end 는 다음 구간 시작으로 올려, rollup 구간이 잘리지 않는 범위로 맞춥니다."""
+    aligned_end = bucket_start(end, grain_seconds)
+    if aligned_end < end:
+        aligned_end += timedelta(seconds=grain_seconds)
+    return bucket_start(start, grain_seconds), aligned_end
+
+
+def query_history(cursor, user_id, start: datetime, end: datetime, points=100, minute_since: Optional[datetime] = None):
+    """
+    [start, end) 구간의 요약과 내려받은(downsampled) 기록 점 목록을 rollup 표에서 계산합니다.
+    rollup 구간은 나눌 수 없으므로 start/end 를 고른 단위의 구간 경계로 넓혀 계산하고, 실제로 계산한
+    범위를 "start"/"end" 로 함께 반환합니다. cursor 는 dictionary=True 여야 합니다.
+    """
+    table, step = choose_grain(start, end, points, minute_since)
+    grain_seconds = next(seconds for _, name, seconds in GRAINS if name == table)
+    start, end = align_range(start, end, grain_seconds)
+    cursor.execute(f"""
+        SELECT FLOOR(TIMESTAMPDIFF(SECOND, %s, bucket_start) / %s) AS slot,
+               SUM(samples) AS samples, SUM(score_sum) AS score_sum,
+               SUM(focusing_samples) AS focusing, SUM(study_seconds) AS study_seconds
+        FROM {table}
+        WHERE user_id = %s AND bucket_start >= %s AND bucket_start < %s
+        GROUP BY slot
+        ORDER BY slot
+    """, (start, step, user_id, start, end))
+
+    history, samples, score_sum, study_seconds = [], 0, 0, 0.0
+    for row in cursor.fetchall():
+        n = int(row["samples"] or 0)
+        if not n:
+            continue
+        samples += n
+        score_sum += int(row["score_sum"] or 0)
+        study_seconds += float(row["study_seconds"] or 0)
+        history.append({
+            "time": (start + timedelta(seconds=int(row["slot"]) * step)).isoformat(),
+            "avg_concentration": round(int(row["score_sum"]) / n, 2),
+            "focus_ratio": round(int(row["focusing"] or 0) / n, 3),
+            "study_minutes": round(float(row["study_seconds"] or 0) / 60.0, 2)
+        })
+
+    return {
+        "average_concentration": round(score_sum / samples, 2) if samples else 0.0,
+        "total_study_time": round(study_seconds / 60.0, 2),
+        "step_seconds": step,
+        "start": start,
+        "end": end,
+        "history": history
+    }
+
+
+def main():
+    from src.core.config import LOG_BUCKET_SECONDS
+    from src.db.database import get_db
+
+    parser = argparse.ArgumentParser(description="집중도 rollup 표 재계산")
+    parser.add_argument("--rebuild", action="store_true", help="concentration_logs 에서 rollup 을 다시 계산")
+    parser.add_argument("--user", type=int, help="이 사용자만 재계산")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="이 날짜(YYYY-MM-DD) 이후만 재계산")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    logging.basicConfig(level=logging.INFO)
+    db = get_db()
+    try:
+        rebuild_rollups(db, args.user, LOG_BUCKET_SECONDS, args.since)
+    except RuntimeError as e:
+        logger.error(f"❗ {e}")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,23 @@ import os
 import cv2
 import numpy as np
 import mediapipe as mp
+import time
 import traceback
 import logging
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.core.config import SECRET_KEY
-from src.state import shared_camera_manager, shared_detector, initialize_shared_resources
+from src import state
+from src.core import metrics
+from src.core.security import revoke_token, token_cache
+from src.core.executors import EXECUTORS, ExecutorSaturated, shutdown_executors
+from src.db.database import pool as db_pool
 from src.api import auth, parent, child, video
 
 # --- 🔧 로깅 설정 ---
@@ -36,6 +42,75 @@ app.add_middleware(
     session_cookie="session_token"
 )
 
+# --- ✅ 라우트별 지연 시간 기록 ---
+INSTRUMENTED_ROUTERS = {"auth", "parent", "child", "video"}
+
+
+class RequestLatencyMiddleware:
+    """
+    순수 ASGI 미들웨어: 응답 시작(http.response.start) 메시지를 보낼 때 상태 코드와 그때까지 걸린 시간을
+    기록합니다. 스트리밍 응답도 응답 시작까지만 재므로 스트림 수명이 지연 시간에 섞이지 않습니다.
+    응답을 시작하지 못하고 끝난(예외) 요청은 끝난 시점에 500 으로 기록합니다.
+    BaseHTTPMiddleware 와 달리 응답 본문을 메모리 스트림으로 다시 보내지 않으므로
+    MJPEG/SSE 스트리밍과 연결 종료 감지에 끼어들지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        recorded = False
+
+        def record(status_code):
+            nonlocal recorded
+            recorded = True
+            # 라우팅이 끝나면 Starlette 가 같은 scope 에 route 를 기록함
+            path = getattr(scope.get("route"), "path", None) or "unmatched"
+            router = path.strip("/").split("/", 1)[0]
+            if router != "metrics" and router != "static":
+                metrics.HTTP_REQUEST_SECONDS.labels(
+                    router if router in INSTRUMENTED_ROUTERS else "other", path, scope["method"], str(status_code)
+                ).observe(time.perf_counter() - started)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start" and not recorded:
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if not recorded:
+                record(500)
+
+
+app.add_middleware(RequestLatencyMiddleware)
+
+# --- ✅ 조회 시점에 계산하는 상태 지표 ---
+metrics.Gauge("studybot_sessions", "활성 학생 세션 수",
+              callback=lambda: len(state.session_registry) if state.session_registry else 0)
+metrics.Gauge("studybot_status_subscribers", "상태 push(SSE) 구독자 수",
+              callback=lambda: state.status_hub.subscriber_count())
+metrics.Gauge("studybot_mosaic_streams", "합성 중인 부모 대시보드 모자이크 수",
+              callback=lambda: state.mosaic_hub.stream_count() if state.mosaic_hub else 0)
+metrics.Gauge("studybot_auth_token_cache", "인증 토큰 캐시 항목/폐기 수와 누적 적중/실패 수", ["state"],
+              callback=lambda: {(k,): v for k, v in token_cache.stats().items()})
+metrics.Gauge("studybot_db_pool_connections", "DB 연결 풀 연결 수", ["state"],
+              callback=lambda: {(k,): v for k, v in db_pool.stats().items() if k in ("checked_out", "idle")})
+metrics.Gauge("studybot_db_pool_timeouts", "DB 연결 풀 대기 시간 초과 누적 횟수",
+              callback=lambda: db_pool.timeouts)
+metrics.Gauge("studybot_log_writer_queue", "집중도 로그 작성기 대기/버림 건수", ["state"],
+              callback=lambda: {(k,): v for k, v in state.log_writer.stats().items() if k in ("queued", "dropped")}
+              if state.log_writer else {})
+
+metrics.Gauge("studybot_executor_tasks", "블로킹 작업 풀의 실행+대기 작업 수와 누적 완료/거절(503) 수", ["executor", "state"],
+              callback=lambda: {(e.name, k): v for e in EXECUTORS for k, v in e.stats().items() if k != "limit"})
+
 # --- ✅ 정적 파일 제공 ---
 app.mount("/static", StaticFiles(directory=os.path.join("src", "static")), name="static")
 
@@ -55,6 +130,16 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "서버 내부 오류 발생. 콘솔 로그를 확인하세요."}
     )
 
+# --- ✅ 작업 풀 포화 → 503 (대기열을 늘리지 않고 바로 거절) ---
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    logger.warning(f"⚠️ {exc.name} 작업 풀 포화: {request.method} {request.url.path} 거절")
+    return JSONResponse(
+        status_code=503,
+        content={"success": False, "message": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # --- ✅ 메인 페이지 ---
 @app.get("/")
 async def index(request: Request):
@@ -63,9 +148,20 @@ async def index(request: Request):
         "video_feed_url": "/video/video_feed"
     })
 
+# --- ✅ 지표 ---
+@app.get("/metrics")
+async def metrics_endpoint():
+    if not metrics.ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # --- ✅ 로그아웃 ---
 @app.api_route("/logout", methods=["GET", "POST"])
-async def logout():
+async def logout(request: Request):
+    # 쿠키를 지우는 것과 별도로, 이미 복사된 토큰도 만료 시각까지 거부되도록 폐기
+    token = request.cookies.get("session_token")
+    if token:
+        revoke_token(token)
     response = JSONResponse(content={"success": True, "message": "로그아웃되었습니다."})
     response.delete_cookie("session_token")
     return response
@@ -75,36 +171,70 @@ async def logout():
 async def startup_event():
     logger.info("✅ startup_event 진입")
 
-    initialize_shared_resources()
-
-    if shared_detector is None or not shared_detector.is_initialized:
-        logger.warning("🚨 shared_detector 비정상 상태 또는 초기화 실패")
-    else:
-        logger.info("✅ shared_detector 정상 및 초기화 완료")
+    state.initialize_shared_resources()
 
     try:
-        if shared_camera_manager and shared_camera_manager.is_initialized:
+        if state.shared_camera_manager and state.shared_camera_manager.is_initialized:
             logger.info("✅ 카메라 매니저 이미 초기화됨.")
-        elif shared_camera_manager:
-            shared_camera_manager.initialize_camera()
+        elif state.shared_camera_manager:
+            state.shared_camera_manager.initialize_camera()
             logger.info("✅ 카메라 초기화 완료")
+
+        if state.shared_camera_manager:
+            state.shared_camera_manager.start()
+            logger.info("✅ 공유 캡처 스레드 시작")
     except Exception as e:
         logger.exception("❌ 카메라 초기화 실패:")
 
+    if state.session_registry:
+        state.session_registry.start_reaper()
+        logger.info("✅ 세션 정리 스레드 시작")
+
+    if state.log_writer:
+        state.log_writer.start()
+        logger.info("✅ 집중도 로그 작성 스레드 시작")
+
+    if state.retention_worker:
+        state.retention_worker.start()
+        logger.info("✅ 보존 기간 작업 스레드 시작")
+
+    # 첫 얼굴 등록/로그인 요청이 모델 로드를 기다리지 않도록 미리 로드
+    if state.face_mesh_pool:
+        try:
+            await run_in_threadpool(state.face_mesh_pool.warm_up)
+        except Exception as e:
+            logger.exception("❌ FaceMesh 워밍업 실패:")
+
 # --- ✅ 앱 종료 시 리소스 정리 ---
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("✅ shutdown_event 진입")
 
-    if shared_camera_manager:
-        shared_camera_manager.release()
-        logger.info("✅ 카메라 리소스 해제 완료.")
+    if state.mosaic_hub:
+        state.mosaic_hub.close_all()
+        logger.info("✅ 모자이크 스트림 정리 완료.")
+
+    if state.session_registry:
+        state.session_registry.close_all()
+        logger.info("✅ 학생 세션 정리 완료.")
+
+    if state.retention_worker:
+        state.retention_worker.stop()
 
-    if shared_detector:
-        if hasattr(shared_detector, 'close') and callable(shared_detector.close):
-            shared_detector.close()
-            logger.info("✅ ConcentrationDetector 리소스 해제 완료.")
-        else:
-            logger.warning("⚠️ ConcentrationDetector에 close() 메서드 없음. 자원 해제 불완전할 수 있음.")
+    # 세션 종료 알림까지 받은 뒤 남은 기록을 flush
+    if state.log_writer:
+        state.log_writer.stop()
+        logger.info("✅ 집중도 로그 기록 완료.")
+
+    # 진행 중인 얼굴 등록/로그인이 끝난 뒤 FaceMesh 를 닫음
+    shutdown_executors()
+
+    if state.face_mesh_pool:
+        state.face_mesh_pool.close()
+        logger.info("✅ FaceMesh 풀 정리 완료.")
+
+    if state.shared_camera_manager:
+        state.shared_camera_manager.release()
+        logger.info("✅ 카메라 리소스 해제 완료.")
 
     logger.info("✅ 앱 종료 작업 완료.")
@@ -4,14 +4,43 @@ import mediapipe as mp
 import traceback
 
 from .gaze_tracker import GazeTracker
-from utils.frame_utils import is_valid_frame
+from .motion_gate import MotionGate
+from src.core.config import (
+    FACE_DETECTION_MODE, FACE_REACQUIRE_AFTER, MOTION_GATE_ENABLED, MOTION_THRESHOLD, MOTION_REFRESH_FRAMES
+)
+from src.core.metrics import MOTION_SKIPPED_FRAMES
+from src.utils.frame_utils import is_valid_frame
+
+DETECTION_MODES = ("facemesh", "detector")
 
 
 class ConcentrationDetector:
-    def __init__(self):
+    def __init__(self, detection_mode=None, reacquire_after=None, motion_gate=None):
+        """
+        detection_mode:
+          - "facemesh": 얼굴 유무/박스를 FaceMesh 랜드마크로 판단하고, FaceMesh 가
+            reacquire_after 프레임 연속으로 얼굴을 놓친 뒤에만 FaceDetection 으로 재탐색
+          - "detector": 기존 방식 (매 프레임 FaceDetection 후 FaceMesh)
+        motion_gate: True/False 또는 MotionGate 인스턴스. 켜져 있으면 직전 분석 이후 얼굴 영역이
+          거의 바뀌지 않은 프레임은 추론하지 않고 직전 결과를 재사용 (기본값은 MOTION_GATE_ENABLED)
+        """
         print("[INIT] ConcentrationDetector 초기화 시작")
         self.is_initialized = False
 
+        self.detection_mode = detection_mode or FACE_DETECTION_MODE
+        if self.detection_mode not in DETECTION_MODES:
+            print(f"[WARN] 알 수 없는 detection_mode={self.detection_mode}, 'facemesh' 사용")
+            self.detection_mode = "facemesh"
+        self.reacquire_after = FACE_REACQUIRE_AFTER if reacquire_after is None else reacquire_after
+        self.missed_frames = 0
+
+        if motion_gate is None:
+            motion_gate = MOTION_GATE_ENABLED
+        if motion_gate is True:
+            motion_gate = MotionGate(threshold=MOTION_THRESHOLD, refresh_after=MOTION_REFRESH_FRAMES)
+        self.motion_gate = motion_gate or None
+        self._last_result = None
+
         try:
             # MediaPipe Face Detection 초기화
             self.mp_face_detection = mp.solutions.face_detection
@@ -47,49 +76,141 @@ class ConcentrationDetector:
     def get_current_status(self):
         return self.current_status
 
-    def process_image(self, frame):
+    def process_image(self, frame, draw=True):
+        """
+        프레임 하나를 분석합니다.
+        draw=False 이면 debug_image 를 만들지 않고 분석 결과만 반환합니다
+        (파이프라인에서는 인코딩 단계가 draw_overlay 로 최신 프레임에 직접 그림).
+        """
         if not self.is_initialized:
-            return self._error_status("System Error: Not Initialized")
+            return self._error_status("System Error: Not Initialized", draw)
 
         if not is_valid_frame(frame):
-            return self._error_status("Invalid image")
+            return self._error_status("Invalid image", draw)
 
         try:
             self.current_frame = frame
-            debug_image = frame.copy()
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-            face_results = self.face_detection.process(frame_rgb)
-            if not face_results.detections:
-                return self._error_status("Face not detected")
+            # 장면이 그대로면 FaceDetection/FaceMesh 를 건너뛰고 직전 결과(같은 객체)를 재사용
+            if self.motion_gate is not None and self._last_result is not None and self.motion_gate.is_static(frame):
+                MOTION_SKIPPED_FRAMES.inc()
+                result = self._last_result
+                if draw:
+                    result = dict(result, debug_image=self.draw_overlay(frame, result))
+                return result
 
-            for detection in face_results.detections:
-                self.mp_drawing.draw_detection(debug_image, detection)
-
-            gaze_status = self.gaze_tracker.get_gaze(frame)
-            debug_image = self.gaze_tracker.draw_debug(debug_image)
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-            result = self.analyze_concentration(
-                face_detected=True,
-                gaze_status=gaze_status
-            )
-            result["debug_image"] = debug_image
-            self.current_status = result
+            if self.detection_mode == "detector":
+                result = self._process_with_detector(frame, frame_rgb)
+            else:
+                result = self._process_with_facemesh(frame, frame_rgb)
+            if result is None:
+                result = self._error_status("Face not detected", draw)
+            else:
+                if draw:
+                    result["debug_image"] = self.draw_overlay(frame, result)
+                self.current_status = result
+
+            if self.motion_gate is not None:
+                self.motion_gate.update(frame, result.get("face_box"))
+                self._last_result = result
             return result
 
         except Exception as e:
             print(f"[ERROR] 이미지 처리 중 예외 발생: {e}")
             traceback.print_exc()
-            return self._error_status("System Error: Processing Failed")
+            self._last_result = None
+            return self._error_status("System Error: Processing Failed", draw)
+
+    def _process_with_detector(self, frame, frame_rgb):
+        face_results = self.face_detection.process(frame_rgb)
+        if not face_results.detections:
+            return None
+
+        # FaceDetection 에 쓴 RGB 프레임을 그대로 넘겨 FaceMesh 는 한 번만 실행
+        gaze = self.gaze_tracker.analyze(frame, frame_rgb)
+
+        result = self.analyze_concentration(
+            face_detected=True,
+            gaze_status=gaze.status
+        )
+        result["detections"] = list(face_results.detections)
+        result["gaze"] = gaze
+        return result
+
+    def _process_with_facemesh(self, frame, frame_rgb):
+        detections = []
+
+        # 재탐색 상태: 아무도 없을 때 FaceMesh 까지 돌리지 않도록 가벼운 FaceDetection 으로 먼저 확인
+        if self.missed_frames >= self.reacquire_after:
+            face_results = self.face_detection.process(frame_rgb)
+            if not face_results.detections:
+                return None
+            detections = list(face_results.detections)
+
+        gaze = self.gaze_tracker.analyze(frame, frame_rgb)
+
+        if gaze.landmarks is not None:
+            self.missed_frames = 0
+            face_box = GazeTracker.face_box(gaze.landmarks)
+        elif detections:
+            # FaceDetection 은 얼굴을 찾았지만 FaceMesh 는 아직 못 잡은 경우 (기존 방식과 같은 판정)
+            face_box = None
+        else:
+            self.missed_frames += 1
+            return None
+
+        result = self.analyze_concentration(
+            face_detected=True,
+            gaze_status=gaze.status
+        )
+        result["detections"] = detections
+        result["face_box"] = face_box
+        result["gaze"] = gaze
+        return result
+
+    def draw_overlay(self, frame, result):
+        """
+        분석 결과(result)를 다른 프레임 위에 그립니다. MediaPipe 추론은 다시 하지 않습니다.
+        검출 박스는 상대 좌표이므로 같은 카메라의 최신 프레임에 그대로 그릴 수 있습니다.
+        """
+        annotated = frame.copy()
+        if not result:
+            return annotated
+
+        for detection in result.get("detections") or []:
+            self.mp_drawing.draw_detection(annotated, detection)
+
+        if result.get("face_box") is not None:
+            h, w = annotated.shape[:2]
+            x1, y1, x2, y2 = result["face_box"]
+            cv2.rectangle(annotated, (int(x1 * w), int(y1 * h)), (int(x2 * w), int(y2 * h)), (255, 255, 255), 2)
+
+        if result.get("gaze") is not None:
+            annotated = self.gaze_tracker.draw_debug(annotated, result["gaze"])
+
+        text = f"{result.get('status', '')} ({result.get('concentration_score', 0)})"
+        cv2.putText(annotated, text, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        return annotated
+
+    def close(self):
+        if getattr(self, "face_detection", None):
+            self.face_detection.close()
+            self.face_detection = None
+        if getattr(self, "gaze_tracker", None):
+            self.gaze_tracker.close()
+        self.is_initialized = False
 
-    def _error_status(self, msg):
+    def _error_status(self, msg, draw=True):
         self.current_status = {
             "status": msg,
             "concentration_score": 0,
             "gaze_status": msg,
-            "face_detected": False,
-            "debug_image": np.zeros((480, 640, 3), dtype=np.uint8)
+            "face_detected": False
         }
+        if draw:
+            self.current_status["debug_image"] = np.zeros((480, 640, 3), dtype=np.uint8)
         return self.current_status
 
     def analyze_concentration(self, face_detected, gaze_status):
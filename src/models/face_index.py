@@ -0,0 +1,179 @@
+import logging
+import threading
+
+import numpy as np
+
+from src.core.config import FACE_INDEX_PCA_DIM, FACE_INDEX_RERANK
+from src.models.face_template import TEMPLATE_DTYPE
+
+logger = logging.getLogger("face_index")
+
+
+def procrustes_normalize(shapes) -> np.ndarray:
+    """(N, P, 3) 또는 (P, 3) 랜드마크를 중심 정렬하고 크기(Frobenius norm)를 1 로 맞춥니다."""
+    shapes = np.asarray(shapes, dtype=TEMPLATE_DTYPE)
+    centered = shapes - shapes.mean(axis=-2, keepdims=True)
+    norms = np.linalg.norm(centered, axis=(-2, -1), keepdims=True)
+    return centered / np.maximum(norms, 1e-9)
+
+
+def procrustes_align(shapes, reference) -> np.ndarray:
+    """정규화된 (N, P, 3) 랜드마크를 reference 에 맞게 회전합니다 (반사 없는 직교 Procrustes, 배치 SVD)."""
+    m = np.einsum("npi,pj->nij", shapes, reference)
+    u, _, vt = np.linalg.svd(m)
+    # 회전 행렬의 행렬식이 -1 이면 반사이므로 마지막 축을 뒤집음
+    d = np.sign(np.linalg.det(u @ vt))
+    u[:, :, -1] *= d[:, None]
+    return shapes @ (u @ vt)
+
+
+def _append_row(buffer, count, row):
+    """buffer[:count] 뒤에 row 를 씁니다. 자리가 없으면 용량을 두 배로 늘린 새 버퍼를 반환합니다."""
+    if count == len(buffer):
+        grown = np.empty((max(8, 2 * len(buffer)),) + buffer.shape[1:], dtype=buffer.dtype)
+        grown[:count] = buffer[:count]
+        buffer = grown
+    buffer[count] = row
+    return buffer
+
+
+class FaceIndex:
+    """
+    1:N 얼굴 식별용 메모리 인덱스.
+
+    - 모든 활성 템플릿을 Procrustes 정렬(중심/크기/회전 정규화)한 (N, 468*3) 행렬로 보관하고
+      NumPy 행렬-벡터 곱 한 번으로 전체 거리를 계산합니다.
+    - pca_dim > 0 이고 사용자가 충분히 많으면 PCA 로 축소한 행렬에서 rerank 명의 후보를 고른 뒤
+      원래 차원에서 다시 거리를 계산합니다 (coarse-to-fine).
+    - add 는 새 템플릿을 현재 기준 모양에 정렬하고 (PCA 를 쓰면 현재 축으로 투영해) 행렬 끝에 붙입니다.
+      기준 모양/PCA 축은 build() 때 값을 유지하므로, 등록이 많이 쌓이면 build() 로 다시 만드세요.
+    - remove 는 드물어서 다음 검색 때 인덱스를 다시 만들도록 표시만 합니다.
+    - 행렬들은 용량을 두 배씩 늘리는 버퍼이며 앞의 len(self._rows) 행만 유효합니다.
+    """
+
+    def __init__(self, pca_dim=64, rerank=200, pca_min_users=2000, pca_sample=5000):
+        self.pca_dim = pca_dim
+        self.rerank = rerank
+        self.pca_min_users = pca_min_users
+        self.pca_sample = pca_sample
+
+        self._entries = {}
+        self._rows = []
+        self._row_of = {}  # user_id -> 행 번호
+        self._matrix = None
+        self._reference = None
+        self._mean = None
+        self._components = None
+        self._projected = None
+        self._projected_sq = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    # --- 구성 ---
+
+    def build(self, entries):
+        """FaceTemplate 목록으로 인덱스를 새로 만듭니다."""
+        with self._lock:
+            self._entries = {entry.user_id: entry for entry in entries}
+            self._rebuild()
+            self.loaded = True
+        logger.info(f"✅ 얼굴 인덱스 구성: {len(self._rows)}명 (PCA {'사용' if self._components is not None else '미사용'})")
+
+    def add(self, entry):
+        with self._lock:
+            self._entries[entry.user_id] = entry
+            if self._dirty or self._reference is None:
+                # 아직 만든 적이 없거나 어차피 다시 만들 예정
+                self._dirty = True
+                return
+
+            row = procrustes_align(procrustes_normalize(entry.template)[None], self._reference).reshape(-1)
+            index = self._row_of.get(entry.user_id)
+            if index is None:
+                index = len(self._rows)
+                self._rows.append(entry)
+                self._row_of[entry.user_id] = index
+                self._matrix = _append_row(self._matrix, index, row)
+            else:
+                # 재등록: 같은 행을 덮어씀
+                self._rows[index] = entry
+                self._matrix[index] = row
+
+            if self._components is not None:
+                projected = (row - self._mean) @ self._components.T
+                self._projected = _append_row(self._projected, index, projected)
+                self._projected_sq = _append_row(self._projected_sq, index, projected @ projected)
+
+    def remove(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self._dirty = True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _rebuild(self):
+        self._dirty = False
+        self._rows = list(self._entries.values())
+        self._row_of = {entry.user_id: i for i, entry in enumerate(self._rows)}
+        if not self._rows:
+            self._matrix = self._projected = self._components = self._mean = self._reference = None
+            return
+
+        shapes = procrustes_normalize(np.stack([entry.template for entry in self._rows]))
+        # 기준 모양: 회전 정렬 전 평균 모양 (대부분 정면 등록이므로 충분히 안정적)
+        self._reference = procrustes_normalize(shapes.mean(axis=0))
+        aligned = procrustes_align(shapes, self._reference)
+        self._matrix = np.ascontiguousarray(aligned.reshape(len(self._rows), -1))
+
+        self._components = self._projected = self._mean = None
+        if self.pca_dim and len(self._rows) >= self.pca_min_users and self.pca_dim < self._matrix.shape[1]:
+            rng = np.random.default_rng(0)
+            sample = self._matrix[rng.choice(len(self._rows), min(self.pca_sample, len(self._rows)), replace=False)]
+            self._mean = sample.mean(axis=0)
+            _, _, vt = np.linalg.svd(sample - self._mean, full_matrices=False)
+            self._components = np.ascontiguousarray(vt[:self.pca_dim])
+            self._projected = (self._matrix - self._mean) @ self._components.T
+            self._projected_sq = np.einsum("ij,ij->i", self._projected, self._projected)
+
+    # --- 검색 ---
+
+    def _probe_vector(self, landmarks):
+        probe = procrustes_normalize(landmarks)[None]
+        return procrustes_align(probe, self._reference).ravel()
+
+    def search(self, landmarks, top_k=5):
+        """입력 랜드마크와 가장 가까운 top_k 명을 [(FaceTemplate, distance), ...] 로 반환합니다."""
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            if not self._rows:
+                return []
+            if np.asarray(landmarks).size != self._matrix.shape[1]:
+                return []
+
+            probe = self._probe_vector(landmarks)
+            n = len(self._rows)
+            top_k = min(top_k, n)
+            matrix = self._matrix[:n]
+
+            if self._components is not None:
+                # coarse: PCA 공간에서 후보 선택
+                q = (probe - self._mean) @ self._components.T
+                coarse = self._projected_sq[:n] - 2.0 * (self._projected[:n] @ q)
+                count = min(max(self.rerank, top_k), n)
+                candidates = np.argpartition(coarse, count - 1)[:count]
+                # fine: 원래 차원에서 정확한 거리
+                distances = np.linalg.norm(matrix[candidates] - probe, axis=1)
+            else:
+                candidates = np.arange(n)
+                # 행과 probe 모두 단위 벡터이므로 ||x - p||^2 = 2 - 2 x·p
+                distances = np.sqrt(np.maximum(2.0 - 2.0 * (matrix @ probe), 0.0))
+
+            order = np.argsort(distances)[:top_k]
+            return [(self._rows[candidates[i]], float(distances[i])) for i in order]
+
+
+face_index = FaceIndex(pca_dim=FACE_INDEX_PCA_DIM, rerank=FACE_INDEX_RERANK)
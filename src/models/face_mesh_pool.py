@@ -0,0 +1,107 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+logger = logging.getLogger("face_mesh_pool")
+
+
+def create_static_face_mesh():
+    return mp.solutions.face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, refine_landmarks=False)
+
+
+def landmarks_from_results(results):
+    """FaceMesh 결과의 첫 얼굴을 (468, 3) 배열로 변환합니다. 얼굴이 없으면 None."""
+    if not results.multi_face_landmarks:
+        return None
+    return np.array([(p.x, p.y, p.z) for p in results.multi_face_landmarks[0].landmark])
+
+
+# kind="process" 작업 프로세스마다 하나씩 소유하는 FaceMesh
+_process_face_mesh = None
+
+
+def _process_init():
+    global _process_face_mesh
+    _process_face_mesh = create_static_face_mesh()
+
+
+def _process_extract(frame):
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return landmarks_from_results(_process_face_mesh.process(frame_rgb))
+
+
+class FaceMeshPool:
+    """
+    얼굴 등록/로그인용 정지 이미지 모드 FaceMesh 풀.
+
+    MediaPipe 그래프는 스레드 안전하지 않으므로 전용 작업 스레드 size 개가 각자 FaceMesh 하나를
+    스레드 로컬로 소유하고, 요청은 비어 있는 작업 스레드로 넘어가 처리됩니다.
+    warm_up() 으로 모든 작업 스레드의 그래프를 미리 로드해 첫 요청의 모델 로드 지연을 없앱니다.
+
+    kind="process" 면 작업 스레드 대신 작업 프로세스 size 개가 각자 FaceMesh 를 소유합니다.
+    프레임 복사(pickle) 비용이 들지만 랜드마크 변환 같은 파이썬 쪽 처리가 웹 서버의 GIL 을 잡지 않습니다.
+    """
+
+    def __init__(self, size=2, kind="thread"):
+        self.size = max(1, size)
+        self.kind = kind
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.size, initializer=_process_init)
+            self._task = _process_extract
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="facemesh")
+            self._task = self._extract
+        self._local = threading.local()
+        self._instances = []
+        self._lock = threading.Lock()
+
+    def _face_mesh(self):
+        face_mesh = getattr(self._local, "face_mesh", None)
+        if face_mesh is None:
+            face_mesh = self._local.face_mesh = create_static_face_mesh()
+            with self._lock:
+                self._instances.append(face_mesh)
+        return face_mesh
+
+    def _extract(self, frame):
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return landmarks_from_results(self._face_mesh().process(frame_rgb))
+
+    def extract(self, frame):
+        """작업 스레드에서 랜드마크를 추출하고 끝날 때까지 기다립니다 (이벤트 루프 밖에서 호출)."""
+        return self._executor.submit(self._task, frame).result()
+
+    def warm_up(self, timeout=30.0):
+        """모든 작업 스레드에 FaceMesh 를 만들고 빈 프레임으로 한 번 실행해 둡니다."""
+        blank = np.zeros((480, 640, 3), dtype=np.uint8)
+        if self.kind == "process":
+            # 동시에 size 개를 보내 작업 프로세스를 모두 띄움 (initializer 에서 FaceMesh 생성)
+            for future in [self._executor.submit(_process_extract, blank) for _ in range(self.size)]:
+                future.result(timeout)
+            logger.info(f"✅ 정지 이미지 FaceMesh 작업 프로세스 {self.size}개 준비 완료")
+            return
+
+        barrier = threading.Barrier(self.size)
+
+        def warm():
+            self._extract(blank)
+            # 모든 작업이 서로 다른 스레드에서 실행되도록 대기
+            try:
+                barrier.wait(timeout)
+            except threading.BrokenBarrierError:
+                pass
+
+        for future in [self._executor.submit(warm) for _ in range(self.size)]:
+            future.result()
+        logger.info(f"✅ 정지 이미지 FaceMesh {len(self._instances)}개 준비 완료")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for face_mesh in self._instances:
+                face_mesh.close()
+            self._instances.clear()
@@ -0,0 +1,129 @@
+import math
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from src.core.config import FACE_MIN_SIZE, FACE_MIN_SHARPNESS, FACE_MIN_EAR, FACE_MAX_YAW, FACE_MAX_ROLL
+from src.models.gaze_tracker import GazeTracker
+
+logger = logging.getLogger("face_quality")
+
+NOSE_TIP = 1
+LEFT_EYE_OUTER = 33
+RIGHT_EYE_OUTER = 263
+EYE_IDX = np.array([[33, 159, 158, 133, 153, 144], [362, 386, 385, 263, 373, 380]], dtype=np.intp)
+
+
+@dataclass
+class FrameQuality:
+    """얼굴 등록/인증에 쓸 프레임 하나의 품질 평가"""
+    landmarks: Optional[np.ndarray]
+    face_size: float = 0.0   # 얼굴 박스 너비 / 프레임 너비
+    sharpness: float = 0.0   # 얼굴 영역 Laplacian 분산 (흐림이 클수록 작음)
+    ear: float = 0.0         # 양쪽 눈 EAR 평균 (눈 감음/깜빡임 판별)
+    yaw: float = 0.0         # 코끝의 좌우 치우침 / 눈 사이 거리
+    roll: float = 0.0        # 눈 연결선 기울기 (도)
+    passed: bool = False
+    reason: str = "Face not detected"
+
+    @property
+    def score(self) -> float:
+        """통과한 프레임끼리 순위를 매기는 점수 (선명하고 크고 정면일수록 높음)."""
+        if self.landmarks is None:
+            return float("-inf")
+        return (min(self.sharpness / FACE_MIN_SHARPNESS, 3.0)
+                + min(self.face_size / FACE_MIN_SIZE, 2.0)
+                - abs(self.yaw) / FACE_MAX_YAW
+                - abs(self.roll) / FACE_MAX_ROLL)
+
+
+def assess_frame(frame, landmarks) -> FrameQuality:
+    """랜드마크가 추출된 프레임의 얼굴 크기, 선명도, 눈 뜸, 머리 자세를 평가합니다."""
+    if landmarks is None:
+        return FrameQuality(None)
+
+    h, w = frame.shape[:2]
+    xmin, ymin, xmax, ymax = GazeTracker.face_box(landmarks)
+    face_size = xmax - xmin
+
+    x0, y0, x1, y1 = int(xmin * w), int(ymin * h), int(xmax * w), int(ymax * h)
+    crop = frame[y0:y1, x0:x1]
+    sharpness = float(cv2.Laplacian(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var()) if crop.size else 0.0
+
+    try:
+        ear = GazeTracker._calculate_ear(landmarks, EYE_IDX)
+    except ZeroDivisionError:
+        ear = 0.0
+
+    left, right, nose = landmarks[LEFT_EYE_OUTER, :2], landmarks[RIGHT_EYE_OUTER, :2], landmarks[NOSE_TIP, :2]
+    eye_vec = (right - left) * (w, h)
+    eye_dist = float(np.hypot(*eye_vec)) or 1.0
+    yaw = float(((nose[0] - (left[0] + right[0]) / 2.0) * w) / eye_dist)
+    roll = math.degrees(math.atan2(eye_vec[1], eye_vec[0]))
+    # 좌우 반전된 프레임에서는 눈 순서가 바뀌어 180도 근처가 정면
+    if abs(roll) > 90:
+        roll = roll - math.copysign(180.0, roll)
+
+    quality = FrameQuality(landmarks, face_size, sharpness, ear, yaw, roll)
+    if face_size < FACE_MIN_SIZE:
+        quality.reason = "Face too small"
+    elif sharpness < FACE_MIN_SHARPNESS:
+        quality.reason = "Blurry"
+    elif ear < FACE_MIN_EAR:
+        quality.reason = "Eyes closed"
+    elif abs(yaw) > FACE_MAX_YAW or abs(roll) > FACE_MAX_ROLL:
+        quality.reason = "Head turned"
+    else:
+        quality.passed = True
+        quality.reason = "OK"
+    return quality
+
+
+def _frames(camera_manager, max_frames, timeout):
+    """카메라의 새 프레임을 복사본으로 최대 max_frames 장, timeout 초 동안 내보냅니다."""
+    deadline = time.monotonic() + timeout
+    last_seq, count = 0, 0
+    while count < max_frames:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        seq, frame = camera_manager.wait_for_frame(last_seq, timeout=remaining, copy=True)
+        if frame is None:
+            continue
+        last_seq = seq
+        count += 1
+        yield frame
+
+
+def capture_enrollment(camera_manager, extract, burst=12, keep=4, timeout=5.0):
+    """
+    등록용 연속 촬영: burst 장을 평가해 품질 기준을 통과한 상위 keep 장의 랜드마크 평균을 반환합니다.
+    반환값은 (평균 랜드마크 또는 None, 평가 목록). 통과한 프레임이 없으면 None.
+    """
+    qualities = [assess_frame(frame, extract(frame)) for frame in _frames(camera_manager, burst, timeout)]
+    best = sorted((q for q in qualities if q.passed), key=lambda q: q.score, reverse=True)[:keep]
+    if not best:
+        return None, qualities
+
+    # 프레임마다 얼굴 위치가 조금씩 다르므로 중심을 맞춘 뒤 평균
+    centered = [q.landmarks - q.landmarks.mean(axis=0) for q in best]
+    mean_center = np.mean([q.landmarks.mean(axis=0) for q in best], axis=0)
+    return np.mean(centered, axis=0) + mean_center, qualities
+
+
+def verify_stream(camera_manager, extract, matcher, max_frames=10, timeout=3.0):
+    """
+    로그인용 스트리밍 검증: 새 프레임을 차례로 평가해 품질 기준을 통과하고 matcher(landmarks) 가
+    참인 첫 프레임에서 바로 반환합니다. 반환값은 (일치 여부, 검사한 프레임 수, 마지막 평가).
+    """
+    checked, quality = 0, None
+    for frame in _frames(camera_manager, max_frames, timeout):
+        checked += 1
+        quality = assess_frame(frame, extract(frame))
+        if quality.passed and matcher(quality.landmarks):
+            return True, checked, quality
+    return False, checked, quality
@@ -0,0 +1,116 @@
+import json
+import logging
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger("face_template")
+
+# FaceMesh(refine_landmarks=False) 랜드마크 수
+TEMPLATE_POINTS = 468
+TEMPLATE_DTYPE = np.float32
+
+# 중심 정렬한 랜드마크 사이의 거리 임계값 (기존 compare_landmarks 와 같은 기준)
+MATCH_THRESHOLD = 3.0
+
+
+def normalize_landmarks(landmarks) -> np.ndarray:
+    """(N, 3) 랜드마크를 float32 로 바꾸고 중심을 원점으로 옮긴 새 배열을 반환합니다 (입력은 변경하지 않음)."""
+    points = np.asarray(landmarks, dtype=TEMPLATE_DTYPE).reshape(-1, 3)
+    return points - points.mean(axis=0, dtype=np.float64).astype(TEMPLATE_DTYPE)
+
+
+def encode_template(landmarks) -> bytes:
+    """등록 시점에 DB BLOB 으로 저장할 템플릿 (중심 정렬된 float32, 468×3 = 5616 bytes)."""
+    return normalize_landmarks(landmarks).tobytes()
+
+
+def decode_template(blob) -> np.ndarray:
+    """BLOB 을 (N, 3) float32 읽기 전용 배열로 복원합니다 (복사 없음)."""
+    return np.frombuffer(bytes(blob), dtype=TEMPLATE_DTYPE).reshape(-1, 3)
+
+
+def template_from_json(text) -> np.ndarray:
+    """template 컬럼이 없는 기존 행의 JSON landmarks 를 템플릿 배열로 변환합니다."""
+    return normalize_landmarks(json.loads(text))
+
+
+def template_distance(template, landmarks) -> float:
+    """저장된 템플릿과 입력 랜드마크의 거리. 모양이 다르면 inf."""
+    probe = normalize_landmarks(landmarks)
+    if probe.shape != template.shape:
+        return float("inf")
+    return float(np.linalg.norm(template - probe))
+
+
+@dataclass(frozen=True)
+class FaceTemplate:
+    user_id: int
+    username: str
+    child_code: str
+    template: np.ndarray
+
+
+class TemplateCache:
+    """
+    프로세스 전역 얼굴 템플릿 캐시 (user_id 기준, username 색인 포함).
+
+    - 로그인 시 캐시에 있으면 DB 조회와 JSON 파싱 없이 바로 비교합니다.
+    - 재등록/비활성화 시 invalidate() 로 항목을 지웁니다.
+    """
+
+    def __init__(self):
+        self._by_user_id = {}
+        self._by_username = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username):
+        with self._lock:
+            user_id = self._by_username.get(username)
+            entry = self._by_user_id.get(user_id) if user_id is not None else None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def get_by_user_id(self, user_id):
+        with self._lock:
+            return self._by_user_id.get(user_id)
+
+    def put(self, entry: FaceTemplate):
+        with self._lock:
+            previous = self._by_user_id.get(entry.user_id)
+            if previous is not None and previous.username != entry.username:
+                self._by_username.pop(previous.username, None)
+            self._by_user_id[entry.user_id] = entry
+            self._by_username[entry.username] = entry.user_id
+
+    def invalidate(self, user_id=None, username=None):
+        with self._lock:
+            if user_id is None and username is not None:
+                user_id = self._by_username.get(username)
+            entry = self._by_user_id.pop(user_id, None) if user_id is not None else None
+            if entry is not None:
+                self._by_username.pop(entry.username, None)
+            if username is not None:
+                self._by_username.pop(username, None)
+
+    def entries(self):
+        with self._lock:
+            return list(self._by_user_id.values())
+
+    def clear(self):
+        with self._lock:
+            self._by_user_id.clear()
+            self._by_username.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_user_id)
+
+
+template_cache = TemplateCache()
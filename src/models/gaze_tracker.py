@@ -1,20 +1,45 @@
 import cv2
+import time
 import numpy as np
 import mediapipe as mp
+from dataclasses import dataclass
+from typing import Optional
 from src.utils.frame_utils import is_valid_frame
+from src.core.metrics import GAZE_SECONDS
+
+
+@dataclass
+class GazeResult:
+    """FaceMesh 한 번의 추론으로 얻은 시선 분석 결과 (그리기 단계에서 재사용)"""
+    status: str
+    landmarks: Optional[np.ndarray] = None  # (N, 3) float32 정규화 좌표 (얼굴 없으면 None)
+    ear: Optional[float] = None
+    gaze_ratio: Optional[float] = None
 
 
 class GazeTracker:
-    def __init__(self, hist_size=10, ear_thresh=0.18, focus_lo=0.9, focus_hi=1.1):
+    def __init__(self, hist_size=10, ear_thresh=0.18, focus_lo=0.9, focus_hi=1.1, refine=False):
         self.mesh = None
+        self.refine = refine
         self.hist_size = hist_size
         self.ear_thresh = ear_thresh
         self.focus_lo = focus_lo
         self.focus_hi = focus_hi
-        self.gaze_hist = []
         self.is_initialized = True
         self.left_eye = [33, 159, 158, 133, 153, 144]
         self.right_eye = [362, 386, 385, 263, 373, 380]
+        self._eye_idx = np.array([self.left_eye, self.right_eye], dtype=np.intp)
+
+        # 시선 비율 이력: 고정 크기 링 버퍼 + 누적합 (O(1) 평균)
+        self._hist = np.zeros(max(1, hist_size), dtype=np.float64)
+        self._hist_pos = 0
+        self._hist_len = 0
+        self._hist_sum = 0.0
+
+        # 랜드마크 배열 (첫 프레임에서 한 번 할당). 결과 객체가 참조하는 동안 다음 프레임이
+        # 덮어쓰지 않도록 두 개를 번갈아 사용
+        self._lm_bufs = None
+        self._lm_turn = 0
 
     def _init_mesh(self):
         if self.mesh is not None:
@@ -22,98 +47,144 @@ class GazeTracker:
         print("[DEBUG] MediaPipe FaceMesh 초기화 중 (CPU 모드)...")
         self.mesh = mp.solutions.face_mesh.FaceMesh(
             max_num_faces=1,
-            refine_landmarks=False,
+            refine_landmarks=self.refine,
             static_image_mode=False,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
         print("[DEBUG] MediaPipe FaceMesh 초기화 완료")
 
-    def get_gaze(self, frame: np.ndarray) -> str:
+    def analyze(self, frame: np.ndarray, frame_rgb: Optional[np.ndarray] = None) -> GazeResult:
+        """
+        FaceMesh 를 프레임당 한 번만 실행하여 랜드마크, EAR, 시선 비율, 상태를 함께 반환합니다.
+        호출자가 이미 RGB 로 변환한 프레임이 있으면 frame_rgb 로 넘겨 변환을 생략할 수 있습니다.
+        """
         if not is_valid_frame(frame):
             print("WARN: GazeTracker - 유효하지 않은 프레임")
-            return "Invalid frame"
+            return GazeResult("Invalid frame")
 
         self._init_mesh()
+        started = time.perf_counter()
+        try:
+            return self._analyze(frame, frame_rgb)
+        finally:
+            GAZE_SECONDS.observe(time.perf_counter() - started)
 
+    def _analyze(self, frame, frame_rgb):
         try:
-            result = self.mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if frame_rgb is None:
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = self.mesh.process(frame_rgb)
         except Exception as e:
             print(f"ERROR: MediaPipe 처리 중 오류: {e}")
-            return "Processing error"
+            return GazeResult("Processing error")
 
         if not hasattr(result, 'multi_face_landmarks') or not result.multi_face_landmarks:
-            return "Face not detected"
+            return GazeResult("Face not detected")
 
-        landmarks = result.multi_face_landmarks[0].landmark
+        landmarks = self._landmarks_to_array(result.multi_face_landmarks[0].landmark)
 
         try:
-            ear = np.mean([
-                self._calculate_ear(landmarks, self.left_eye),
-                self._calculate_ear(landmarks, self.right_eye)
-            ])
+            ear = self._calculate_ear(landmarks, self._eye_idx)
         except ZeroDivisionError:
-            return "Processing error"
+            return GazeResult("Processing error", landmarks)
 
         if ear < self.ear_thresh:
-            return "Eyes closed"
+            return GazeResult("Eyes closed", landmarks, ear)
 
         try:
             gaze_ratio = np.mean([
                 self._calculate_gaze_ratio(frame, landmarks, self.left_eye),
                 self._calculate_gaze_ratio(frame, landmarks, self.right_eye)
             ])
-            gaze_ratio = np.clip(gaze_ratio, 0.1, 10.0)
+            gaze_ratio = float(np.clip(gaze_ratio, 0.1, 10.0))
         except Exception as e:
             print(f"ERROR: Gaze ratio 계산 중 오류: {e}")
-            return "Processing error"
-
-        self.gaze_hist.append(gaze_ratio)
-        if len(self.gaze_hist) > self.hist_size:
-            self.gaze_hist.pop(0)
+            return GazeResult("Processing error", landmarks, ear)
 
-        avg_ratio = float(np.mean(self.gaze_hist))
+        avg_ratio = self._push_history(gaze_ratio)
         if self.focus_lo < avg_ratio < self.focus_hi:
-            return "Focusing"
-        return "Looking left" if avg_ratio <= self.focus_lo else "Looking right"
+            status = "Focusing"
+        else:
+            status = "Looking left" if avg_ratio <= self.focus_lo else "Looking right"
+        return GazeResult(status, landmarks, ear, gaze_ratio)
+
+    def _landmarks_to_array(self, landmarks) -> np.ndarray:
+        """MediaPipe 랜드마크 목록을 미리 할당된 (N, 3) float32 배열로 한 번에 변환합니다."""
+        n = len(landmarks)
+        if self._lm_bufs is None or self._lm_bufs[0].shape[0] != n:
+            self._lm_bufs = [np.empty((n, 3), dtype=np.float32) for _ in range(2)]
+        self._lm_turn ^= 1
+        buf = self._lm_bufs[self._lm_turn]
+        buf.reshape(-1)[:] = np.fromiter(
+            (v for lm in landmarks for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=n * 3
+        )
+        return buf
+
+    def _push_history(self, value: float) -> float:
+        """링 버퍼에 값을 넣고 현재 평균을 반환합니다."""
+        size = self._hist.shape[0]
+        if self._hist_len == size:
+            self._hist_sum -= self._hist[self._hist_pos]
+        else:
+            self._hist_len += 1
+        self._hist[self._hist_pos] = value
+        self._hist_sum += value
+        self._hist_pos = (self._hist_pos + 1) % size
+        if self._hist_pos == 0:
+            # 한 바퀴마다 누적합을 다시 계산해 부동소수점 오차가 쌓이지 않게 함
+            self._hist_sum = float(self._hist[:self._hist_len].sum())
+        return self._hist_sum / self._hist_len
+
+    def reset_history(self):
+        self._hist_pos = 0
+        self._hist_len = 0
+        self._hist_sum = 0.0
 
-    def draw_debug(self, frame: np.ndarray) -> np.ndarray:
-        if not is_valid_frame(frame):
-            return np.zeros((480, 640, 3), dtype=np.uint8)
+    @staticmethod
+    def face_box(landmarks):
+        """랜드마크를 감싸는 정규화 좌표 박스 (xmin, ymin, xmax, ymax)."""
+        lo = np.clip(landmarks[:, :2].min(axis=0), 0.0, 1.0)
+        hi = np.clip(landmarks[:, :2].max(axis=0), 0.0, 1.0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
 
-        self._init_mesh()
+    def get_gaze(self, frame: np.ndarray) -> str:
+        return self.analyze(frame).status
 
-        try:
-            result = self.mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        except Exception as e:
-            print(f"ERROR: draw_debug 처리 중 오류: {e}")
-            return frame
+    def draw_debug(self, frame: np.ndarray, result: Optional[GazeResult]) -> np.ndarray:
+        """analyze() 결과의 눈 랜드마크를 그립니다. FaceMesh 를 다시 실행하지 않습니다."""
+        if not is_valid_frame(frame):
+            return np.zeros((480, 640, 3), dtype=np.uint8)
 
-        if not hasattr(result, 'multi_face_landmarks') or not result.multi_face_landmarks:
+        if result is None or result.landmarks is None:
             return frame
 
         annotated = frame.copy()
         h, w = annotated.shape[:2]
-        for idx in self.left_eye + self.right_eye:
-            lm = result.multi_face_landmarks[0].landmark[idx]
-            x, y = int(lm.x * w), int(lm.y * h)
-            cv2.circle(annotated, (x, y), 2, (0, 255, 0), -1)
+        pts = (result.landmarks[self._eye_idx.reshape(-1), :2] * (w, h)).astype(np.int32)
+        for x, y in pts:
+            cv2.circle(annotated, (int(x), int(y)), 2, (0, 255, 0), -1)
         return annotated
 
     @staticmethod
-    def _calculate_ear(landmarks, eye_indices):
-        pts = np.array([[landmarks[i].x, landmarks[i].y] for i in eye_indices])
-        v1 = np.linalg.norm(pts[1] - pts[5])
-        v2 = np.linalg.norm(pts[2] - pts[4])
-        h = np.linalg.norm(pts[0] - pts[3])
-        if h == 0:
+    def _calculate_ear(landmarks, eye_idx):
+        """
+        양쪽 눈의 EAR 평균을 한 번의 벡터 연산으로 계산합니다.
+        eye_idx 는 (눈 개수, 6) 인덱스 배열이고 landmarks 는 (N, 3) 배열입니다.
+        """
+        pts = landmarks[eye_idx, :2]  # (E, 6, 2)
+        v1 = np.linalg.norm(pts[:, 1] - pts[:, 5], axis=-1)
+        v2 = np.linalg.norm(pts[:, 2] - pts[:, 4], axis=-1)
+        h = np.linalg.norm(pts[:, 0] - pts[:, 3], axis=-1)
+        if not h.all():
             raise ZeroDivisionError("EAR 계산 중 나눗셈 오류")
-        return (v1 + v2) / (2.0 * h)
+        return float(np.mean((v1 + v2) / (2.0 * h)))
 
     @staticmethod
     def _calculate_gaze_ratio(frame, landmarks, eye_indices):
         h, w = frame.shape[:2]
-        pts = np.array([[landmarks[i].x * w, landmarks[i].y * h] for i in eye_indices], dtype=np.int32)
+        pts = (landmarks[eye_indices, :2] * (w, h)).astype(np.int32)
         min_pt = pts.min(axis=0) - 2
         max_pt = pts.max(axis=0) + 2
         x1 = max(0, int(min_pt[0]))
@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+
+from src.utils.frame_utils import is_valid_frame
+
+
+class MotionGate:
+    """
+    장면이 거의 그대로인 프레임에서 MediaPipe 추론을 건너뛰기 위한 저비용 변화 감지기.
+
+    마지막으로 전체 분석한 프레임의 얼굴 영역(얼굴 박스가 없으면 프레임 전체)을 흑백
+    size x size 썸네일로 줄여 두고, 새 프레임의 같은 영역 썸네일과의 절대 차이를
+    grid x grid 블록 평균으로 비교합니다. 가장 많이 바뀐 블록의 평균 차이가 threshold
+    (0~255 밝기 단위) 미만이면 정지 상태로 봅니다. 전체 평균이 아니라 블록 최대값을 쓰므로
+    눈 감기처럼 작은 영역의 변화도 놓치지 않습니다.
+
+    refresh_after 프레임 연속으로 건너뛰면 장면이 그대로여도 한 번은 전체 분석합니다.
+    """
+
+    def __init__(self, threshold=4.0, refresh_after=5, size=32, grid=4, margin=0.25):
+        self.threshold = threshold
+        self.refresh_after = refresh_after
+        self.size = size
+        self.grid = grid
+        self.margin = margin
+
+        self._reference = None
+        self._roi = None
+        self.skipped = 0
+        self.skipped_total = 0
+        self.checked_total = 0
+
+    def _roi_from_box(self, shape, face_box):
+        h, w = shape[:2]
+        if face_box is None:
+            return 0, 0, w, h
+        x1, y1, x2, y2 = face_box
+        mx, my = (x2 - x1) * self.margin, (y2 - y1) * self.margin
+        left, top = max(0, int((x1 - mx) * w)), max(0, int((y1 - my) * h))
+        right, bottom = min(w, int((x2 + mx) * w)), min(h, int((y2 + my) * h))
+        if right - left < 8 or bottom - top < 8:
+            return 0, 0, w, h
+        return left, top, right, bottom
+
+    def _thumbnail(self, frame, roi):
+        left, top, right, bottom = roi
+        crop = frame[top:bottom, left:right]
+        small = cv2.resize(crop, (self.size, self.size), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def is_static(self, frame) -> bool:
+        """직전 기준 프레임과 비교해 추론을 건너뛰어도 되면 True. 건너뛴 횟수도 함께 셉니다."""
+        self.checked_total += 1
+        if self._reference is None or self.skipped >= self.refresh_after or not is_valid_frame(frame):
+            return False
+
+        diff = np.abs(self._thumbnail(frame, self._roi) - self._reference)
+        block = self.size // self.grid
+        blocks = diff[:block * self.grid, :block * self.grid].reshape(self.grid, block, self.grid, block)
+        if float(blocks.mean(axis=(1, 3)).max()) >= self.threshold:
+            return False
+
+        self.skipped += 1
+        self.skipped_total += 1
+        return True
+
+    def update(self, frame, face_box=None):
+        """전체 분석을 마친 프레임을 새 기준으로 저장합니다."""
+        self.skipped = 0
+        if not is_valid_frame(frame):
+            self.reset()
+            return
+        self._roi = self._roi_from_box(frame.shape, face_box)
+        self._reference = self._thumbnail(frame, self._roi)
+
+    def reset(self):
+        self._reference = None
+        self._roi = None
+        self.skipped = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped_total / self.checked_total if self.checked_total else 0.0
@@ -122,6 +122,9 @@ class ChildStatistics(BaseModel):
     total_study_time: float  # minutes
     last_session: Optional[datetime]
     concentration_history: List[dict]
+    # rollup 구간 경계로 맞춘, 실제로 계산한 [range_start, range_end) 범위
+    range_start: Optional[datetime] = None
+    range_end: Optional[datetime] = None
     
     class Config:
         orm_mode = True
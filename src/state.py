@@ -4,22 +4,48 @@ import logging
 import traceback
 
 from src.core.camera import CameraManager
-from src.models.detector import ConcentrationDetector
+from src.core.config import (
+    ANALYSIS_FPS, JPEG_QUALITY, FACE_MESH_POOL_SIZE, FACE_MESH_POOL_KIND, MAX_SESSIONS, SESSION_IDLE_TIMEOUT, CAMERA_SOURCES,
+    LOG_WRITER_ENABLED, LOG_BUCKET_SECONDS, LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL,
+    STUDY_SESSION_GAP, LOG_SPOOL_PATH, LOG_SPOOL_MAX_BYTES, MOSAIC_MAX_TILES, MOSAIC_JPEG_QUALITY,
+    LOG_RETENTION_DAYS, ROLLUP_MINUTE_RETENTION_DAYS, RETENTION_BATCH_SIZE, RETENTION_PAUSE, RETENTION_INTERVAL
+)
+from src.core.mosaic import MosaicHub
+from src.core.sessions import SessionRegistry, parse_camera_sources, status_payload
+from src.core.status_hub import StatusHub
+from src.db.log_writer import LogWriter
+from src.db.retention import RetentionWorker
+from src.models.face_mesh_pool import FaceMeshPool
 
 logger = logging.getLogger("state")
 
 # 전역 공유 인스턴스
-shared_camera_manager: CameraManager = None
-shared_detector: ConcentrationDetector = None
+shared_camera_manager: CameraManager = None  # 서버 로컬 카메라 (얼굴 등록/로그인, 기본 세션 소스)
+session_registry: SessionRegistry = None     # child_code 별 캡처/detector/상태
+status_hub: StatusHub = StatusHub()          # child_code 별 상태 push (SSE 구독자)
+log_writer: LogWriter = None                 # 분석 결과 → concentration_logs / study_sessions
+retention_worker: RetentionWorker = None     # 오래된 원본 로그/분 단위 rollup 정리
+face_mesh_pool: FaceMeshPool = None          # 얼굴 등록/로그인용 정지 이미지 FaceMesh
+mosaic_hub: MosaicHub = None                 # 부모 대시보드 격자 스트림 (자녀 목록별 공유)
+
+
+def publish_status(key, result):
+    """세션 분석 결과를 상태 허브로 발행합니다 (변경이 없으면 허브에서 생략)."""
+    status_hub.publish(key, status_payload(result))
+
 
 def initialize_shared_resources():
     """
     공유 리소스를 초기화합니다.
-    - CameraManager
-    - ConcentrationDetector
+    - CameraManager (서버 로컬 카메라)
+    - SessionRegistry (학생별 세션, 최초 요청 시 생성, 분석 결과는 status_hub 로 발행)
+    - LogWriter (분석 결과를 모아 DB 에 기록, LOG_WRITER_ENABLED 일 때)
+    - RetentionWorker (보존 기간 작업, RETENTION_INTERVAL > 0 일 때)
+    - FaceMeshPool (얼굴 등록/로그인, 워밍업은 startup 에서)
+    - MosaicHub (부모 대시보드 모자이크 스트림)
     이 함수는 FastAPI 앱의 startup 이벤트에서 호출되어야 합니다.
     """
-    global shared_camera_manager, shared_detector
+    global shared_camera_manager, session_registry, log_writer, retention_worker, face_mesh_pool, mosaic_hub
 
     # --- CameraManager 초기화 ---
     try:
@@ -33,17 +59,52 @@ def initialize_shared_resources():
         logger.exception("❌ CameraManager 초기화 중 예외 발생:")
         shared_camera_manager = None
 
-    # --- ConcentrationDetector 초기화 ---
-    try:
-        if shared_detector is None:
-            logger.info("🔧 ConcentrationDetector 초기화 시작...")
-            shared_detector = ConcentrationDetector()
-            if shared_detector.is_initialized:
-                logger.info("✅ ConcentrationDetector 초기화 완료.")
-            else:
-                logger.warning("⚠️ ConcentrationDetector 초기화 실패: is_initialized=False")
-        else:
-            logger.info("ℹ️ ConcentrationDetector 이미 존재함.")
-    except Exception as e:
-        logger.exception("❌ ConcentrationDetector 초기화 중 예외 발생:")
-        shared_detector = None
+    # --- SessionRegistry 초기화 ---
+    if session_registry is None:
+        session_registry = SessionRegistry(
+            shared_camera=shared_camera_manager,
+            camera_sources=parse_camera_sources(CAMERA_SOURCES),
+            max_sessions=MAX_SESSIONS,
+            idle_timeout=SESSION_IDLE_TIMEOUT,
+            analysis_fps=ANALYSIS_FPS,
+            jpeg_quality=JPEG_QUALITY
+        )
+        session_registry.add_listener(publish_status)
+        logger.info("✅ SessionRegistry 인스턴스 생성 완료.")
+    else:
+        logger.info("ℹ️ SessionRegistry 이미 존재함.")
+
+    # --- LogWriter 초기화 ---
+    if LOG_WRITER_ENABLED and log_writer is None:
+        log_writer = LogWriter(
+            bucket_seconds=LOG_BUCKET_SECONDS,
+            batch_size=LOG_BATCH_SIZE,
+            flush_interval=LOG_FLUSH_INTERVAL,
+            session_gap=STUDY_SESSION_GAP,
+            spool_path=LOG_SPOOL_PATH,
+            spool_max_bytes=LOG_SPOOL_MAX_BYTES
+        )
+        session_registry.add_listener(log_writer.submit)
+        logger.info("✅ LogWriter 인스턴스 생성 완료.")
+
+    # --- RetentionWorker 초기화 ---
+    if RETENTION_INTERVAL > 0 and retention_worker is None:
+        retention_worker = RetentionWorker(
+            retention_days=LOG_RETENTION_DAYS,
+            minute_retention_days=ROLLUP_MINUTE_RETENTION_DAYS,
+            batch_size=RETENTION_BATCH_SIZE,
+            pause=RETENTION_PAUSE,
+            interval=RETENTION_INTERVAL,
+            bucket_seconds=LOG_BUCKET_SECONDS
+        )
+        logger.info("✅ RetentionWorker 인스턴스 생성 완료.")
+
+    # --- FaceMeshPool 초기화 ---
+    if face_mesh_pool is None:
+        face_mesh_pool = FaceMeshPool(size=FACE_MESH_POOL_SIZE, kind=FACE_MESH_POOL_KIND)
+        logger.info("✅ FaceMeshPool 인스턴스 생성 완료.")
+
+    # --- MosaicHub 초기화 ---
+    if mosaic_hub is None:
+        mosaic_hub = MosaicHub(session_registry, max_tiles=MOSAIC_MAX_TILES, jpeg_quality=MOSAIC_JPEG_QUALITY)
+        logger.info("✅ MosaicHub 인스턴스 생성 완료.")
@@ -1,24 +1,50 @@
  // 자녀 코드를 JavaScript 변수로 설정
  const childCode = "{{ child_code }}";
 
- async function updateStatus() {
-     try {
-         const response = await fetch(`/parent/child_status/${childCode}`, {
-             headers: {
-                 'Accept': 'application/json'
-             }
-         });
-         const data = await response.json();
-         
-         if (data.success) {
-             document.getElementById('currentStatus').textContent = data.status;
-             document.getElementById('concentrationScore').textContent = data.concentration_score;
-             document.getElementById('gazeStatus').textContent = data.gaze_status;
-         }
-     } catch (error) {
-         console.error('상태 업데이트 오류:', error);
-     }
- }
+async function updateStatus() {
+    try {
+        const response = await fetch(`/parent/child_status/${childCode}`, {
+            headers: {
+                'Accept': 'application/json'
+            }
+        });
+        const data = await response.json();
+        renderStatus(data);
+    } catch (error) {
+        console.error('상태 업데이트 오류:', error);
+    }
+}
+
+function renderStatus(data) {
+    if (data.success) {
+        document.getElementById('currentStatus').textContent = data.status;
+        document.getElementById('concentrationScore').textContent = data.concentration_score;
+        document.getElementById('gazeStatus').textContent = data.gaze_status;
+    }
+}
+
+// 상태 변경 시 서버가 push (Server-Sent Events). 지원하지 않거나 연결이 안 되면 3초 폴링
+function startStatusStream() {
+    if (!window.EventSource) {
+        updateStatus();
+        setInterval(updateStatus, 3000);
+        return;
+    }
+    let failures = 0;
+    const source = new EventSource(`/parent/child_status/${childCode}/stream`);
+    source.onmessage = function(event) {
+        failures = 0;
+        renderStatus(JSON.parse(event.data));
+    };
+    source.onerror = function() {
+        failures++;
+        if (failures >= 3) {
+            source.close();
+            updateStatus();
+            setInterval(updateStatus, 3000);
+        }
+    };
+}
 
  function logout() {
     // 로그아웃 처리 후 로그인 페이지로 리다이렉트
@@ -30,11 +56,8 @@
     });
 }
 
- // 초기 상태 업데이트
- updateStatus();
-
- // 3초마다 상태 업데이트
- setInterval(updateStatus, 3000);
+ // 상태 수신 시작
+ startStatusStream();
 
  // 비디오 스트림 에러 처리
  document.getElementById('videoFeed').onerror = function() {
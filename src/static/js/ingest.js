@@ -0,0 +1,79 @@
+// 브라우저 웹캠 프레임을 서버(/video/ingest)로 전송
+// 서버가 ack 를 보낸 뒤에만 다음 프레임을 보내므로 서버가 밀리면 자연스럽게 전송 속도가 줄어듦
+const INGEST_FPS = 10;
+const INGEST_WIDTH = 640;
+const INGEST_HEIGHT = 480;
+const INGEST_QUALITY = 0.7;
+// 재연결 대기 (ms). 서버가 바쁘다고(1013) 닫으면 두 배씩 늘림
+const INGEST_RETRY_MS = 3000;
+const INGEST_RETRY_MAX_MS = 60000;
+// 1008: 로그인 필요 (다시 연결해도 같은 결과), 1013: 서버 한도 초과
+const CLOSE_POLICY_VIOLATION = 1008;
+const CLOSE_TRY_AGAIN_LATER = 1013;
+
+let ingestSocket = null;
+let ingestWaiting = false;
+let ingestTimer = null;
+let ingestRetryMs = INGEST_RETRY_MS;
+
+async function startIngest() {
+    let stream;
+    try {
+        stream = await navigator.mediaDevices.getUserMedia({
+            video: { width: INGEST_WIDTH, height: INGEST_HEIGHT }
+        });
+    } catch (error) {
+        console.error('웹캠 접근 오류:', error);
+        return;
+    }
+
+    const video = document.createElement('video');
+    video.srcObject = stream;
+    video.muted = true;
+    await video.play();
+
+    const canvas = document.createElement('canvas');
+    canvas.width = INGEST_WIDTH;
+    canvas.height = INGEST_HEIGHT;
+    const context = canvas.getContext('2d');
+
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    ingestSocket = new WebSocket(`${protocol}://${window.location.host}/video/ingest`);
+
+    ingestSocket.onmessage = function() {
+        ingestWaiting = false;
+    };
+
+    ingestSocket.onclose = function(event) {
+        clearInterval(ingestTimer);
+        ingestWaiting = false;
+        stream.getTracks().forEach(track => track.stop());
+        if (event.code === CLOSE_POLICY_VIOLATION) {
+            console.warn('프레임 전송 중지: 로그인이 필요합니다.');
+            return;
+        }
+        // 연결이 끊기면 잠시 후 다시 연결 (서버가 바쁘면 점점 더 오래 기다림)
+        const delay = ingestRetryMs;
+        ingestRetryMs = event.code === CLOSE_TRY_AGAIN_LATER
+            ? Math.min(ingestRetryMs * 2, INGEST_RETRY_MAX_MS)
+            : INGEST_RETRY_MS;
+        setTimeout(startIngest, delay);
+    };
+
+    ingestSocket.onopen = function() {
+        ingestTimer = setInterval(() => {
+            if (ingestWaiting || ingestSocket.readyState !== WebSocket.OPEN) {
+                return;
+            }
+            context.drawImage(video, 0, 0, INGEST_WIDTH, INGEST_HEIGHT);
+            canvas.toBlob(blob => {
+                if (blob && ingestSocket.readyState === WebSocket.OPEN) {
+                    ingestWaiting = true;
+                    ingestSocket.send(blob);
+                }
+            }, 'image/jpeg', INGEST_QUALITY);
+        }, 1000 / INGEST_FPS);
+    };
+}
+
+window.addEventListener('load', startIngest);
@@ -1,4 +1,5 @@
 let statusCheckInterval;
+let statusSource = null;  // Server-Sent Events 연결 (실패 시 폴링으로 전환)
 let lastStatus = {};  // 마지막 상태 저장
 let errorCount = 0;   // 연속 에러 카운트
 const MAX_ERRORS = 3; // 최대 허용 에러 횟수
@@ -58,6 +59,36 @@ async function checkStatus() {
     }
 }
 
+function startStatusStream() {
+    if (!window.EventSource) {
+        checkStatus();
+        resetStatusCheck();
+        return;
+    }
+
+    statusSource = new EventSource('/child/status/stream');
+
+    statusSource.onmessage = function(event) {
+        const data = JSON.parse(event.data);
+        errorCount = 0;
+        if (data.success && statusHasChanged(data)) {
+            updateStatus(data);
+            lastStatus = data;
+        }
+    };
+
+    statusSource.onerror = function() {
+        // 연결이 끊기면 EventSource 가 재연결을 시도하지만, 반복 실패하면 폴링으로 전환
+        errorCount++;
+        if (errorCount >= MAX_ERRORS) {
+            statusSource.close();
+            statusSource = null;
+            checkStatus();
+            resetStatusCheck(3000);
+        }
+    };
+}
+
 function statusHasChanged(newData) {
     return !lastStatus.status || 
            lastStatus.status !== newData.status ||
@@ -150,14 +181,16 @@ async function logout() {
     }
 }
 
-// 페이지 로드 시 상태 확인 시작
+// 페이지 로드 시 상태 수신 시작 (push, 미지원 시 폴링)
 window.onload = function() {
-    checkStatus();
-    resetStatusCheck();
+    startStatusStream();
 };
 
-// 페이지 가시성 변경 감지
+// 페이지 가시성 변경 감지 (폴링 모드에서만 주기 조절)
 document.addEventListener('visibilitychange', function() {
+    if (statusSource) {
+        return;
+    }
     if (document.hidden) {
         resetStatusCheck(3000);
     } else {